@@ -11,14 +11,34 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# (skipped when the app runs migrations itself, see database/migrations.py,
+# so the server's logging config isn't replaced)
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
-# add your model's MetaData object here
-# for 'autogenerate' support
-# from myapp import mymodel
-# target_metadata = mymodel.Base.metadata
-target_metadata = None
+# models register their tables on Base.metadata for autogenerate
+from src.app.core.config import settings  # noqa: E402
+from src.app.database.database import Base  # noqa: E402
+from src.app.models import (  # noqa: E402,F401
+    post_model, post_tag_model, tag_generation_model, tag_model, tag_stats_model, user_model,
+)
+
+target_metadata = Base.metadata
+
+# same database as the app (DATABASE_URL); `alembic -x url=...` overrides it
+_url = context.get_x_argument(as_dictionary=True).get("url") or settings.database_url
+config.set_main_option("sqlalchemy.url", _url.replace("%", "%%"))
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate away from the hand-written full-text DDL."""
+    if type_ == "table" and name.startswith("posts_fts"):
+        return False
+    if type_ == "column" and name == "search_vector":
+        return False
+    if type_ == "index" and name == "ix_posts_search_vector":
+        return False
+    return True
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -44,6 +64,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
+        render_as_batch=url.startswith("sqlite"),
     )
 
     with context.begin_transaction():
@@ -65,7 +87,11 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite can't ALTER most things; autogenerate batch ops there
+            render_as_batch=connection.dialect.name == "sqlite",
         )
 
         with context.begin_transaction():
@@ -0,0 +1,27 @@
+"""posts.image_meta for processed image variants
+
+Revision ID: a81d4e6c2f35
+Revises: 3f9c2b71d0a4
+Create Date: 2026-10-17 11:02:17.442913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a81d4e6c2f35'
+down_revision: Union[str, None] = '3f9c2b71d0a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('image_meta', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('posts') as batch_op:
+        batch_op.drop_column('image_meta')
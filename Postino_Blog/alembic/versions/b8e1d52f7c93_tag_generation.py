@@ -0,0 +1,32 @@
+"""tag_generation: version counter of the tag list / tag index
+
+Revision ID: b8e1d52f7c93
+Revises: f3c6a9e2b750
+Create Date: 2026-10-18 10:05:21.318442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e1d52f7c93'
+down_revision: Union[str, None] = 'f3c6a9e2b750'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tag_generation',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('generation', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute(sa.text("INSERT INTO tag_generation (id, generation) VALUES (1, 0)"))
+
+
+def downgrade() -> None:
+    op.drop_table('tag_generation')
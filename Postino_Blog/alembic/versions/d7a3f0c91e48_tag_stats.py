@@ -0,0 +1,42 @@
+"""tag_stats: per-tag post_count / last_used_at
+
+Revision ID: d7a3f0c91e48
+Revises: c4e19a7b5d20
+Create Date: 2026-10-17 16:40:52.730164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3f0c91e48'
+down_revision: Union[str, None] = 'c4e19a7b5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tag_stats',
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.Column('post_count', sa.Integer(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('tag_id'),
+    )
+    op.create_index('ix_tag_stats_post_count', 'tag_stats', ['post_count'], unique=False)
+    # backfill from the existing associations
+    op.execute(sa.text(
+        "INSERT INTO tag_stats (tag_id, post_count, last_used_at) "
+        "SELECT pt.tag_id, COUNT(*), MAX(p.created_at) "
+        "FROM post_tag pt JOIN posts p ON p.id = pt.post_id "
+        "GROUP BY pt.tag_id"
+    ))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tag_stats_post_count', table_name='tag_stats')
+    op.drop_table('tag_stats')
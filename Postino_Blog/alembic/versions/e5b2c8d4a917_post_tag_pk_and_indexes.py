@@ -0,0 +1,53 @@
+"""post_tag composite primary key and (tag_id, post_id) index
+
+Revision ID: e5b2c8d4a917
+Revises: d7a3f0c91e48
+Create Date: 2026-10-17 18:05:33.904127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b2c8d4a917'
+down_revision: Union[str, None] = 'd7a3f0c91e48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# posts.created_at is already covered: ix_posts_created_at_id (3f9c2b71d0a4)
+# leads with created_at, so a separate single-column index would be redundant.
+
+
+def upgrade() -> None:
+    # drop duplicate and half-empty links, otherwise the PK can't be created
+    op.execute(sa.text(
+        "CREATE TABLE post_tag_dedup AS SELECT DISTINCT post_id, tag_id FROM post_tag "
+        "WHERE post_id IS NOT NULL AND tag_id IS NOT NULL"
+    ))
+    op.execute(sa.text("DELETE FROM post_tag"))
+    op.execute(sa.text("INSERT INTO post_tag (post_id, tag_id) SELECT post_id, tag_id FROM post_tag_dedup"))
+    op.drop_table('post_tag_dedup')
+
+    # SQLite can't add a PK in place; batch mode rebuilds the table there
+    with op.batch_alter_table('post_tag') as batch_op:
+        batch_op.alter_column('post_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('tag_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_primary_key('pk_post_tag', ['post_id', 'tag_id'])
+    op.create_index('ix_post_tag_tag_id_post_id', 'post_tag', ['tag_id', 'post_id'], unique=False)
+
+    # duplicates were counted twice by the tag_stats backfill
+    op.execute(sa.text(
+        "UPDATE tag_stats SET post_count = "
+        "(SELECT COUNT(*) FROM post_tag WHERE post_tag.tag_id = tag_stats.tag_id)"
+    ))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_tag_tag_id_post_id', table_name='post_tag')
+    with op.batch_alter_table('post_tag') as batch_op:
+        batch_op.drop_constraint('pk_post_tag', type_='primary')
+        batch_op.alter_column('tag_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.alter_column('post_id', existing_type=sa.Integer(), nullable=True)
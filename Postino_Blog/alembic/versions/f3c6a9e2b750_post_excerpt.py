@@ -0,0 +1,63 @@
+"""posts.excerpt for the summary feed
+
+Revision ID: f3c6a9e2b750
+Revises: e5b2c8d4a917
+Create Date: 2026-10-17 20:12:48.551093
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c6a9e2b750'
+down_revision: Union[str, None] = 'e5b2c8d4a917'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EXCERPT_CHARS = 280
+BATCH = 1000
+_WS = re.compile(r"\s+")
+
+
+def _excerpt(content: str) -> str:
+    # frozen copy of src/app/utils/excerpt.make_excerpt
+    text = _WS.sub(" ", content or "").strip()
+    if len(text) <= EXCERPT_CHARS:
+        return text
+    cut = text[:EXCERPT_CHARS]
+    space = cut.rfind(" ")
+    if space > EXCERPT_CHARS // 2:
+        cut = cut[:space]
+    return cut.rstrip(" .,;:!?،؛") + "…"
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('excerpt', sa.String(), nullable=True))
+
+    bind = op.get_bind()
+    posts = sa.table('posts', sa.column('id', sa.Integer), sa.column('content', sa.Text),
+                     sa.column('excerpt', sa.String))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(posts.c.id, posts.c.content)
+            .where(posts.c.id > last_id).order_by(posts.c.id).limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            posts.update().where(posts.c.id == sa.bindparam('b_id'))
+            .values(excerpt=sa.bindparam('b_excerpt')),
+            [{'b_id': r.id, 'b_excerpt': _excerpt(r.content)} for r in rows],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    # plain DROP COLUMN (SQLite >= 3.35): a batch rebuild of posts would
+    # drop the full-text triggers along with the old table
+    op.drop_column('posts', 'excerpt')
@@ -0,0 +1,361 @@
+# benchmarks/api.py
+"""
+API load test: latency percentiles, throughput and DB statements per request
+for the hot routes, plus a diff of two runs.
+
+    python -m benchmarks.api run --posts 100k --concurrency 1,8,32 --requests 500 -o head.json
+    python -m benchmarks.api compare base.json head.json --threshold 0.15
+
+`run` seeds a database with benchmarks/corpus.py (a temp SQLite file by
+default; `--database-url` for Postgres, `--reuse` to skip seeding an
+already loaded one), swaps in the in-process MinIO stand-in
+(benchmarks/fake_minio.py) and drives the app through httpx's ASGI
+transport – no server, no sockets – with `concurrency` clients per
+scenario:
+
+    feed_shallow        GET /posts/?limit=20
+    feed_deep_offset    GET /posts/?skip=<90% of posts>&limit=20
+    feed_deep_cursor    GET /posts/?cursor=<same depth>&limit=20
+    feed_tag            GET /posts/?tag=<most used tag>&limit=20
+    feed_summary        GET /posts/?view=summary&cursor=&limit=20
+    read_post           GET /posts/{random id}
+    list_all_tags       GET /posts/tags
+    login               POST /auth/login
+    create_post         POST /posts/           (form)
+    create_post_image   POST /posts/           (form + 64 KiB JPEG; includes
+                                                the variant background task)
+
+The server-side response cache is off unless RESPONSE_CACHE_BACKEND is
+set, so reads measure the database path; rate limiting is off unless
+RATE_LIMIT_ENABLED is set. `--replicas N` (SQLite only) copies the seeded
+file N times and routes reads there via DB_REPLICA_URLS
+(database/routing.py) – enough to exercise the routing, not replication.
+Statements are counted with database/query_log.py. Output is JSON;
+`compare` prints per-metric deltas and exits with status 1 when p95
+latency or throughput moved by more than `--threshold`, or statements
+per request went up.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import Callable, Dict, List, NamedTuple
+
+SCENARIOS = (
+    "feed_shallow", "feed_deep_offset", "feed_deep_cursor", "feed_tag", "feed_summary",
+    "read_post", "list_all_tags", "login", "create_post", "create_post_image",
+)
+USER, PASSWORD = "bench@example.com", "bench-password"
+
+
+# --------------------------------------------------------------------- #
+# Environment (before any src.app import: Settings are read at import)
+# --------------------------------------------------------------------- #
+def _configure_env(database_url: str) -> None:
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["DEFAULT_USER_EMAIL"] = USER
+    os.environ["DEFAULT_USER_PASSWORD"] = PASSWORD
+    os.environ.setdefault("RESPONSE_CACHE_BACKEND", "none")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")      # one client, far over any budget
+    for key, value in {
+        "SECRET_KEY": "benchmark-secret-key-benchmark-secret-key",
+        "ALGORITHM": "HS256",
+        "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+        "MINIO_ENDPOINT": "minio.local",
+        "MINIO_ROOT_USER": "bench",
+        "MINIO_ROOT_PASSWORD": "bench-password",
+        "MINIO_BUCKET": "bench",
+    }.items():
+        os.environ.setdefault(key, value)
+
+
+# --------------------------------------------------------------------- #
+# Scenarios
+# --------------------------------------------------------------------- #
+class Request(NamedTuple):
+    method: str
+    url: str
+    kwargs: dict
+
+
+class Context(NamedTuple):
+    posts: int
+    top_tag: str
+    deep_cursor: str
+    token: str
+    image: bytes
+
+
+def _jpeg(size_bytes: int = 64 * 1024) -> bytes:
+    from PIL import Image
+
+    rng = random.Random(1)
+    side = int(math.sqrt(size_bytes / 3)) + 1
+    img = Image.frombytes("RGB", (side, side), rng.randbytes(side * side * 3))
+    out = BytesIO()
+    img.save(out, "JPEG", quality=90)
+    return out.getvalue()
+
+
+def _builders(ctx: Context) -> Dict[str, Callable[[random.Random], Request]]:
+    auth = {"Authorization": f"Bearer {ctx.token}"}
+    deep = int(ctx.posts * 0.9)
+
+    def new_post(rng: random.Random, image: bool) -> Request:
+        data = {"title": f"bench {rng.random()}", "content": "بنچمارک benchmark " * 50,
+                "tags": f"{ctx.top_tag},bench"}
+        files = {"image": ("bench.jpg", ctx.image, "image/jpeg")} if image else None
+        return Request("POST", "/api/v1/posts/", {"data": data, "files": files, "headers": auth})
+
+    return {
+        "feed_shallow": lambda rng: Request("GET", "/api/v1/posts/", {"params": {"limit": 20}}),
+        "feed_deep_offset": lambda rng: Request(
+            "GET", "/api/v1/posts/", {"params": {"skip": deep, "limit": 20}}),
+        "feed_deep_cursor": lambda rng: Request(
+            "GET", "/api/v1/posts/", {"params": {"cursor": ctx.deep_cursor, "limit": 20}}),
+        "feed_tag": lambda rng: Request(
+            "GET", "/api/v1/posts/", {"params": {"tag": ctx.top_tag, "limit": 20}}),
+        "feed_summary": lambda rng: Request(
+            "GET", "/api/v1/posts/", {"params": {"view": "summary", "cursor": "", "limit": 20}}),
+        "read_post": lambda rng: Request("GET", f"/api/v1/posts/{rng.randint(1, ctx.posts)}", {}),
+        "list_all_tags": lambda rng: Request("GET", "/api/v1/posts/tags", {}),
+        "login": lambda rng: Request(
+            "POST", "/api/v1/auth/login", {"data": {"username": USER, "password": PASSWORD}}),
+        "create_post": lambda rng: new_post(rng, image=False),
+        "create_post_image": lambda rng: new_post(rng, image=True),
+    }
+
+
+def _context(client_token: str, posts: int) -> Context:
+    from sqlalchemy import select
+
+    from src.app.crud import post_crud
+    from src.app.database.database import SessionLocal
+    from src.app.models.tag_stats_model import TagStats
+    from src.app.models.tag_model import Tag
+    from src.app.utils.pagination import encode_cursor
+
+    with SessionLocal() as db:
+        top_tag = db.scalar(
+            select(Tag.name).join(TagStats, TagStats.tag_id == Tag.id)
+            .order_by(TagStats.post_count.desc()).limit(1)
+        ) or ""
+        deep = post_crud.get_posts(db, skip=int(posts * 0.9), limit=1)
+        cursor = encode_cursor(deep[0].created_at, deep[0].id) if deep else ""
+    return Context(posts, top_tag, cursor, client_token, _jpeg())
+
+
+# --------------------------------------------------------------------- #
+# Driver
+# --------------------------------------------------------------------- #
+def _percentile(samples: List[float], q: float) -> float:
+    return samples[max(0, min(len(samples) - 1, math.ceil(q * len(samples)) - 1))]
+
+
+async def _drive(client, build, concurrency: int, requests: int, seed: int) -> dict:
+    from src.app.database.query_log import capture_queries
+
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors = 0
+    tickets = itertools.count()
+
+    async def worker() -> None:
+        nonlocal errors
+        while next(tickets) < requests:
+            req = build(rng)
+            started = time.perf_counter()
+            response = await client.request(req.method, req.url, **req.kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += response.status_code >= 400
+
+    for _ in range(min(10, requests)):                                 # warm-up
+        req = build(rng)
+        await client.request(req.method, req.url, **req.kwargs)
+
+    with capture_queries() as log:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / wall, 1),
+        "p50_ms": round(_percentile(latencies, 0.50), 2),
+        "p95_ms": round(_percentile(latencies, 0.95), 2),
+        "p99_ms": round(_percentile(latencies, 0.99), 2),
+        "max_ms": round(latencies[-1], 2),
+        "queries_per_request": round(len(log) / max(len(latencies), 1), 2),
+        "db_ms_per_request": round(log.total_seconds * 1000 / max(len(latencies), 1), 3),
+    }
+
+
+async def _run_scenarios(args, posts: int) -> Dict[str, dict]:
+    import httpx
+
+    from src.app.core.config import settings
+    from src.app.database.database import engine
+    from src.app.database.query_log import install_query_log
+    from src.app.database.routing import active_replicas
+    from src.app.main import app
+
+    install_query_log(engine)
+    if settings.database_mode == "async":
+        from src.app.database.async_database import get_async_engine
+        install_query_log(get_async_engine().sync_engine)
+    for replica in active_replicas().replicas:
+        install_query_log(replica.engine)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            login = await client.post("/api/v1/auth/login",
+                                      data={"username": USER, "password": PASSWORD})
+            login.raise_for_status()
+            builders = _builders(_context(login.json()["access_token"], posts))
+            results: Dict[str, dict] = {}
+            for name in args.scenarios:
+                results[name] = {}
+                for level in args.concurrency:
+                    requests = args.login_requests if name == "login" else args.requests
+                    results[name][f"c{level}"] = await _drive(
+                        client, builders[name], level, requests, args.seed)
+                    print(f"{name} c={level}: {results[name][f'c{level}']}", file=sys.stderr)
+            return results
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(args) -> dict:
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'api_bench.db')}"
+    _configure_env(url)
+    replica_files = [f"{url.split(':///', 1)[1]}.replica{i}" for i in range(args.replicas)]
+    if replica_files:
+        if not url.startswith("sqlite:///"):
+            sys.exit("--replicas needs a SQLite database")
+        os.environ["DB_REPLICA_URLS"] = ",".join(f"sqlite:///{path}" for path in replica_files)
+
+    from benchmarks import corpus, fake_minio
+    fake_minio.install()
+
+    posts = corpus.SIZES.get(args.posts.lower()) or int(args.posts)
+
+    seeded = None if args.reuse else corpus.seed_corpus(url, posts, args.tags, args.seed)
+    for path in replica_files:
+        shutil.copyfile(url.split(":///", 1)[1], path)
+    results = asyncio.run(_run_scenarios(args, posts))
+
+    from src.app.core.config import settings
+    return {
+        "meta": {
+            "git": _git_rev(),
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "database": url.split(":", 1)[0],
+            "database_mode": settings.database_mode,
+            "response_cache": settings.response_cache_backend,
+            "replicas": args.replicas,
+            "posts": posts,
+            "seed": seeded,
+        },
+        "results": results,
+    }
+
+
+# --------------------------------------------------------------------- #
+# Compare
+# --------------------------------------------------------------------- #
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "queries_per_request", "db_ms_per_request")
+
+
+def compare(base: dict, head: dict, threshold: float) -> dict:
+    diff: Dict[str, dict] = {}
+    regressions: List[str] = []
+    for name, levels in head["results"].items():
+        for level, new in levels.items():
+            old = base["results"].get(name, {}).get(level)
+            if old is None:
+                continue
+            row = {}
+            for metric in (*LOWER_IS_BETTER, "rps"):
+                if metric in old and metric in new:
+                    change = (new[metric] - old[metric]) / old[metric] if old[metric] else 0.0
+                    row[metric] = {"base": old[metric], "head": new[metric],
+                                   "change": round(change, 3)}
+            diff.setdefault(name, {})[level] = row
+            label = f"{name} {level}"
+            if row.get("p95_ms", {}).get("change", 0) > threshold:
+                regressions.append(f"{label}: p95 {old['p95_ms']} → {new['p95_ms']} ms")
+            if row.get("rps", {}).get("change", 0) < -threshold:
+                regressions.append(f"{label}: rps {old['rps']} → {new['rps']}")
+            if new.get("queries_per_request", 0) > old.get("queries_per_request", 0) + 0.5:
+                regressions.append(f"{label}: queries/request "
+                                   f"{old['queries_per_request']} → {new['queries_per_request']}")
+    return {"base": base.get("meta", {}).get("git"), "head": head.get("meta", {}).get("git"),
+            "threshold": threshold, "regressions": regressions, "diff": diff}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run")
+    p_run.add_argument("--database-url", help="default: a fresh temp SQLite file")
+    p_run.add_argument("--reuse", action="store_true", help="database is already seeded")
+    p_run.add_argument("--posts", default="10k", help="count or 10k / 100k / 1m")
+    p_run.add_argument("--tags", type=int, default=2000)
+    p_run.add_argument("--seed", type=int, default=42)
+    p_run.add_argument("--concurrency", type=lambda v: [int(x) for x in v.split(",")], default=[1, 8, 32])
+    p_run.add_argument("--requests", type=int, default=200, help="per scenario and level")
+    p_run.add_argument("--login-requests", type=int, default=40, help="bcrypt is slow by design")
+    p_run.add_argument("--scenarios", type=lambda v: v.split(","), default=list(SCENARIOS))
+    p_run.add_argument("--replicas", type=int, default=0, help="SQLite copies to read from")
+    p_run.add_argument("-o", "--output", help="write JSON here instead of stdout")
+
+    p_cmp = sub.add_parser("compare")
+    p_cmp.add_argument("base")
+    p_cmp.add_argument("head")
+    p_cmp.add_argument("--threshold", type=float, default=0.15, help="relative, 0.15 = 15%%")
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        with open(args.base) as f_base, open(args.head) as f_head:
+            report = compare(json.load(f_base), json.load(f_head), args.threshold)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        sys.exit(1 if report["regressions"] else 0)
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    report = json.dumps(run(args), indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as out:
+            out.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/compression.py
+"""
+Bytes on the wire and CPU per request for compressed feed pages.
+
+    python -m benchmarks.compression --posts 20 --requests 300
+
+1. codec table – every installed codec (gzip always; br / zstd when brotli /
+   zstandard are installed) at a few levels: compressed size, ratio and
+   encode ms for one page.
+2. HTTP – the same page served three ways through an in-process ASGI
+   client with `Accept-Encoding` set to each codec:
+     * plain     – no CompressionMiddleware
+     * on_the_fly – CompressionMiddleware compresses every response
+     * cached    – a pre-compressed CachedResponse (what a response-cache
+                   hit serves); the middleware passes it through
+Output is JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Dict
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from benchmarks.serialization import fake_posts
+from src.app.api.api_v1.endpoints.posts import _make_out, _post_list
+from src.app.middleware.compression import CompressionMiddleware
+from src.app.services.response_cache import CachedResponse
+from src.app.utils.compression import Codec, _brotli, _gzip, _zstd
+from src.app.utils.json_response import json_response
+
+LEVELS = {"gzip": (1, 6, 9), "br": (1, 5, 11), "zstd": (1, 3, 19)}
+FACTORIES = {"gzip": _gzip, "br": _brotli, "zstd": _zstd}
+
+
+def _codec_table(body: bytes, runs: int) -> Dict[str, dict]:
+    table: Dict[str, dict] = {}
+    for name, levels in LEVELS.items():
+        for level in levels:
+            codec = FACTORIES[name](level)
+            if codec is None:
+                break                                       # package not installed
+            started = time.process_time()
+            for _ in range(runs):
+                out = codec.compress(body)
+            elapsed = time.process_time() - started
+            table[f"{name}-{level}"] = {
+                "bytes": len(out),
+                "ratio": round(len(body) / len(out), 2),
+                "encode_ms": round(elapsed / runs * 1000, 3),
+            }
+    return table
+
+
+def _default_codecs() -> Dict[str, Codec]:
+    codecs = {name: FACTORIES[name](LEVELS[name][1]) for name in ("br", "zstd", "gzip")}
+    return {name: codec for name, codec in codecs.items() if codec is not None}
+
+
+def build_app(posts: list, codecs: Dict[str, Codec], compress: bool) -> FastAPI:
+    app = FastAPI()
+    body = _post_list.dump_json([_make_out(p) for p in posts])
+    entry = CachedResponse(body=body, headers={"ETag": 'W/"bench"'})
+    entry.precompress(codecs, min_size=0)
+
+    @app.get("/page")
+    def page():
+        return json_response(_post_list, [_make_out(p) for p in posts])
+
+    @app.get("/cached")
+    def cached(request: Request):
+        return entry.to_response(request)
+
+    if compress:
+        app.add_middleware(CompressionMiddleware, codecs=codecs, min_size=1024)
+    return app
+
+
+def _measure(client: TestClient, path: str, encoding: str, requests: int) -> dict:
+    headers = {"Accept-Encoding": encoding}
+    for _ in range(20):                                     # warm-up
+        client.get(path, headers=headers)
+    wire = 0
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(requests):
+        wire = client.get(path, headers=headers).num_bytes_downloaded
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return {
+        "bytes_on_wire": wire,
+        "rps": round(requests / wall, 1),
+        "cpu_ms_per_request": round(cpu / requests * 1000, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    posts = fake_posts(args.posts)
+    codecs = _default_codecs()
+    body = _post_list.dump_json([_make_out(p) for p in posts])
+
+    plain = TestClient(build_app(posts, codecs, compress=False))
+    compressed = TestClient(build_app(posts, codecs, compress=True))
+    http = {"plain": _measure(plain, "/page", "identity", args.requests)}
+    for name in codecs:
+        http[f"on_the_fly_{name}"] = _measure(compressed, "/page", name, args.requests)
+        http[f"cached_{name}"] = _measure(compressed, "/cached", name, args.requests)
+
+    report = {
+        "posts_per_page": args.posts,
+        "page_bytes": len(body),
+        "codecs": _codec_table(body, 50),
+        "http": http,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
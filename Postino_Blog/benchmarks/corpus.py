@@ -0,0 +1,87 @@
+# benchmarks/corpus.py
+"""
+Synthetic blog corpora for the API benchmarks.
+
+    python -m benchmarks.corpus --database-url sqlite:////tmp/bench.db --posts 100000
+
+Migrates the target database to head (so FTS triggers, tag_stats and
+indexes match production) and loads posts through `post_crud.import_posts`,
+the same batched path as `POST /posts/bulk`. Text mixes Persian and English
+words from a Zipf-distributed vocabulary (benchmarks/search.py); each post
+gets 1–5 tags drawn Zipf-style from `tags` names, and one in five carries
+an image URL. Deterministic for a given seed. Works for SQLite and Postgres.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from benchmarks.search import _text, _vocabulary
+from src.app.crud.post_crud import import_posts
+from src.app.database.migrations import upgrade_to_head
+from src.app.schemas.post_schema import PostImportRow
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+
+def tag_names(rng: random.Random, count: int) -> List[str]:
+    words = list(dict.fromkeys(w for w in _vocabulary(rng) if len(w) >= 3))
+    return [f"{w}-{i}" if i >= len(words) else w
+            for i, w in zip(range(count), itertools.cycle(words))]
+
+
+def rows(posts: int, tags: int, seed: int = 42, start: datetime = datetime(2024, 1, 1)) -> Iterator[PostImportRow]:
+    rng = random.Random(seed)
+    vocab = _vocabulary(rng)
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocab) + 1)))
+    names = tag_names(rng, tags)
+    tag_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(names) + 1)))
+    step = timedelta(days=365 * 2) / max(posts, 1)
+    for i in range(posts):
+        yield PostImportRow.model_construct(
+            title=_text(rng, vocab, weights, rng.randint(4, 10)),
+            content=_text(rng, vocab, weights, rng.randint(60, 400)),
+            tags=list(dict.fromkeys(rng.choices(names, cum_weights=tag_weights, k=rng.randint(1, 5)))),
+            image_url=f"http://minio.local/bench/{i:08x}.jpg" if i % 5 == 0 else None,
+            image_meta=None,
+            created_at=start + step * i,
+            updated_at=None,
+        )
+
+
+def seed_corpus(url: str, posts: int, tags: int = 2000, seed: int = 42, batch: int = 1000) -> dict:
+    """Migrate `url` to head and load the corpus; returns timing info."""
+    upgrade_to_head(url)
+    engine = create_engine(url)
+    started = time.perf_counter()
+    source = rows(posts, tags, seed)
+    with Session(engine) as db:
+        while chunk := list(itertools.islice(source, batch)):
+            import_posts(db, chunk)
+    engine.dispose()
+    return {"posts": posts, "tags": tags, "seed": seed,
+            "seed_s": round(time.perf_counter() - started, 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--posts", default="10k", help="count or one of " + ", ".join(SIZES))
+    parser.add_argument("--tags", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    posts = SIZES.get(args.posts.lower()) or int(args.posts)
+    print(json.dumps(seed_corpus(args.database_url, posts, args.tags, args.seed)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/fake_minio.py
+"""
+In-process stand-in for the MinIO SDK client, for benchmarks and tests.
+
+`install()` swaps `minio.Minio` as seen by services/minio_client.py, so the
+clients the app builds keep objects in a dict instead of talking to a
+server. Call it before importing `src.app.main`. Upload cost is then just
+reading the stream – storage latency is not part of the numbers.
+
+`put_object` splits the stream like the SDK does (one PUT when the length
+is known and fits in `part_size`, otherwise `part_size` reads per part) and
+records the part count in `parts`; the SDK's 5 MiB minimum part size is not
+enforced, so tests can use small parts.
+"""
+
+from __future__ import annotations
+
+import threading
+from io import BytesIO
+from typing import Dict
+
+
+class _Object(BytesIO):
+    def release_conn(self) -> None:
+        pass
+
+
+class FakeMinio:
+    objects: Dict[str, bytes] = {}
+    parts: Dict[str, int] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, endpoint: str = "", access_key=None, secret_key=None, secure=False,
+                 http_client=None, **kwargs) -> None:
+        self.endpoint = endpoint
+
+    def bucket_exists(self, bucket_name: str) -> bool:
+        return True
+
+    def make_bucket(self, bucket_name: str, *args, **kwargs) -> None:
+        pass
+
+    def set_bucket_versioning(self, bucket_name: str, config) -> None:
+        pass
+
+    def put_object(self, bucket_name: str, object_name: str, data, length: int,
+                   content_type: str = "application/octet-stream", part_size: int = 0,
+                   **kwargs):
+        if length < 0 and not part_size:
+            raise ValueError("part_size is required when length is unknown")
+        if length >= 0 and (not part_size or length <= part_size):
+            chunks = [data.read(length)]
+        else:
+            chunks = []
+            remaining = length
+            while remaining != 0:
+                chunk = data.read(part_size if remaining < 0 else min(part_size, remaining))
+                if chunk:
+                    chunks.append(chunk)
+                if remaining > 0:
+                    remaining -= len(chunk)
+                if len(chunk) < part_size:
+                    break                       # short read: that was the last part
+        with self._lock:
+            self.objects[f"{bucket_name}/{object_name}"] = b"".join(chunks)
+            self.parts[f"{bucket_name}/{object_name}"] = len(chunks)
+
+    def get_object(self, bucket_name: str, object_name: str, *args, **kwargs) -> _Object:
+        return _Object(self.objects[f"{bucket_name}/{object_name}"])
+
+    def remove_object(self, bucket_name: str, object_name: str, *args, **kwargs) -> None:
+        with self._lock:
+            self.objects.pop(f"{bucket_name}/{object_name}", None)
+            self.parts.pop(f"{bucket_name}/{object_name}", None)
+
+
+def install() -> None:
+    from src.app.services import minio_client
+
+    minio_client.Minio = FakeMinio
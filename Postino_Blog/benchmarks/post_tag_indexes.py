@@ -0,0 +1,104 @@
+# benchmarks/post_tag_indexes.py
+"""
+Tag-filtered feed before/after the post_tag PK + (tag_id, post_id) index.
+
+    python -m benchmarks.post_tag_indexes --posts 200000 --tags 2000
+
+Migrates a throw-away SQLite database to the revision before the index
+(d7a3f0c91e48), seeds posts with Zipf-distributed tags, prints the EXPLAIN
+plan and timings of the `?tag=` keyset and offset queries, then upgrades to
+head and measures again. Output is JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from alembic import command
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from src.app.crud.post_crud import keyset_page, offset_page, post_versions
+from src.app.database.migrations import alembic_config
+
+BEFORE = "d7a3f0c91e48"
+
+
+def seed(session: Session, posts: int, tags: int, per_post: int = 3) -> None:
+    rng = random.Random(7)
+    session.execute(text("INSERT INTO tags (id, name) VALUES (:id, :name)"),
+                    [{"id": i, "name": f"tag{i}"} for i in range(1, tags + 1)])
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, tags + 1)))
+    batch = 10_000
+    for start in range(1, posts + 1, batch):
+        ids = range(start, min(start + batch, posts + 1))
+        session.execute(
+            text("INSERT INTO posts (id, title, content) VALUES (:id, :t, 'x')"),
+            [{"id": i, "t": f"post {i}"} for i in ids],
+        )
+        links = {
+            (i, t) for i in ids
+            for t in rng.choices(range(1, tags + 1), cum_weights=weights, k=per_post)
+        }
+        session.execute(text("INSERT INTO post_tag (post_id, tag_id) VALUES (:p, :t)"),
+                        [{"p": p, "t": t} for p, t in links])
+        session.commit()
+
+
+def _queries(dialect: str, tag: str):
+    return {
+        "keyset": keyset_page(post_versions(), dialect, None, 20, tag),
+        "offset": offset_page(post_versions(), 200, 20, tag),
+    }
+
+
+def measure(session: Session, tags: list, runs: int) -> dict:
+    out = {}
+    dialect = session.get_bind().dialect.name
+    for tag in tags:
+        for name, stmt in _queries(dialect, tag).items():
+            compiled = stmt.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+            plan = [row[-1] for row in session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+            samples = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                session.execute(stmt).all()
+                samples.append((time.perf_counter() - started) * 1000)
+            out[f"{tag}/{name}"] = {"plan": plan, "p50_ms": round(statistics.median(samples), 2)}
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=200_000)
+    parser.add_argument("--tags", type=int, default=2_000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'post_tag_bench.db')}"
+    command.upgrade(alembic_config(url), BEFORE)
+    engine = create_engine(url)
+    probe = ["tag1", "tag50", f"tag{args.tags}"]         # common → rare
+
+    report = {"posts": args.posts, "tags": args.tags}
+    with Session(engine) as session:
+        seed(session, args.posts, args.tags)
+        session.execute(text("ANALYZE"))
+        report["before"] = measure(session, probe, args.runs)
+
+    command.upgrade(alembic_config(url), "head")
+    with Session(engine) as session:
+        session.execute(text("ANALYZE"))
+        report["after"] = measure(session, probe, args.runs)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
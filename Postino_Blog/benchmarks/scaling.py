@@ -0,0 +1,258 @@
+# benchmarks/scaling.py
+"""
+Throughput of a real server as worker processes are added.
+
+    python -m benchmarks.scaling --workers 1,2,4 --posts 10k --duration 15
+    python -m benchmarks.scaling --server uvicorn --workers 1,4 --clients 4
+
+Seeds a database once (benchmarks/corpus.py, plus the default user), then
+for every worker count starts `gunicorn -c gunicorn.conf.py` (or
+`uvicorn --workers N`) on a local port, waits until /health/ready answers,
+and loads it from `--clients` separate load-generator processes, each
+keeping `--concurrency` requests in flight over HTTP/1.1 keep-alive for
+`--duration` seconds per scenario (the read scenarios of
+benchmarks/api.py). Reported per scenario and worker count: rps,
+p50/p95/p99 latency, errors, and the speed-up over the smallest count.
+
+The load generators share the machine with the server, so the curve says
+little beyond (cores − clients) workers. SQLite allows one writer: for
+write-heavy scaling use `--database-url postgresql://…`. Output is JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.api import (
+    PASSWORD,
+    USER,
+    Context,
+    _builders,
+    _configure_env,
+    _context as _db_context,
+    _git_rev,
+    _percentile,
+)
+
+SCENARIOS = ("feed_shallow", "feed_tag", "feed_summary", "read_post", "list_all_tags")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# --------------------------------------------------------------------- #
+# Server
+# --------------------------------------------------------------------- #
+def _server_cmd(server: str, workers: int, port: int) -> List[str]:
+    if server == "gunicorn":
+        return [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "src.app.main:app",
+                "--bind", f"127.0.0.1:{port}", "--workers", str(workers)]
+    return [sys.executable, "-m", "uvicorn", "src.app.main:app", "--port", str(port),
+            "--workers", str(workers), "--no-access-log", "--log-level", "warning"]
+
+
+def _start(server: str, workers: int, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "GUNICORN_BOOTSTRAP": "false",          # seeded and migrated already
+        "DB_AUTO_MIGRATE": "false",
+        "DEFAULT_USER_ON_STARTUP": "false",
+        "MINIO_BOOTSTRAP_ON_FIRST_USE": "false",
+    }
+    return subprocess.Popen(_server_cmd(server, workers, port), cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+
+def _wait_ready(proc: subprocess.Popen, base_url: str, workers: int, timeout: float = 120) -> None:
+    """Until /health/ready succeeds often enough that every worker has likely booted."""
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    streak = 0
+    with httpx.Client(base_url=base_url, timeout=2) as client:
+        while streak < workers * 4:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited ({proc.returncode}):\n{proc.stderr.read()}")
+            if time.monotonic() > deadline:
+                raise TimeoutError("server did not become ready")
+            try:
+                ok = client.get("/health/ready").status_code == 200
+            except httpx.TransportError:
+                ok = False
+            streak = streak + 1 if ok else 0
+            if not ok:
+                time.sleep(0.2)
+
+
+def _stop(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+# --------------------------------------------------------------------- #
+# Load generators (one process each)
+# --------------------------------------------------------------------- #
+def _load(job: tuple) -> dict:
+    base_url, ctx, scenario, concurrency, duration, seed = job
+    return asyncio.run(_load_async(base_url, ctx, scenario, concurrency, duration, seed))
+
+
+async def _load_async(base_url: str, ctx: Context, scenario: str, concurrency: int,
+                      duration: float, seed: int) -> dict:
+    import httpx
+
+    build = _builders(ctx)[scenario]
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        for _ in range(5):                                              # warm-up
+            req = build(rng)
+            await client.request(req.method, req.url, **req.kwargs)
+        stop_at = time.perf_counter() + duration
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.perf_counter() < stop_at:
+                req = build(rng)
+                started = time.perf_counter()
+                try:
+                    response = await client.request(req.method, req.url, **req.kwargs)
+                    errors += response.status_code >= 400
+                except httpx.TransportError:
+                    errors += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+    return {"latencies": latencies, "errors": errors, "wall": wall}
+
+
+def _measure(pool, base_url: str, ctx: Context, scenario: str, args) -> dict:
+    jobs = [(base_url, ctx, scenario, args.concurrency, args.duration, args.seed + i)
+            for i in range(args.clients)]
+    parts = pool.map(_load, jobs)
+    latencies = sorted(x for part in parts for x in part["latencies"])
+    wall = max(part["wall"] for part in parts)
+    return {
+        "requests": len(latencies),
+        "errors": sum(part["errors"] for part in parts),
+        "rps": round(len(latencies) / wall, 1),
+        "p50_ms": round(_percentile(latencies, 0.50), 2),
+        "p95_ms": round(_percentile(latencies, 0.95), 2),
+        "p99_ms": round(_percentile(latencies, 0.99), 2),
+    }
+
+
+def _context(base_url: str, posts: int) -> Context:
+    import httpx
+
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        login = client.post("/api/v1/auth/login", data={"username": USER, "password": PASSWORD})
+        login.raise_for_status()
+    return _db_context(login.json()["access_token"], posts)
+
+
+# --------------------------------------------------------------------- #
+def run(args) -> dict:
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'scaling.db')}"
+    _configure_env(url)
+    # a single worker gets every in-flight request; don't measure pool waits
+    os.environ.setdefault("DB_POOL_SIZE", str(args.concurrency * args.clients))
+
+    from benchmarks import corpus
+
+    posts = corpus.SIZES.get(args.posts.lower()) or int(args.posts)
+    seeded = None
+    if not args.reuse:
+        seeded = corpus.seed_corpus(url, posts, args.tags, args.seed)
+        from src.app.tasks.bootstrap import ensure_default_user
+        ensure_default_user()
+
+    results: Dict[str, dict] = {name: {} for name in args.scenarios}
+    # spawn: the load generators must not inherit this process's engine
+    with multiprocessing.get_context("spawn").Pool(args.clients) as pool:
+        for workers in args.workers:
+            base_url = f"http://127.0.0.1:{args.port}"
+            proc = _start(args.server, workers, args.port)
+            try:
+                _wait_ready(proc, base_url, workers)
+                ctx = _context(base_url, posts)
+                for name in args.scenarios:
+                    results[name][f"w{workers}"] = row = _measure(pool, base_url, ctx, name, args)
+                    print(f"{name} workers={workers}: {row}", file=sys.stderr)
+            finally:
+                _stop(proc)
+
+    for levels in results.values():
+        base = levels[f"w{args.workers[0]}"]["rps"]
+        for row in levels.values():
+            row["speedup"] = round(row["rps"] / base, 2) if base else None
+
+    from src.app.core.config import settings
+    return {
+        "meta": {
+            "git": _git_rev(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "server": args.server,
+            "database": url.split(":", 1)[0],
+            "database_mode": settings.database_mode,
+            "response_cache": settings.response_cache_backend,
+            "posts": posts,
+            "clients": args.clients,
+            "concurrency_per_client": args.concurrency,
+            "duration_s": args.duration,
+            "seed": seeded,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--server", choices=("gunicorn", "uvicorn"), default="gunicorn")
+    parser.add_argument("--workers", type=lambda v: [int(x) for x in v.split(",")], default=[1, 2, 4])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database-url", help="default: a fresh temp SQLite file")
+    parser.add_argument("--reuse", action="store_true", help="database is already seeded")
+    parser.add_argument("--posts", default="10k", help="count or 10k / 100k / 1m")
+    parser.add_argument("--tags", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clients", type=int, default=2, help="load-generator processes")
+    parser.add_argument("--concurrency", type=int, default=16, help="in-flight requests per client")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--scenarios", type=lambda v: v.split(","), default=list(SCENARIOS))
+    parser.add_argument("-o", "--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    report = json.dumps(run(args), indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as out:
+            out.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# benchmarks/search.py
+"""
+Full-text search vs. the LIKE scan it replaces.
+
+    python -m benchmarks.search --posts 1000000 --runs 50
+
+Seeds a throw-away SQLite database (schema via create_all, so the FTS table
+and triggers come from the same hook the app uses), then times
+search_crud.search_posts and an equivalent `LIKE '%term%'` query for a mix of
+English and Persian terms (Zipf-distributed vocabulary, so some terms are
+common and some rare). Prints p50/p95 in milliseconds as JSON.
+Run from Postino_Blog/ with the usual .env present (settings are loaded).
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import and_, create_engine, or_, select, text
+from sqlalchemy.orm import Session
+
+from src.app.database.database import Base
+from src.app.models import post_model, post_tag_model, tag_model, user_model  # noqa: F401
+from src.app.models.post_model import Post
+from src.app.crud import search_crud
+
+SEED_WORDS = (
+    "python database index search latency cache server query async replica "
+    "گوشی هوشمند پردازنده انویدیا هواوی برنامه نویسی سرور پایگاه داده جستجو"
+).split()
+# common → rare; the LIKE scan can stop early only on the common ones
+TERMS = ["python", "database index", "هواوی", "پایگاه داده", "replica"]
+
+
+def _vocabulary(rng: random.Random, size: int = 20_000) -> list:
+    latin, persian = "abcdefghijklmnopqrstuvwxyz", "ابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهی"
+    words = list(SEED_WORDS)
+    while len(words) < size:
+        alphabet = rng.choice((latin, persian))
+        words.append("".join(rng.choice(alphabet) for _ in range(rng.randint(3, 9))))
+    rng.shuffle(words)
+    return words
+
+
+def _text(rng: random.Random, vocab: list, weights: list, words: int) -> str:
+    return " ".join(rng.choices(vocab, cum_weights=weights, k=words))
+
+
+def seed(session: Session, posts: int, batch: int = 10_000) -> None:
+    rng = random.Random(42)
+    vocab = _vocabulary(rng)
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocab) + 1)))  # Zipf
+    for start in range(0, posts, batch):
+        rows = [
+            {"title": _text(rng, vocab, weights, 6), "content": _text(rng, vocab, weights, 80)}
+            for _ in range(min(batch, posts - start))
+        ]
+        session.execute(text("INSERT INTO posts (title, content) VALUES (:title, :content)"), rows)
+        session.commit()
+
+
+def _time(fn, runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "search_bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+
+    report = {"posts": args.posts, "terms": {}}
+    with Session(engine) as session:
+        started = time.perf_counter()
+        seed(session, args.posts)
+        report["seed_s"] = round(time.perf_counter() - started, 1)
+
+        for term in TERMS:
+            query = search_crud.match_query("sqlite", term)
+            like = and_(*(
+                or_(Post.title.like(f"%{w}%"), Post.content.like(f"%{w}%"))
+                for w in term.split()
+            ))
+            report["terms"][term] = {
+                "fts": _time(lambda: search_crud.search_posts(session, query, limit=args.limit), args.runs),
+                "like": _time(
+                    lambda: session.execute(select(Post.id).where(like).limit(args.limit)).all(),
+                    args.runs,
+                ),
+            }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# benchmarks/serialization.py
+"""
+Cost of encoding a 100-post page: FastAPI's response_model path vs. the
+single-pass pydantic-core path the routes use (utils/json_response.py).
+
+    python -m benchmarks.serialization --posts 100 --requests 500
+
+Both routes build the same PostOut objects with `_make_out`; the "before"
+route returns them (FastAPI re-validates against response_model and encodes
+with the stdlib), the "after" route returns `json_response(...)`. Reports
+requests/sec and CPU ms per request through an in-process ASGI client, plus
+the bare encode time without HTTP. Output is JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.app.api.api_v1.endpoints.posts import _make_out, _post_list
+from src.app.schemas.post_schema import PostOut
+from src.app.utils.json_response import json_response
+
+
+def fake_posts(n: int) -> list:
+    start = datetime(2025, 1, 1)
+    variants = [
+        {"url": f"http://minio/b/img_w{w}.webp", "width": w, "height": w // 2, "format": "webp"}
+        for w in (320, 768, 1280)
+    ]
+    return [
+        SimpleNamespace(
+            id=i,
+            title=f"پست شماره {i} – benchmark title",
+            content=("متن نمونه برای بنچمارک. Sample body text. " * 60),
+            image_url="http://minio/b/img.jpg",
+            image_meta={"width": 1600, "height": 800, "blurhash": "LEHV6nWB2yk8pyo0adR*.7kCMdnj",
+                        "variants": variants},
+            tags=[SimpleNamespace(name=t) for t in ("هواوی", "انویدیا", "python")],
+            created_at=start + timedelta(minutes=i),
+            updated_at=None,
+        )
+        for i in range(n)
+    ]
+
+
+def build_app(posts: list) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before", response_model=List[PostOut])
+    def before():
+        return [_make_out(p) for p in posts]
+
+    @app.get("/after", response_model=List[PostOut])
+    def after():
+        return json_response(_post_list, [_make_out(p) for p in posts])
+
+    return app
+
+
+def _measure(client: TestClient, path: str, requests: int) -> dict:
+    for _ in range(20):                                     # warm-up
+        client.get(path)
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(requests):
+        client.get(path)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return {"rps": round(requests / wall, 1), "cpu_ms_per_request": round(cpu / requests * 1000, 3)}
+
+
+def _encode_only(posts: list, runs: int) -> dict:
+    from fastapi.encoders import jsonable_encoder
+
+    items = [_make_out(p) for p in posts]
+    started = time.process_time()
+    for _ in range(runs):
+        json.dumps(jsonable_encoder(items)).encode()
+    stdlib = time.process_time() - started
+    started = time.process_time()
+    for _ in range(runs):
+        _post_list.dump_json(items)
+    core = time.process_time() - started
+    return {
+        "jsonable_encoder_json_dumps_ms": round(stdlib / runs * 1000, 3),
+        "type_adapter_dump_json_ms": round(core / runs * 1000, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    posts = fake_posts(args.posts)
+    client = TestClient(build_app(posts))
+    assert client.get("/before").json() == client.get("/after").json()
+
+    report = {
+        "posts_per_page": args.posts,
+        "before": _measure(client, "/before", args.requests),
+        "after": _measure(client, "/after", args.requests),
+        "encode_only": _encode_only(posts, args.requests),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
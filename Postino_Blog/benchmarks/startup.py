@@ -0,0 +1,109 @@
+# benchmarks/startup.py
+"""
+Time to first request of a fresh worker process.
+
+    python -m benchmarks.startup --runs 5
+
+Each run starts a new interpreter (as a uvicorn/gunicorn worker would),
+imports `src.app.main`, enters the lifespan and serves one feed request
+through the ASGI transport. Reported per phase (median of the runs):
+process spawn + interpreter, import, lifespan startup, first request, and
+the total wall time seen by the parent.
+
+Two configurations run against the same (already migrated) SQLite file:
+
+    on_startup    DB_AUTO_MIGRATE / DEFAULT_USER_ON_STARTUP on (defaults)
+    bootstrapped  both off, as after `python -m src.app.tasks.bootstrap`
+
+MINIO_ENDPOINT points at a closed local port: importing the app must not
+need storage at all. Output is JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CONFIGS = {
+    "on_startup": {"DB_AUTO_MIGRATE": "true", "DEFAULT_USER_ON_STARTUP": "true"},
+    "bootstrapped": {"DB_AUTO_MIGRATE": "false", "DEFAULT_USER_ON_STARTUP": "false",
+                     "MINIO_BOOTSTRAP_ON_FIRST_USE": "false"},
+}
+
+
+def child() -> None:
+    started = time.perf_counter()
+    import asyncio
+
+    import httpx
+
+    from src.app.main import app
+    imported = time.perf_counter()
+
+    async def first_request() -> dict:
+        async with app.router.lifespan_context(app):
+            ready = time.perf_counter()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                response = await client.get("/api/v1/posts/", params={"limit": 1})
+            served = time.perf_counter()
+        return {
+            "import_s": imported - started,
+            "startup_s": ready - imported,
+            "first_request_s": served - ready,
+            "status": response.status_code,
+        }
+
+    print(json.dumps(asyncio.run(first_request())))
+
+
+def _spawn(env: dict) -> dict:
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-m", "benchmarks.startup", "--child"],
+                         env=env, capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["wall_s"] = time.perf_counter() - started
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-url")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    from benchmarks.api import _configure_env
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'startup.db')}"
+    _configure_env(url)
+    os.environ["MINIO_ENDPOINT"] = "127.0.0.1:9"
+
+    from src.app.database.migrations import upgrade_to_head
+    from src.app.tasks.bootstrap import ensure_default_user
+    upgrade_to_head(url)
+    ensure_default_user()
+
+    report = {"runs": args.runs, "configs": {}}
+    for name, overrides in CONFIGS.items():
+        env = {**os.environ, **overrides}
+        runs = [_spawn(env) for _ in range(args.runs)]
+        assert all(r["status"] == 200 for r in runs), runs
+        report["configs"][name] = {
+            key.replace("_s", "_ms"): round(statistics.median(r[key] for r in runs) * 1000, 1)
+            for key in ("wall_s", "import_s", "startup_s", "first_request_s")
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
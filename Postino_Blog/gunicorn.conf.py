@@ -0,0 +1,55 @@
+# gunicorn.conf.py
+"""
+Production runner: gunicorn managing uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py src.app.main:app
+
+* WEB_CONCURRENCY worker processes (default: one per CPU); the value is
+  exported so every worker sees it – DB_POOL_TOTAL is split by it
+  (database/engine_factory.py) and the app warns about per-worker state
+* the master runs `python -m src.app.tasks.bootstrap` once, in a child
+  process, before forking (GUNICORN_BOOTSTRAP=false skips it when a release
+  step already did); workers then start with migrations, default-user
+  creation and the first-use bucket check switched off
+* preload_app stays off: the master never imports the app, so each worker
+  builds its own engine, MinIO client and executors after the fork. The
+  modules also reset inherited ones in `os.register_at_fork` hooks, should
+  someone turn preloading on
+* readiness: GET /health/ready per worker; liveness: GET /health/live
+* cache / rate-limit state is per process unless its backend is "redis"
+  (services/shared_state.py); /metrics reports the worker that answered
+"""
+
+import multiprocessing
+import os
+import subprocess
+import sys
+
+_TRUE = ("1", "true", "yes", "on")
+
+bind = os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+workers = int(os.environ.get("WEB_CONCURRENCY") or multiprocessing.cpu_count())
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = False
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+# recycle workers now and then (0 = never); jitter keeps them from restarting together
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+
+def on_starting(server) -> None:
+    if os.environ.get("GUNICORN_BOOTSTRAP", "true").lower() in _TRUE:
+        server.log.info("Bootstrapping (migrations, bucket, default user)")
+        subprocess.run([sys.executable, "-m", "src.app.tasks.bootstrap"], check=True)
+    for name in ("DB_AUTO_MIGRATE", "DEFAULT_USER_ON_STARTUP", "MINIO_BOOTSTRAP_ON_FIRST_USE"):
+        os.environ.setdefault(name, "false")
+
@@ -0,0 +1,35 @@
+# src/app/api/api_v1/endpoints/async_auth.py  – DATABASE_MODE=async
+
+from datetime import timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.schemas.token import Token
+from src.app.crud.async_user_crud import authenticate_user
+from src.app.core.security import create_access_token
+from src.app.database.async_database import get_async_db
+from src.app.core.config import settings
+
+router = APIRouter()
+
+
+@router.post("/login", response_model=Token)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """OAuth2-compatible login, returning a JWT."""
+    user = await authenticate_user(db, form_data.username, form_data.password)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    access_token = create_access_token(
+        data={"sub": user.username, "uid": user.id},
+        expires_delta=timedelta(minutes=settings.access_token_expire_minutes),
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
@@ -0,0 +1,181 @@
+# async_posts.py  – posts routes on the AsyncSession stack (DATABASE_MODE=async)
+from typing import List, Optional, Union
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, HTTPException, Form, UploadFile, File,
+    Query, Request,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from src.app.core.config import settings
+from src.app.database.async_database import get_async_db, get_async_sessionmaker
+from src.app.schemas.post_schema import (
+    BulkImportResult, PostCreate, PostOut, PostSearchHit, PostSummaryOut,
+)
+from src.app.crud import async_post_crud as post_crud
+from src.app.crud import async_search_crud as search_crud
+from src.app.utils.file import save_image_async
+from src.app.utils.ndjson import NDJSON_MEDIA_TYPE
+from src.app.utils.http_cache import (
+    is_conditional, is_not_modified, last_modified_of, not_modified,
+)
+from src.app.utils.json_response import json_response
+from src.app.models.user_model import User
+from src.app.api.deps import get_current_user_async
+from src.app.api.api_v1.endpoints.posts import (
+    FeedView, _EXPORT_HEADERS, _bulk_import, _decode_cursor, _feed_adapter,
+    _feed_headers, _feed_items, _feed_scopes, _make_out, _ndjson, _post_out, _post_headers, _render_feed, _search_out, _search_params,
+    _versions,
+)
+from src.app.services.response_cache import response_cache
+from src.app.tasks.image_processing import process_post_image
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# ---------- helpers ----------
+async def _save_image(image: Optional[UploadFile]) -> Optional[str]:
+    # streamed on the upload executor, off the event loop
+    if image and image.filename:
+        return await save_image_async(image)
+    return None
+
+# ---------- routes ----------
+@router.get("/", response_model=Union[List[PostOut], List[PostSummaryOut]])
+async def read_posts(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(min(100, settings.feed_max_limit), ge=1, le=settings.feed_max_limit),
+    tag: Optional[str] = None,
+    cursor: Optional[str] = None,
+    view: FeedView = "full",
+    db: AsyncSession = Depends(get_async_db),
+):
+    keyset = cursor is not None
+    after = _decode_cursor(cursor)
+    summary = view == "summary"
+
+    async def load():
+        if keyset:
+            return await post_crud.get_posts_after(
+                db, after=after, limit=limit, tag_name=tag, summary=summary
+            )
+        return await post_crud.get_posts(
+            db, skip=skip, limit=limit, tag_name=tag, summary=summary
+        )
+
+    if response_cache.enabled:
+        async def render():
+            return _render_feed(await load(), keyset, limit, view)
+
+        key = await response_cache.akey("feed", _feed_scopes(tag), (skip, limit, tag, cursor, view))
+        cached = await response_cache.aget_or_set(key, render)
+        return cached.to_response(request)
+
+    if is_conditional(request):
+        versions = await post_crud.get_page_versions(
+            db, skip=skip, limit=limit, tag_name=tag, after=after, keyset=keyset
+        )
+        headers = _feed_headers(versions, keyset, limit, view)
+        if is_not_modified(request, headers["ETag"]):
+            return not_modified(headers)
+
+    posts = await load()
+    headers = _feed_headers(_versions(posts), keyset, limit, view)
+    return json_response(_feed_adapter(view), _feed_items(posts, view), headers)
+
+@router.post("/bulk", response_model=BulkImportResult)
+async def bulk_import_posts(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    return await _bulk_import(request, lambda rows: post_crud.import_posts(db, rows))
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_posts(current_user: User = Depends(get_current_user_async)):
+    async def stream():
+        async with get_async_sessionmaker()() as db:
+            async for batch in post_crud.export_posts(db, settings.export_batch_size):
+                yield _ndjson(batch)
+
+    return StreamingResponse(stream(), media_type=NDJSON_MEDIA_TYPE, headers=_EXPORT_HEADERS)
+
+@router.get("/search", response_model=List[PostSearchHit])
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    query, after = _search_params(db.get_bind().dialect.name, q, cursor)
+    return _search_out(await search_crud.search_posts(db, query, after, limit), limit)
+
+@router.get("/{post_id:int}", response_model=PostOut)
+async def read_post(
+    post_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
+    if is_conditional(request):
+        version = await post_crud.get_post_version(db, post_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Post not found")
+        headers = _post_headers(version)
+        if is_not_modified(request, headers["ETag"], last_modified_of(*version[1:])):
+            return not_modified(headers)
+
+    post = await post_crud.get_post(db, post_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return json_response(_post_out, _make_out(post), _post_headers(_versions([post])[0]))
+
+@router.post("/", response_model=PostOut)
+async def create_post(
+    background_tasks: BackgroundTasks,
+    title: str = Form(...),
+    content: str = Form(...),
+    tags: Optional[str] = Form(None),
+    image: Optional[UploadFile] = File(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    img_path = await _save_image(image)
+    obj_in   = PostCreate(title=title, content=content, tags=tags)
+    post     = await post_crud.create_post(db, obj_in=obj_in, image_url=img_path)
+    if img_path:
+        background_tasks.add_task(process_post_image, post.id, img_path)
+    return json_response(_post_out, _make_out(post))
+
+@router.put("/{post_id:int}", response_model=PostOut)
+async def update_post(
+    post_id: int,
+    background_tasks: BackgroundTasks,
+    title: str = Form(...),
+    content: str = Form(...),
+    tags: Optional[str] = Form(None),          # send "" to clear all
+    image: Optional[UploadFile] = File(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    post = await post_crud.get_post(db, post_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    img_path = await _save_image(image)
+    obj_in   = PostCreate(title=title, content=content, tags=tags)
+    post     = await post_crud.update_post(db, post=post, obj_in=obj_in, image_url=img_path)
+    if img_path:
+        background_tasks.add_task(process_post_image, post.id, img_path)
+    return json_response(_post_out, _make_out(post))
+
+@router.delete("/{post_id:int}", status_code=204)
+async def delete_post(
+    post_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    post = await post_crud.get_post(db, post_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    await post_crud.delete_post(db, post)
@@ -0,0 +1,36 @@
+# async_tags.py  – tag routes on the AsyncSession stack (DATABASE_MODE=async)
+from typing import List, Union
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.database.async_database import get_async_db
+from src.app.crud.async_tag_crud import get_tag_index, get_tags_version
+from src.app.schemas.tag_schema import TagStatsOut
+from src.app.utils.http_cache import is_not_modified, not_modified
+from src.app.utils.json_response import json_response
+from src.app.services.response_cache import response_cache
+from src.app.api.api_v1.endpoints.tags import TagQuery, _render_tags, _tags_headers
+
+router = APIRouter()
+
+@router.get("/", response_model=Union[List[TagStatsOut], List[str]])
+async def list_all_tags(
+    request: Request,
+    query: TagQuery = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if response_cache.enabled:
+        async def render():
+            version = await get_tags_version(db)
+            return _render_tags(version, await get_tag_index(db, version), query)
+
+        cached = await response_cache.aget_or_set(
+            await response_cache.akey("tags", ["tags"], query.params()), render
+        )
+        return cached.to_response(request)
+
+    version = await get_tags_version(db)
+    headers = _tags_headers(version, query)
+    if is_not_modified(request, headers["ETag"]):
+        return not_modified(headers)
+    return json_response(query.adapter, query.payload(await get_tag_index(db, version)), headers)
@@ -7,7 +7,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from src.app.schemas.token import Token
-from src.app.crud.user_crud import authenticate_user
+from src.app.crud.user_crud import authenticate_user_offloaded
 from src.app.core.security import create_access_token
 from src.app.database.database import get_db
 from src.app.core.config import settings
@@ -16,16 +16,19 @@ router = APIRouter()
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
 ):
     """
     OAuth2-compatible login, returning a JWT.
     Swagger will render a username/password form here.
+
+    `async def` so bcrypt runs on the hashing pool instead of pinning a
+    request-threadpool worker (DB lookups still go to the threadpool).
     """
     # OAuth2PasswordRequestForm has .username and .password
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user_offloaded(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -33,7 +36,7 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     access_token = create_access_token(
-        data={"sub": user.username},
+        data={"sub": user.username, "uid": user.id},
         expires_delta=timedelta(minutes=settings.access_token_expire_minutes),
     )
     return {"access_token": access_token, "token_type": "bearer"}
@@ -1,51 +1,316 @@
 # posts.py
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Form, UploadFile, File
+from typing import List, Literal, Optional, Union
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, HTTPException, Form, UploadFile, File,
+    Query, Request, Response,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 import logging
 
-from src.app.database.database import get_db
-from src.app.schemas.post_schema import PostCreate, PostOut
-from src.app.crud import post_crud
+from src.app.core.config import settings
+from src.app.database.database import SessionLocal, get_db
+from src.app.schemas.post_schema import (
+    BulkImportError, BulkImportResult, PostCreate, PostExportRow, PostImportRow,
+    PostOut, PostSearchHit, PostSummaryOut,
+)
+from src.app.crud import post_crud, search_crud
 from src.app.utils.file import save_image
+from src.app.utils.json_response import encode_json, json_response
+from src.app.utils.ndjson import NDJSON_MEDIA_TYPE, iter_lines
+from src.app.utils.pagination import (
+    decode_cursor, decode_rank_cursor, encode_cursor, encode_rank_cursor,
+)
+from src.app.utils.http_cache import (
+    is_conditional, is_not_modified, last_modified_of, make_etag,
+    not_modified, validator_headers,
+)
 from src.app.models.user_model import User
 from src.app.api.deps import get_current_user
+from src.app.tasks.image_processing import process_post_image
+from src.app.services.response_cache import CachedResponse, response_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# responses are encoded by these adapters directly (utils/json_response.py),
+# so each object is validated once – when it is built – and never again
+_post_out = TypeAdapter(PostOut)
+_post_list = TypeAdapter(List[PostOut])
+_summary_list = TypeAdapter(List[PostSummaryOut])
+_search_list = TypeAdapter(List[PostSearchHit])
+_import_row = TypeAdapter(PostImportRow)
+_export_rows = TypeAdapter(List[PostExportRow])
+_export_row = TypeAdapter(PostExportRow)
+
+# "full" → PostOut, "summary" → PostSummaryOut (no content, precomputed excerpt)
+FeedView = Literal["full", "summary"]
+
 # ---------- helpers ----------
+def _image_fields(p) -> dict:
+    meta = p.image_meta or {}
+    return dict(
+        image_url=p.image_url,
+        image_width=meta.get("width"),
+        image_height=meta.get("height"),
+        image_blurhash=meta.get("blurhash"),
+        image_variants=meta.get("variants", []),
+    )
+
 def _make_out(p) -> PostOut:
     return PostOut(
         id=p.id,
         title=p.title,
         content=p.content,
-        image_url=p.image_url,
+        **_image_fields(p),
+        tags=[t.name for t in p.tags],
+        created_at=p.created_at,
+        updated_at=p.updated_at,
+    )
+
+def _make_summary(p) -> PostSummaryOut:
+    return PostSummaryOut(
+        id=p.id,
+        title=p.title,
+        excerpt=p.excerpt or "",
+        **_image_fields(p),
         tags=[t.name for t in p.tags],
         created_at=p.created_at,
         updated_at=p.updated_at,
     )
 
+def _feed_items(posts, view: FeedView) -> list:
+    make = _make_summary if view == "summary" else _make_out
+    return [make(p) for p in posts]
+
+def _feed_adapter(view: FeedView) -> TypeAdapter:
+    return _summary_list if view == "summary" else _post_list
+
+def _versions(posts) -> List[post_crud.PostVersion]:
+    return [(p.id, p.created_at, p.updated_at) for p in posts]
+
+def _decode_cursor(cursor: Optional[str]):
+    try:
+        return decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _search_params(dialect_name: str, q: str, cursor: Optional[str]):
+    """(match query, rank cursor) for /search, or 400 for unusable input."""
+    if not search_crud.supports_search(dialect_name):
+        raise HTTPException(status_code=501, detail="Search is not available on this database")
+    query = search_crud.match_query(dialect_name, q)
+    if query is None:
+        raise HTTPException(status_code=400, detail="Search terms need at least 3 characters")
+    try:
+        return query, decode_rank_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _search_out(hits, limit: int) -> Response:
+    headers = {}
+    if len(hits) == limit:
+        headers["X-Next-Cursor"] = encode_rank_cursor(hits[-1].rank_key, hits[-1].id)
+    return json_response(_search_list, [PostSearchHit(**hit._asdict()) for hit in hits], headers)
+
+def _first_error(err: ValidationError) -> str:
+    first = err.errors()[0]
+    loc = ".".join(str(part) for part in first["loc"])
+    return f"{loc}: {first['msg']}" if loc else first["msg"]
+
+async def _bulk_import(request: Request, insert_batch) -> BulkImportResult:
+    """
+    Parse the NDJSON body line by line and hand valid rows to
+    `insert_batch(rows) -> inserted count` in BULK_IMPORT_BATCH_SIZE chunks
+    (one transaction each). Bad lines are reported and skipped; a batch the
+    database rejects is reported line by line and the import continues.
+    """
+    result = BulkImportResult()
+    batch: List[PostImportRow] = []
+    batch_lines: List[int] = []
+
+    def fail(line: int, error: str) -> None:
+        result.failed += 1
+        if len(result.errors) < settings.bulk_import_max_errors:
+            result.errors.append(BulkImportError(line=line, error=error))
+
+    async def flush() -> None:
+        try:
+            result.inserted += await insert_batch(batch)
+        except SQLAlchemyError as err:
+            logger.warning("Bulk import batch (lines %s-%s) failed: %s",
+                           batch_lines[0], batch_lines[-1], err)
+            for line in batch_lines:
+                fail(line, f"batch rejected by the database ({type(err).__name__})")
+        batch.clear()
+        batch_lines.clear()
+
+    async for line_no, line in iter_lines(request.stream(), settings.bulk_import_max_line_bytes):
+        result.received += 1
+        if line is None:
+            fail(line_no, f"line longer than {settings.bulk_import_max_line_bytes} bytes")
+            continue
+        try:
+            batch.append(_import_row.validate_json(line))
+        except ValidationError as err:
+            fail(line_no, _first_error(err))
+            continue
+        batch_lines.append(line_no)
+        if len(batch) >= settings.bulk_import_batch_size:
+            await flush()
+    if batch:
+        await flush()
+    return result
+
+def _ndjson(batch: List[dict]) -> bytes:
+    return b"".join(
+        _export_row.dump_json(row) + b"\n" for row in _export_rows.validate_python(batch)
+    )
+
+_EXPORT_HEADERS = {"Content-Disposition": 'attachment; filename="posts.ndjson"'}
+
+def _feed_headers(versions, keyset: bool, limit: int, view: FeedView = "full") -> dict:
+    """ETag of the page (ids + timestamps) and, in cursor mode, X-Next-Cursor."""
+    parts = ("posts", versions) if view == "full" else ("posts", view, versions)
+    headers = validator_headers(make_etag(*parts))
+    if keyset and versions and len(versions) == limit:
+        last_id, last_created_at, _ = versions[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last_created_at, last_id)
+    return headers
+
+def _feed_scopes(tag: Optional[str]) -> List[str]:
+    return [f"tag:{tag}"] if tag else ["feed"]
+
+def _render_feed(posts, keyset: bool, limit: int, view: FeedView = "full") -> CachedResponse:
+    return CachedResponse(
+        body=encode_json(_feed_adapter(view), _feed_items(posts, view)),
+        headers=_feed_headers(_versions(posts), keyset, limit, view),
+    )
+
+def _post_headers(version) -> dict:
+    post_id, created_at, updated_at = version
+    return validator_headers(
+        make_etag("post", post_id, created_at, updated_at),
+        last_modified_of(created_at, updated_at),
+    )
+
 # ---------- routes ----------
-@router.get("/", response_model=List[PostOut])
+@router.get("/", response_model=Union[List[PostOut], List[PostSummaryOut]])
 def read_posts(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(min(100, settings.feed_max_limit), ge=1, le=settings.feed_max_limit),
     tag: Optional[str] = None,
+    cursor: Optional[str] = None,
+    view: FeedView = "full",
+    db: Session = Depends(get_db),
+):
+    """
+    Two paging modes:
+    • `skip`/`limit`  – classic offset paging; `limit` ≤ FEED_MAX_LIMIT
+    • `cursor`        – newest-first keyset paging; send `cursor=` (empty)
+                        for the first page, then the `X-Next-Cursor` value
+
+    `view=summary` returns `PostSummaryOut` items: `excerpt` instead of
+    `content`, which is then not even read from the database.
+
+    Pages are served from `response_cache` when it is enabled; otherwise
+    conditional requests (`If-None-Match`) are answered from a
+    (id, created_at, updated_at) query of the page, without loading bodies.
+    """
+    keyset = cursor is not None
+    after = _decode_cursor(cursor)
+    summary = view == "summary"
+
+    def load():
+        if keyset:
+            return post_crud.get_posts_after(
+                db, after=after, limit=limit, tag_name=tag, summary=summary
+            )
+        return post_crud.get_posts(db, skip=skip, limit=limit, tag_name=tag, summary=summary)
+
+    if response_cache.enabled:
+        key = response_cache.key("feed", _feed_scopes(tag), (skip, limit, tag, cursor, view))
+        cached = response_cache.get_or_set(key, lambda: _render_feed(load(), keyset, limit, view))
+        return cached.to_response(request)
+
+    if is_conditional(request):
+        versions = post_crud.get_page_versions(
+            db, skip=skip, limit=limit, tag_name=tag, after=after, keyset=keyset
+        )
+        headers = _feed_headers(versions, keyset, limit, view)
+        if is_not_modified(request, headers["ETag"]):
+            return not_modified(headers)
+
+    posts = load()
+    headers = _feed_headers(_versions(posts), keyset, limit, view)
+    return json_response(_feed_adapter(view), _feed_items(posts, view), headers)
+
+@router.post("/bulk", response_model=BulkImportResult)
+async def bulk_import_posts(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Streamed NDJSON import, one post per line:
+    `{"title", "content", "tags": [..] | "a,b", "image_url", "image_meta", "created_at", "updated_at"}`
+    (the export format; `id` is ignored). Images must already be uploaded.
+    """
+    return await _bulk_import(
+        request, lambda rows: run_in_threadpool(post_crud.import_posts, db, rows)
+    )
+
+@router.get("/export", response_class=StreamingResponse)
+def export_posts(current_user: User = Depends(get_current_user)):
+    """Every post as NDJSON, streamed in EXPORT_BATCH_SIZE chunks."""
+    def stream():
+        # own session: dependency teardown runs before the body is streamed
+        with SessionLocal() as db:
+            for batch in post_crud.export_posts(db, settings.export_batch_size):
+                yield _ndjson(batch)
+
+    return StreamingResponse(stream(), media_type=NDJSON_MEDIA_TYPE, headers=_EXPORT_HEADERS)
+
+@router.get("/search", response_model=List[PostSearchHit])
+def search_posts(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Full-text search over title + content, best match first. Pass the
+    `X-Next-Cursor` response header back as `cursor` for the next page.
+    """
+    query, after = _search_params(db.get_bind().dialect.name, q, cursor)
+    return _search_out(search_crud.search_posts(db, query, after, limit), limit)
+
+@router.get("/{post_id:int}", response_model=PostOut)
+def read_post(
+    post_id: int,
+    request: Request,
     db: Session = Depends(get_db),
 ):
-    posts = post_crud.get_posts(db, skip=skip, limit=limit, tag_name=tag)
-    return [_make_out(p) for p in posts]
+    if is_conditional(request):
+        version = post_crud.get_post_version(db, post_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Post not found")
+        headers = _post_headers(version)
+        if is_not_modified(request, headers["ETag"], last_modified_of(*version[1:])):
+            return not_modified(headers)
 
-@router.get("/{post_id}", response_model=PostOut)
-def read_post(post_id: int, db: Session = Depends(get_db)):
     post = post_crud.get_post(db, post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    return _make_out(post)
+    return json_response(_post_out, _make_out(post), _post_headers(_versions([post])[0]))
 
 @router.post("/", response_model=PostOut)
 def create_post(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     content: str = Form(...),
     tags: Optional[str] = Form(None),          # ← appears in Swagger
@@ -56,11 +321,14 @@ def create_post(
     img_path = save_image(image) if image and image.filename else None
     obj_in   = PostCreate(title=title, content=content, tags=tags)
     post     = post_crud.create_post(db, obj_in=obj_in, image_url=img_path)
-    return _make_out(post)
+    if img_path:
+        background_tasks.add_task(process_post_image, post.id, img_path)
+    return json_response(_post_out, _make_out(post))
 
-@router.put("/{post_id}", response_model=PostOut)
+@router.put("/{post_id:int}", response_model=PostOut)
 def update_post(
     post_id: int,
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     content: str = Form(...),
     tags: Optional[str] = Form(None),          # send "" to clear all
@@ -74,9 +342,11 @@ def update_post(
     img_path = save_image(image) if image and image.filename else None
     obj_in   = PostCreate(title=title, content=content, tags=tags)
     post     = post_crud.update_post(db, post=post, obj_in=obj_in, image_url=img_path)
-    return _make_out(post)
+    if img_path:
+        background_tasks.add_task(process_post_image, post.id, img_path)
+    return json_response(_post_out, _make_out(post))
 
-@router.delete("/{post_id}", status_code=204)
+@router.delete("/{post_id:int}", status_code=204)
 def delete_post(
     post_id: int,
     db: Session = Depends(get_db),
@@ -1,13 +1,86 @@
 # tags.py
-from typing import List
-from fastapi import APIRouter, Depends
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, Query, Request
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from src.app.database.database import get_db
-from src.app.models.tag_model import Tag
+from src.app.crud.tag_crud import get_tag_index, get_tags_version
+from src.app.schemas.tag_schema import TagStatsOut
+from src.app.services.tag_index import TagIndex
+from src.app.utils.http_cache import (
+    is_not_modified, make_etag, not_modified, validator_headers,
+)
+from src.app.utils.json_response import encode_json, json_response
+from src.app.services.response_cache import CachedResponse, response_cache
 
 router = APIRouter()
 
-@router.get("/", response_model=List[str])
-def list_all_tags(db: Session = Depends(get_db)):
-    return [t.name for t in db.query(Tag).order_by(Tag.name).all()]
+_names = TypeAdapter(List[str])
+_stats = TypeAdapter(List[TagStatsOut])
+
+TagOrder = Literal["name", "popular", "recent"]
+
+
+class TagQuery:
+    """Query parameters of the tag list; also the cache/ETag discriminator."""
+
+    def __init__(
+        self,
+        with_counts: bool = False,
+        order: TagOrder = "name",
+        prefix: Optional[str] = Query(None, max_length=50, description="Autocomplete prefix"),
+        limit: Optional[int] = Query(None, ge=1, le=1000),
+    ):
+        self.with_counts = with_counts
+        self.order = order
+        self.prefix = prefix
+        self.limit = limit
+
+    def params(self) -> tuple:
+        return (self.with_counts, self.order, self.prefix, self.limit)
+
+    def payload(self, index: TagIndex) -> list:
+        entries = index.query(self.prefix, self.order, self.limit)
+        if self.with_counts:
+            return [TagStatsOut(**e._asdict()) for e in entries]
+        return [e.name for e in entries]
+
+    @property
+    def adapter(self) -> TypeAdapter:
+        return _stats if self.with_counts else _names
+
+
+def _tags_headers(version, query: TagQuery) -> dict:
+    return validator_headers(make_etag("tags", version, query.params()))
+
+def _render_tags(version, index: TagIndex, query: TagQuery) -> CachedResponse:
+    return CachedResponse(
+        body=encode_json(query.adapter, query.payload(index)),
+        headers=_tags_headers(version, query),
+    )
+
+@router.get("/", response_model=Union[List[TagStatsOut], List[str]])
+def list_all_tags(
+    request: Request,
+    query: TagQuery = Depends(),
+    db: Session = Depends(get_db),
+):
+    """
+    Tag names, or with `with_counts=true` the tag cloud (post_count,
+    last_used_at). `order=popular|recent|name`, `prefix=` for autocomplete.
+    Served from the in-memory tag index (services/tag_index.py).
+    """
+    if response_cache.enabled:
+        def render():
+            version = get_tags_version(db)
+            return _render_tags(version, get_tag_index(db, version), query)
+
+        key = response_cache.key("tags", ["tags"], query.params())
+        return response_cache.get_or_set(key, render).to_response(request)
+
+    version = get_tags_version(db)
+    headers = _tags_headers(version, query)
+    if is_not_modified(request, headers["ETag"]):
+        return not_modified(headers)
+    return json_response(query.adapter, query.payload(get_tag_index(db, version)), headers)
@@ -1,7 +1,17 @@
 from fastapi import APIRouter
-from src.app.api.api_v1.endpoints import auth, posts, tags
+from src.app.core.config import settings
+
+# DATABASE_MODE picks the stack; both expose the same routes
+if settings.database_mode == "async":
+    from src.app.api.api_v1.endpoints import (
+        async_auth as auth,
+        async_posts as posts,
+        async_tags as tags,
+    )
+else:
+    from src.app.api.api_v1.endpoints import auth, posts, tags
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(posts.router, prefix="/posts", tags=["posts"])
-api_router.include_router(tags.router, prefix="/posts/tags", tags=["tags"])
\ No newline at end of file
+api_router.include_router(tags.router, prefix="/posts/tags", tags=["tags"])
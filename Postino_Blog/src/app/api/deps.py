@@ -3,11 +3,16 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.app.database.database import get_db
+from src.app.database.async_database import get_async_db
+from src.app.crud import async_user_crud
 from src.app.crud.user_crud import get_user_by_username
 from src.app.core.security import decode_access_token
+from src.app.core.auth_cache import get_cached_user, remember_user
+from src.app.core.config import settings
 from src.app.models.user_model import User
 
 # This tells FastAPI / OpenAPI that we have an OAuth2 Bearer flow,
@@ -15,6 +20,33 @@ from src.app.models.user_model import User
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _claims_from_token(token: str) -> dict:
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        raise _credentials_exception()
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+    return payload
+
+
+def _user_without_db(payload: dict) -> User | None:
+    """Resolve the user from signed claims or the in-process cache."""
+    username: str = payload["sub"]
+    uid = payload.get("uid")
+    if settings.auth_trust_token_claims and uid is not None:
+        return User(id=uid, username=username)
+    return get_cached_user(username)
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
@@ -23,23 +55,34 @@ def get_current_user(
     Dependency that:
       1) Reads an OAuth2 Bearer token from the Authorization header
       2) Decodes + validates it
-      3) Loads the User from the database
+      3) Resolves the User from trusted claims / the user cache, and only
+         on a miss loads it from the database
+
+    A cache/claims hit returns a transient User with just `id` and
+    `username` set.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    payload = _claims_from_token(token)
+    user = _user_without_db(payload)
+    if user is not None:
+        return user
+    user = get_user_by_username(db, payload["sub"])
+    if user is None:
+        raise _credentials_exception()
+    remember_user(user)
+    return user
 
-    try:
-        payload = decode_access_token(token)
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
 
-    user = get_user_by_username(db, username)
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """`get_current_user` for the async routes (DATABASE_MODE=async)."""
+    payload = _claims_from_token(token)
+    user = _user_without_db(payload)
+    if user is not None:
+        return user
+    user = await async_user_crud.get_user_by_username(db, payload["sub"])
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    remember_user(user)
     return user
@@ -0,0 +1,83 @@
+# src/app/api/health.py
+"""
+Liveness and readiness probes, mounted at the root (not under /api/v1).
+
+* `GET /health/live`  – the process serves requests; never touches the DB
+* `GET /health/ready` – startup finished, not shutting down, and the
+  database answers `SELECT 1` within READINESS_TIMEOUT_SECONDS; 503
+  otherwise, so a load balancer stops routing to this worker
+
+Read replicas are listed with their last health check (database/routing.py)
+but don't affect readiness: reads fall back to the primary without them.
+Storage is deliberately not probed: the MinIO client is lazy and an
+outage only fails the requests that touch it (services/registry.py).
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import APIRouter, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from src.app.core.config import settings
+from src.app.database.routing import active_replicas
+
+router = APIRouter()
+
+
+class _Readiness:
+    ready = False
+
+
+readiness = _Readiness()
+
+
+def mark_ready() -> None:
+    readiness.ready = True
+
+
+def mark_not_ready() -> None:
+    readiness.ready = False
+
+
+def _ping_sync() -> None:
+    from src.app.database.database import engine
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def _ping() -> None:
+    if settings.database_mode == "async":
+        from src.app.database.async_database import get_async_engine
+
+        async with get_async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    else:
+        await run_in_threadpool(_ping_sync)
+
+
+@router.get("/live")
+async def live() -> dict:
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready() -> JSONResponse:
+    if not readiness.ready:
+        return JSONResponse({"status": "not ready"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    try:
+        await asyncio.wait_for(_ping(), settings.readiness_timeout_seconds)
+    except Exception as exc:
+        return JSONResponse(
+            {"status": "unavailable", "database": type(exc).__name__},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    body = {"status": "ready", "database": "ok"}
+    replicas = active_replicas()
+    if replicas:
+        body["replicas"] = replicas.stats()
+    return JSONResponse(body)
@@ -0,0 +1,56 @@
+# src/app/core/auth_cache.py
+"""
+username → (id, username) cache for `get_current_user`.
+
+Entries are dropped whenever a User row is inserted, updated or deleted
+through the ORM, so a renamed or removed account stops authenticating
+immediately in this process (other processes within the TTL).
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event, inspect
+
+from src.app.core.config import settings
+from src.app.models.user_model import User
+from src.app.utils.ttl_cache import TTLCache
+
+
+class CachedUser(NamedTuple):
+    id: int
+    username: str
+
+    def to_user(self) -> User:
+        """Transient (session-less) User carrying only id + username."""
+        return User(id=self.id, username=self.username)
+
+
+user_cache: TTLCache[str, CachedUser] = TTLCache(
+    ttl_seconds=settings.auth_user_cache_ttl_seconds,
+    max_entries=settings.auth_user_cache_max_entries,
+)
+
+
+def get_cached_user(username: str) -> Optional[User]:
+    cached = user_cache.get(username)
+    return cached.to_user() if cached is not None else None
+
+
+def remember_user(user: User) -> None:
+    user_cache.set(user.username, CachedUser(user.id, user.username))
+
+
+def invalidate_user(username: str) -> None:
+    user_cache.pop(username)
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target: User) -> None:
+    history = inspect(target).attrs.username.history
+    for username in (*history.deleted, target.username):
+        if username:
+            invalidate_user(username)
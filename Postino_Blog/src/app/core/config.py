@@ -5,21 +5,169 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     # ── Database & JWT ────────────────────────────────
     database_url: str = Field("sqlite:///./postino.db", env="DATABASE_URL")
+    # "sync" → def routes + Session, "async" → async def routes + AsyncSession
+    database_mode: str = Field("sync", env="DATABASE_MODE")
+    # defaults to DATABASE_URL with the async driver (aiosqlite / asyncpg)
+    async_database_url: str | None = Field(None, env="ASYNC_DATABASE_URL")
+    # `alembic upgrade head` on startup; turn off when deploys migrate separately
+    db_auto_migrate: bool = Field(True, env="DB_AUTO_MIGRATE")
+
+    # ── Connection pool (server databases) ───────────
+    db_pool_size: int         = Field(5,    env="DB_POOL_SIZE")
+    db_max_overflow: int      = Field(10,   env="DB_MAX_OVERFLOW")
+    db_pool_timeout: float    = Field(30.0, env="DB_POOL_TIMEOUT")
+    db_pool_recycle: int      = Field(1800, env="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool    = Field(True, env="DB_POOL_PRE_PING")
+    db_statement_timeout_ms: int | None = Field(None, env="DB_STATEMENT_TIMEOUT_MS")
+    # connections for *all* workers together; overrides DB_POOL_SIZE / DB_MAX_OVERFLOW
+    # with total // WEB_CONCURRENCY per worker and no overflow
+    db_pool_total: int | None = Field(None, env="DB_POOL_TOTAL")
+
+    # ── Read replicas (database/routing.py) ──────────
+    # comma-separated URLs, same form as DATABASE_URL; empty = no replicas
+    db_replica_urls: str = Field("", env="DB_REPLICA_URLS")
+    db_replica_balance: str = Field("round_robin", env="DB_REPLICA_BALANCE")  # | "least_connections"
+    db_replica_health_interval_seconds: float = Field(10.0, env="DB_REPLICA_HEALTH_INTERVAL_SECONDS")
+    # a replica that failed to connect is skipped this long
+    db_replica_retry_seconds: float = Field(30.0, env="DB_REPLICA_RETRY_SECONDS")
+    # Postgres only: replicas further behind are skipped until they catch up
+    db_replica_max_lag_seconds: float | None = Field(None, env="DB_REPLICA_MAX_LAG_SECONDS")
+    # a client that wrote reads from the primary for this long (0 = only within the request)
+    db_read_your_writes_seconds: float = Field(5.0, env="DB_READ_YOUR_WRITES_SECONDS")
+
+    # ── Workers (gunicorn.conf.py) ───────────────────
+    # worker processes; gunicorn.conf.py exports the value it settles on
+    web_concurrency: int = Field(1, env="WEB_CONCURRENCY")
+    # GET /health/ready fails when the database doesn't answer within this
+    readiness_timeout_seconds: float = Field(2.0, env="READINESS_TIMEOUT_SECONDS")
+
+    # ── SQLite pragmas (applied on every new connection) ─
+    sqlite_journal_mode: str  = Field("WAL",       env="SQLITE_JOURNAL_MODE")
+    sqlite_synchronous: str   = Field("NORMAL",    env="SQLITE_SYNCHRONOUS")
+    sqlite_busy_timeout_ms: int = Field(5000,      env="SQLITE_BUSY_TIMEOUT_MS")
+    sqlite_mmap_size: int     = Field(268435456,   env="SQLITE_MMAP_SIZE")    # 256 MiB
+    sqlite_cache_size: int    = Field(-64000,      env="SQLITE_CACHE_SIZE")   # KiB when < 0
     secret_key: str = Field(..., env="SECRET_KEY")
     algorithm: str = Field(..., env="ALGORITHM")
     access_token_expire_minutes: int = Field(
         ..., env="ACCESS_TOKEN_EXPIRE_MINUTES"
     )
 
+    # ── Authenticated-user lookup ────────────────────
+    # trust signed `sub`/`uid` claims and skip the DB entirely
+    auth_trust_token_claims: bool  = Field(False, env="AUTH_TRUST_TOKEN_CLAIMS")
+    # otherwise cache username → user for this long (0 disables)
+    auth_user_cache_ttl_seconds: int  = Field(60,   env="AUTH_USER_CACHE_TTL_SECONDS")
+    auth_user_cache_max_entries: int  = Field(4096, env="AUTH_USER_CACHE_MAX_ENTRIES")
+
+    # ── Password hashing (bcrypt off the request path) ─
+    password_hash_workers: int     = Field(2,    env="PASSWORD_HASH_WORKERS")
+    password_hash_max_queue: int   = Field(64,   env="PASSWORD_HASH_MAX_QUEUE")
+    # 0 disables the cache of successful verifications
+    login_cache_ttl_seconds: int   = Field(0,    env="LOGIN_CACHE_TTL_SECONDS")
+    login_cache_max_entries: int   = Field(1024, env="LOGIN_CACHE_MAX_ENTRIES")
+
     # ── Default admin ────────────────────────────────
     default_user_email: str = Field(..., env="DEFAULT_USER_EMAIL")
     default_user_password: str = Field(..., env="DEFAULT_USER_PASSWORD")
+    # create it on startup if missing; off when `tasks.bootstrap` runs at deploy
+    default_user_on_startup: bool = Field(True, env="DEFAULT_USER_ON_STARTUP")
 
     # ── MinIO (new names) ────────────────────────────
     minio_endpoint: str      = Field(..., env="MINIO_ENDPOINT")
     minio_root_user: str     = Field(..., env="MINIO_ROOT_USER")
     minio_root_password: str = Field(..., env="MINIO_ROOT_PASSWORD")
     minio_bucket: str        = Field(..., env="MINIO_BUCKET")
+    # create the bucket when the client is first used (services/registry.py);
+    # off when `python -m src.app.tasks.bootstrap` creates it at deploy time
+    minio_bootstrap_on_first_use: bool = Field(True, env="MINIO_BOOTSTRAP_ON_FIRST_USE")
+
+    # ── HTTP caching of read endpoints ───────────────
+    http_cache_public: bool   = Field(True, env="HTTP_CACHE_PUBLIC")
+    http_cache_max_age: int   = Field(0,    env="HTTP_CACHE_MAX_AGE")
+    http_cache_stale_while_revalidate: int = Field(60, env="HTTP_CACHE_STALE_WHILE_REVALIDATE")
+
+    # ── Server-side response cache (feed + tag list) ─
+    # "memory" | "redis" | "none"; with WEB_CONCURRENCY > 1 "memory" means "none"
+    response_cache_backend: str     = Field("memory", env="RESPONSE_CACHE_BACKEND")
+    response_cache_redis_url: str   = Field("redis://localhost:6379/0", env="RESPONSE_CACHE_REDIS_URL")
+    response_cache_ttl_seconds: int = Field(30,   env="RESPONSE_CACHE_TTL_SECONDS")
+    response_cache_max_entries: int = Field(2048, env="RESPONSE_CACHE_MAX_ENTRIES")
+
+    # ── Shared state (services/shared_state.py) ──────
+    # read-your-writes marks and rate limits; "redis" to share them across workers
+    shared_state_backend: str     = Field("memory", env="SHARED_STATE_BACKEND")   # | "redis" | "none"
+    shared_state_redis_url: str   = Field("redis://localhost:6379/0", env="SHARED_STATE_REDIS_URL")
+    shared_state_max_entries: int = Field(100_000, env="SHARED_STATE_MAX_ENTRIES")
+
+    # ── Rate limiting (services/rate_limit.py) ───────
+    rate_limit_enabled: bool = Field(True, env="RATE_LIMIT_ENABLED")
+    # "<METHOD|*> <path prefix>=<count>/<second|minute|hour>; …" – first match wins
+    rate_limit_rules: str = Field(
+        "POST /api/v1/auth/login=10/minute; POST /api/v1/posts=120/minute; "
+        "GET /api/v1/posts=1200/minute; *=2400/minute",
+        env="RATE_LIMIT_RULES",
+    )
+    rate_limit_key: str = Field("subject_or_ip", env="RATE_LIMIT_KEY")    # | "ip"
+    # client IP from the first X-Forwarded-For entry (only behind a proxy that sets it)
+    rate_limit_trust_forwarded: bool = Field(False, env="RATE_LIMIT_TRUST_FORWARDED")
+
+    # ── Admission control (services/admission.py) ────
+    # concurrent requests per worker; 0 = min(threadpool size, DB pool size + overflow)
+    admission_max_concurrent: int = Field(0, env="ADMISSION_MAX_CONCURRENT")
+    admission_max_queue: int      = Field(100, env="ADMISSION_MAX_QUEUE")     # waiting beyond that → 503
+    admission_queue_timeout_seconds: float = Field(2.0, env="ADMISSION_QUEUE_TIMEOUT_SECONDS")
+
+    # ── Metrics ──────────────────────────────────────
+    metrics_enabled: bool       = Field(True,  env="METRICS_ENABLED")      # GET /metrics
+    # adds db / storage / serialize / bcrypt durations to every response
+    server_timing_enabled: bool = Field(False, env="SERVER_TIMING_ENABLED")
+
+    # ── Query debugging (dev / test, database/query_log.py) ─
+    query_debug: bool         = Field(False, env="QUERY_DEBUG")
+    slow_query_ms: float      = Field(100.0, env="SLOW_QUERY_MS")
+    slow_query_explain: bool  = Field(True,  env="SLOW_QUERY_EXPLAIN")   # log the plan too
+    n_plus_one_threshold: int = Field(5,     env="N_PLUS_ONE_THRESHOLD")  # same shape per request
+
+    # ── Response compression ─────────────────────────
+    compression_enabled: bool  = Field(True, env="COMPRESSION_ENABLED")
+    compression_min_size: int  = Field(1024, env="COMPRESSION_MIN_SIZE")   # bytes
+    # server preference order; br / zstd are used only if brotli / zstandard are installed
+    compression_encodings: str = Field("br,zstd,gzip", env="COMPRESSION_ENCODINGS")
+    compression_gzip_level: int     = Field(6, env="COMPRESSION_GZIP_LEVEL")      # 1–9
+    compression_brotli_quality: int = Field(5, env="COMPRESSION_BROTLI_QUALITY")  # 0–11
+    compression_zstd_level: int     = Field(3, env="COMPRESSION_ZSTD_LEVEL")      # 1–22
+
+    # ── Feed ─────────────────────────────────────────
+    # largest `limit` GET /posts/ accepts (422 above)
+    feed_max_limit: int = Field(100, env="FEED_MAX_LIMIT")
+    # length of posts.excerpt (summary feed); existing rows keep their excerpt
+    post_excerpt_chars: int = Field(280, env="POST_EXCERPT_CHARS")
+
+    # ── Bulk import / export (NDJSON) ────────────────
+    bulk_import_batch_size: int = Field(1000, env="BULK_IMPORT_BATCH_SIZE")    # rows per commit
+    bulk_import_max_line_bytes: int = Field(1024 * 1024, env="BULK_IMPORT_MAX_LINE_BYTES")
+    bulk_import_max_errors: int = Field(1000, env="BULK_IMPORT_MAX_ERRORS")    # listed in the reply
+    export_batch_size: int      = Field(1000, env="EXPORT_BATCH_SIZE")         # rows per fetch
+
+    # ── Full-text search ─────────────────────────────
+    # FTS5 tokenizer, e.g. "trigram" or "unicode61 remove_diacritics 2"
+    search_sqlite_tokenizer: str = Field("trigram", env="SEARCH_SQLITE_TOKENIZER")
+
+    # ── Uploads ──────────────────────────────────────
+    image_max_bytes: int        = Field(10 * 1024 * 1024, env="IMAGE_MAX_BYTES")
+    # multipart/form-data bodies above this are refused before they are read
+    upload_max_request_bytes: int = Field(11 * 1024 * 1024, env="UPLOAD_MAX_REQUEST_BYTES")
+    minio_part_size: int        = Field(8 * 1024 * 1024, env="MINIO_PART_SIZE")   # ≥ 5 MiB
+    minio_upload_workers: int   = Field(8, env="MINIO_UPLOAD_WORKERS")
+    minio_parallel_parts: int   = Field(3, env="MINIO_PARALLEL_PARTS")
+
+    # ── Image variants (tasks/image_processing.py) ────
+    image_processing_enabled: bool = Field(True, env="IMAGE_PROCESSING_ENABLED")
+    image_variant_widths: str   = Field("320,768,1280", env="IMAGE_VARIANT_WIDTHS")
+    # "webp", "avif" (if Pillow supports it), "jpeg"; comma-separated
+    image_variant_formats: str  = Field("webp", env="IMAGE_VARIANT_FORMATS")
+    image_variant_quality: int  = Field(80, env="IMAGE_VARIANT_QUALITY")
 
     # ── Legacy names made optional  (won’t break old code) ───────────
     minio_access_key: str | None = Field(None, env="MINIO_ACCESS_KEY")
@@ -0,0 +1,171 @@
+# src/app/core/password_hasher.py
+"""
+bcrypt on a dedicated, bounded thread pool.
+
+* at most `password_hash_workers` hashes run at once; beyond
+  `password_hash_max_queue` waiting jobs callers get a 503 instead of
+  piling onto the request threadpool
+* optional short-TTL cache of *successful* verifications, keyed on an
+  HMAC of (username, password, stored hash) – nothing reversible is kept,
+  and a password change (new stored hash) misses automatically
+* fork-safe: a worker forked from a process that already hashed starts
+  with a fresh executor
+* `verify` also reports a replacement hash when `pwd_context.needs_update`
+  says the stored one uses outdated parameters
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from src.app.core.config import settings
+from src.app.core.security import pwd_context
+from src.app.exceptions.http_exception import ServiceBusyException
+from src.app.services.metrics import bcrypt_duration, timed
+from src.app.utils.ttl_cache import TTLCache
+
+
+class VerificationCache(TTLCache[bytes, bool]):
+    """TTL set of HMAC digests of successful verifications."""
+
+    def __init__(self, secret: bytes, ttl_seconds: float, max_entries: int) -> None:
+        super().__init__(ttl_seconds, max_entries)
+        self._secret = secret
+
+    def key(self, username: str, password: str, hashed: str) -> bytes:
+        msg = "\0".join((username, password, hashed)).encode()
+        return hmac.new(self._secret, msg, hashlib.sha256).digest()
+
+    def hit(self, key: bytes) -> bool:
+        return self.get(key) is not None
+
+    def add(self, key: bytes) -> None:
+        self.set(key, True)
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_queue: int, cache: VerificationCache) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self.cache = cache
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0           # submitted and not finished
+        self._active = 0            # currently running on a worker
+        self.completed = 0
+        self.rejected = 0
+
+    # ---------------------------------------------------------------- #
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+            return self._executor
+
+    def _run(self, op: str, fn: Callable, *args):
+        with self._lock:
+            self._active += 1
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            bcrypt_duration.observe(time.perf_counter() - started, op)
+            with self._lock:
+                self._active -= 1
+                self._pending -= 1
+                self.completed += 1
+
+    def _submit(self, op: str, fn: Callable, *args) -> Future:
+        executor = self._get_executor()
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise ServiceBusyException("Too many concurrent logins, retry shortly")
+            self._pending += 1
+        try:
+            return executor.submit(self._run, op, fn, *args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+    def _remember(self, username: str, password: str, ok: bool,
+                  hashed: str, new_hash: Optional[str]) -> None:
+        if ok and self.cache.enabled:
+            self.cache.add(self.cache.key(username, password, new_hash or hashed))
+
+    # ---------------------------------------------------------------- #
+    def verify(self, username: str, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Blocking variant for sync callers. Returns (ok, replacement_hash)."""
+        if self.cache.enabled and self.cache.hit(self.cache.key(username, password, hashed)):
+            return True, None
+        with timed("bcrypt"):
+            ok, new_hash = self._submit("verify", pwd_context.verify_and_update, password, hashed).result()
+        self._remember(username, password, ok, hashed, new_hash)
+        return ok, new_hash
+
+    async def verify_async(self, username: str, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        if self.cache.enabled and self.cache.hit(self.cache.key(username, password, hashed)):
+            return True, None
+        future = self._submit("verify", pwd_context.verify_and_update, password, hashed)
+        with timed("bcrypt"):
+            ok, new_hash = await asyncio.wrap_future(future)
+        self._remember(username, password, ok, hashed, new_hash)
+        return ok, new_hash
+
+    def hash(self, password: str) -> str:
+        with timed("bcrypt"):
+            return self._submit("hash", pwd_context.hash, password).result()
+
+    async def hash_async(self, password: str) -> str:
+        with timed("bcrypt"):
+            return await asyncio.wrap_future(self._submit("hash", pwd_context.hash, password))
+
+    # ---------------------------------------------------------------- #
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "active": self._active,
+                "queued": self._pending - self._active,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "cache_hits": self.cache.hits,
+                "cache_misses": self.cache.misses,
+                "cache_size": len(self.cache),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def reset_after_fork(self) -> None:
+        """In a forked worker: the parent's bcrypt threads do not exist here."""
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = self._active = 0
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+    cache=VerificationCache(
+        secret=settings.secret_key.encode(),
+        ttl_seconds=settings.login_cache_ttl_seconds,
+        max_entries=settings.login_cache_max_entries,
+    ),
+)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=password_hasher.reset_after_fork)
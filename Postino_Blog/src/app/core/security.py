@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
 from passlib.context import CryptContext
 from src.app.core.config import settings
 
@@ -15,12 +17,22 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+@lru_cache(maxsize=8)
+def _jwt_key(secret: str, algorithm: str) -> Key:
+    # built once instead of on every encode/decode
+    return jwk.construct(secret, algorithm)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta if expires_delta else timedelta(minutes=settings.access_token_expire_minutes))
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    return jwt.encode(
+        to_encode, _jwt_key(settings.secret_key, settings.algorithm), algorithm=settings.algorithm
+    )
 
 
 def decode_access_token(token: str) -> dict:
-    return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
\ No newline at end of file
+    return jwt.decode(
+        token, _jwt_key(settings.secret_key, settings.algorithm), algorithms=[settings.algorithm]
+    )
\ No newline at end of file
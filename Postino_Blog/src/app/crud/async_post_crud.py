@@ -0,0 +1,160 @@
+# async_post_crud.py  – AsyncSession twin of post_crud
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.app.models.post_model import Post
+from src.app.models.post_tag_model import post_tag
+from src.app.schemas.post_schema import PostCreate, PostImportRow
+from src.app.crud.async_tag_crud import get_or_create_tags, record_tag_usage
+from src.app.crud.tag_crud import normalize_tag_names, tag_usage_delta, tags_of_posts_stmt
+from src.app.services.response_cache import response_cache
+from src.app.crud.post_crud import (
+    PostVersion,
+    split_tags,
+    posts_with_tags,
+    feed_items,
+    excerpt_of,
+    touch,
+    post_versions,
+    offset_page,
+    keyset_page,
+    import_posts_stmt,
+    import_params,
+    import_links,
+    export_stmt,
+    export_batch,
+)
+
+# Every query eager-loads Post.tags (posts_with_tags): an implicit lazy load
+# would need IO outside the awaited call and fails under AsyncSession.
+
+# ---------- read ----------
+async def get_posts(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    tag_name: Optional[str] = None,
+    summary: bool = False,
+) -> List[Post]:
+    return list(await db.scalars(offset_page(feed_items(summary), skip, limit, tag_name)))
+
+async def get_posts_after(
+    db: AsyncSession,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: int = 100,
+    tag_name: Optional[str] = None,
+    summary: bool = False,
+) -> List[Post]:
+    dialect = db.get_bind().dialect.name
+    return list(await db.scalars(keyset_page(feed_items(summary), dialect, after, limit, tag_name)))
+
+async def get_post(db: AsyncSession, post_id: int) -> Optional[Post]:
+    return (await db.scalars(posts_with_tags().where(Post.id == post_id))).first()
+
+async def get_page_versions(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    tag_name: Optional[str] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    keyset: bool = False,
+) -> List[PostVersion]:
+    if keyset:
+        stmt = keyset_page(post_versions(), db.get_bind().dialect.name, after, limit, tag_name)
+    else:
+        stmt = offset_page(post_versions(), skip, limit, tag_name)
+    return [tuple(row) for row in await db.execute(stmt)]
+
+async def get_post_version(db: AsyncSession, post_id: int) -> Optional[PostVersion]:
+    row = (await db.execute(post_versions().where(Post.id == post_id))).first()
+    return tuple(row) if row else None
+
+async def _reload(db: AsyncSession, post_id: int) -> Post:
+    # picks up server-side created_at/updated_at and the committed tag set
+    stmt = posts_with_tags().where(Post.id == post_id).execution_options(
+        populate_existing=True
+    )
+    return (await db.scalars(stmt)).one()
+
+# ---------- write ----------
+async def create_post(
+    db: AsyncSession,
+    obj_in: PostCreate,
+    image_url: Optional[str] = None,
+) -> Post:
+    tag_names = split_tags(obj_in.tags)
+    tags = await get_or_create_tags(db, tag_names)
+    post = Post(
+        title=obj_in.title,
+        content=obj_in.content,
+        excerpt=excerpt_of(obj_in.content),
+        image_url=image_url,
+        tags=tags,
+    )
+    if tags:
+        await record_tag_usage(db, added=[t.id for t in tags], removed=[])
+    db.add(post)
+    await db.commit()
+    await response_cache.ainvalidate_posts(
+        normalize_tag_names(tag_names), tags_changed=bool(tag_names)
+    )
+    return await _reload(db, post.id)
+
+async def update_post(
+    db: AsyncSession,
+    post: Post,
+    obj_in: PostCreate,
+    image_url: Optional[str] = None,
+) -> Post:
+    old_tags = [t.name for t in post.tags]
+    post.title   = obj_in.title
+    post.content = obj_in.content
+    post.excerpt = excerpt_of(obj_in.content)
+    touch(post)
+    if image_url is not None:
+        post.image_url  = image_url
+        post.image_meta = None               # variants follow in the background
+
+    if obj_in.tags is not None:              # replace tags only if sent
+        old_ids = [t.id for t in post.tags]
+        post.tags = await get_or_create_tags(db, split_tags(obj_in.tags))
+        await record_tag_usage(db, *tag_usage_delta(old_ids, [t.id for t in post.tags]))
+
+    await db.commit()
+    post = await _reload(db, post.id)
+    await response_cache.ainvalidate_posts(
+        old_tags + [t.name for t in post.tags], tags_changed=obj_in.tags is not None
+    )
+    return post
+
+async def delete_post(db: AsyncSession, post: Post) -> None:
+    tag_names = [t.name for t in post.tags]
+    await record_tag_usage(db, added=[], removed=[t.id for t in post.tags])
+    await db.delete(post)
+    await db.commit()
+    await response_cache.ainvalidate_posts(tag_names, tags_changed=bool(tag_names))
+
+# ---------- bulk ----------
+async def import_posts(db: AsyncSession, rows: Sequence[PostImportRow]) -> int:
+    dialect = db.get_bind().dialect.name
+    names = normalize_tag_names([n for r in rows for n in r.tags])
+    try:
+        tag_ids = {t.name: t.id for t in await get_or_create_tags(db, names)}
+        post_ids = list(await db.scalars(import_posts_stmt(dialect), import_params(dialect, rows)))
+        links = import_links(post_ids, rows, tag_ids)
+        if links:
+            await db.execute(insert(post_tag), links)
+            await record_tag_usage(db, added=[l["tag_id"] for l in links], removed=[])
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    await response_cache.ainvalidate_posts(names, tags_changed=bool(names))
+    return len(post_ids)
+
+async def export_posts(db: AsyncSession, batch_size: int = 1000) -> AsyncIterator[List[dict]]:
+    result = await db.stream(export_stmt(batch_size))
+    async for rows in result.partitions():
+        tag_rows = (await db.execute(tags_of_posts_stmt([r.id for r in rows]))).all()
+        yield export_batch(rows, tag_rows)
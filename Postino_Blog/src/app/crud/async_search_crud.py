@@ -0,0 +1,24 @@
+# async_search_crud.py  – AsyncSession twin of search_crud
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.app.crud.search_crud import (
+    RankCursor,
+    SearchHit,
+    assemble,
+    search_page_stmt,
+    snippets_stmt,
+)
+from src.app.crud.tag_crud import tags_of_posts_stmt
+
+# ---------- read ----------
+async def search_posts(
+    db: AsyncSession, query: str, after: Optional[RankCursor] = None, limit: int = 20
+) -> List[SearchHit]:
+    dialect = db.get_bind().dialect.name
+    rows = (await db.execute(search_page_stmt(dialect, after, limit), {"q": query})).all()
+    if not rows:
+        return []
+    ids = [r.id for r in rows]
+    snippets = (await db.execute(snippets_stmt(dialect), {"q": query, "ids": ids})).all()
+    tag_rows = (await db.execute(tags_of_posts_stmt(ids))).all()
+    return assemble(rows, snippets, tag_rows)
@@ -0,0 +1,53 @@
+# async_tag_crud.py  – AsyncSession twin of tag_crud
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.app.models.tag_model import Tag
+from src.app.crud.tag_crud import (
+    normalize_tag_names,
+    tags_by_name_stmt,
+    insert_missing_tags_stmt,
+    tag_names_stmt,
+    tags_version_stmt,
+    tag_entries_stmt,
+    tag_usage_stmts,
+)
+from src.app.services.tag_index import TagIndex, tag_index
+
+
+async def _fetch_tags(db: AsyncSession, names: Sequence[str]) -> Dict[str, Tag]:
+    return {t.name: t for t in await db.scalars(tags_by_name_stmt(names))}
+
+
+async def get_or_create_tags(db: AsyncSession, names: Sequence[str]) -> List[Tag]:
+    """Same batching as tag_crud.get_or_create_tags."""
+    wanted = normalize_tag_names(names)
+    if not wanted:
+        return []
+
+    tags = await _fetch_tags(db, wanted)
+    missing = [n for n in wanted if n not in tags]
+    if missing:
+        await db.execute(insert_missing_tags_stmt(db.get_bind().dialect.name, missing))
+        tags.update(await _fetch_tags(db, missing))
+    return [tags[n] for n in wanted]
+
+
+async def get_tags_version(db: AsyncSession) -> int:
+    return await db.scalar(tags_version_stmt())
+
+
+async def list_tag_names(db: AsyncSession) -> List[str]:
+    return list(await db.scalars(tag_names_stmt()))
+
+
+async def record_tag_usage(db: AsyncSession, added: Sequence[int], removed: Sequence[int]) -> None:
+    for stmt in tag_usage_stmts(db.get_bind().dialect.name, added, removed):
+        await db.execute(stmt)
+
+
+async def get_tag_index(db: AsyncSession, version: Optional[int] = None) -> TagIndex:
+    if version is None:
+        version = await get_tags_version(db)
+    if not tag_index.is_current(version):
+        tag_index.load(version, (await db.execute(tag_entries_stmt())).all())
+    return tag_index
@@ -0,0 +1,35 @@
+# async_user_crud.py  – AsyncSession twin of user_crud
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.app.models.user_model import User
+from src.app.schemas.user_schema import UserCreate
+from src.app.core.password_hasher import password_hasher
+
+
+async def get_user_by_username(db: AsyncSession, username: str) -> User | None:
+    return (await db.scalars(select(User).where(User.username == username))).first()
+
+
+async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
+    user = User(
+        username=user_in.username,
+        hashed_password=await password_hasher.hash_async(user_in.password),
+    )
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> User | None:
+    user = await get_user_by_username(db, username)
+    if not user:
+        return None
+    # bcrypt runs on the dedicated hashing pool, off the event loop
+    ok, new_hash = await password_hasher.verify_async(username, password, user.hashed_password)
+    if not ok:
+        return None
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    return user
@@ -1,22 +1,196 @@
 # post_crud.py
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import String, and_, bindparam, insert, or_, select
+from sqlalchemy.orm import Session, load_only, selectinload
+from src.app.core.config import settings
 from src.app.models.post_model import Post
+from src.app.models.post_tag_model import post_tag
 from src.app.models.tag_model import Tag
-from src.app.schemas.post_schema import PostCreate
-from src.app.crud.tag_crud import get_or_create_tags
+from src.app.schemas.post_schema import PostCreate, PostImportRow
+from src.app.crud.tag_crud import (
+    get_or_create_tags, group_tag_names, normalize_tag_names, record_tag_usage,
+    tag_usage_delta, tags_of_posts_stmt,
+)
+from src.app.utils.excerpt import make_excerpt
+from src.app.utils.pagination import created_at_param, sqlite_timestamp
+from src.app.services.response_cache import response_cache
+
+# ---------- shared query pieces (also used by async_post_crud) ----------
+PostVersion = Tuple[int, datetime, Optional[datetime]]
+
+def split_tags(raw: Optional[str]) -> List[str]:
+    return [t.strip() for t in raw.split(",") if t.strip()] if raw else []
+
+def older_than(dialect_name: str, after: Tuple[datetime, int]):
+    """Keyset predicate: rows that sort after ``after`` in newest-first order."""
+    created_at, post_id = after
+    ts = created_at_param(dialect_name, created_at)
+    return or_(
+        Post.created_at < ts,
+        and_(Post.created_at == ts, Post.id < post_id),
+    )
+
+def posts_with_tags():
+    # selectinload: one extra `IN (...)` query for the page's tags instead of
+    # a JOIN that multiplies rows and forces LIMIT into a subquery
+    return select(Post).options(selectinload(Post.tags))
+
+def post_summaries():
+    """Feed items without `content`: the Text column is neither read nor lazy-loadable."""
+    return select(Post).options(
+        load_only(
+            Post.id, Post.title, Post.excerpt, Post.image_url, Post.image_meta,
+            Post.created_at, Post.updated_at,
+            raiseload=True,
+        ),
+        selectinload(Post.tags),
+    )
+
+def feed_items(summary: bool):
+    return post_summaries() if summary else posts_with_tags()
+
+def excerpt_of(content: str) -> str:
+    return make_excerpt(content, settings.post_excerpt_chars)
+
+def touch(post: Post) -> None:
+    """
+    Stamp an edit. Set on every update: a tag-only change writes no posts
+    column, so `onupdate` would not fire and the ETag would not move.
+    App-side with microseconds – SQLite's CURRENT_TIMESTAMP is whole seconds,
+    and two edits within one second must still get different validators.
+    """
+    post.updated_at = datetime.now(timezone.utc)
+
+def post_versions():
+    """Just enough columns to build HTTP validators (no content, no tags)."""
+    return select(Post.id, Post.created_at, Post.updated_at)
+
+def _filter_tag(stmt, tag_name: Optional[str]):
+    if tag_name:
+        stmt = stmt.join(Post.tags).where(Tag.name == tag_name)
+    return stmt
+
+def offset_page(stmt, skip: int, limit: int, tag_name: Optional[str]):
+    return _filter_tag(stmt, tag_name).offset(skip).limit(limit)
+
+def keyset_page(
+    stmt,
+    dialect_name: str,
+    after: Optional[Tuple[datetime, int]],
+    limit: int,
+    tag_name: Optional[str],
+):
+    """Newest-first keyset page: rows strictly older than ``after``."""
+    stmt = _filter_tag(stmt, tag_name)
+    if after is not None:
+        stmt = stmt.where(older_than(dialect_name, after))
+    return stmt.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit)
+
+def import_posts_stmt(dialect_name: str):
+    """
+    Multi-row INSERT … RETURNING id (rows come back in parameter order).
+    On SQLite the timestamps are bound as CURRENT_TIMESTAMP-style text, the
+    format keyset paging compares against (see created_at_param).
+    """
+    ts_type = String if dialect_name == "sqlite" else Post.created_at.type
+    return insert(Post.__table__).values(
+        title=bindparam("p_title"),
+        content=bindparam("p_content"),
+        excerpt=bindparam("p_excerpt"),
+        image_url=bindparam("p_image_url"),
+        image_meta=bindparam("p_image_meta", type_=Post.image_meta.type),
+        created_at=bindparam("p_created_at", type_=ts_type),
+        updated_at=bindparam("p_updated_at", type_=ts_type),
+    ).returning(Post.id, sort_by_parameter_order=True)
+
+def import_params(dialect_name: str, rows: Sequence[PostImportRow]) -> List[dict]:
+    now = datetime.now(timezone.utc)
+
+    def stamp(value: Optional[datetime]):
+        if value is None or dialect_name != "sqlite":
+            return value
+        return sqlite_timestamp(value)
+
+    return [
+        {
+            "p_title": r.title,
+            "p_content": r.content,
+            "p_excerpt": excerpt_of(r.content),
+            "p_image_url": r.image_url,
+            "p_image_meta": r.image_meta,
+            "p_created_at": stamp(r.created_at or now),
+            "p_updated_at": stamp(r.updated_at),
+        }
+        for r in rows
+    ]
+
+def import_links(
+    post_ids: Sequence[int], rows: Sequence[PostImportRow], tag_ids: Dict[str, int]
+) -> List[dict]:
+    return [
+        {"post_id": post_id, "tag_id": tag_ids[name]}
+        for post_id, row in zip(post_ids, rows)
+        for name in normalize_tag_names(row.tags)
+    ]
+
+def export_stmt(batch_size: int):
+    # yield_per: server-side cursor where the driver has one, fetched in
+    # batch_size partitions – the table is never loaded as a whole
+    return (
+        select(
+            Post.id, Post.title, Post.content, Post.image_url, Post.image_meta,
+            Post.created_at, Post.updated_at,
+        )
+        .order_by(Post.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+def export_batch(rows, tag_rows) -> List[dict]:
+    tags = group_tag_names(tag_rows)
+    return [dict(r._mapping, tags=tags.get(r.id, [])) for r in rows]
 
 # ---------- read ----------
 def get_posts(
-    db: Session, skip: int = 0, limit: int = 100, tag_name: Optional[str] = None
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    tag_name: Optional[str] = None,
+    summary: bool = False,
 ) -> List[Post]:
-    q = db.query(Post)
-    if tag_name:
-        q = q.join(Post.tags).filter(Tag.name == tag_name)
-    return q.offset(skip).limit(limit).all()
+    return list(db.scalars(offset_page(feed_items(summary), skip, limit, tag_name)))
+
+def get_posts_after(
+    db: Session,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: int = 100,
+    tag_name: Optional[str] = None,
+    summary: bool = False,
+) -> List[Post]:
+    dialect = db.get_bind().dialect.name
+    return list(db.scalars(keyset_page(feed_items(summary), dialect, after, limit, tag_name)))
 
 def get_post(db: Session, post_id: int) -> Optional[Post]:
-    return db.query(Post).filter(Post.id == post_id).first()
+    return db.scalars(posts_with_tags().where(Post.id == post_id)).first()
+
+def get_page_versions(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    tag_name: Optional[str] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    keyset: bool = False,
+) -> List[PostVersion]:
+    """(id, created_at, updated_at) of exactly the rows get_posts[_after] would return."""
+    if keyset:
+        stmt = keyset_page(post_versions(), db.get_bind().dialect.name, after, limit, tag_name)
+    else:
+        stmt = offset_page(post_versions(), skip, limit, tag_name)
+    return [tuple(row) for row in db.execute(stmt)]
+
+def get_post_version(db: Session, post_id: int) -> Optional[PostVersion]:
+    row = db.execute(post_versions().where(Post.id == post_id)).first()
+    return tuple(row) if row else None
 
 # ---------- write ----------
 def create_post(
@@ -24,23 +198,24 @@ def create_post(
     obj_in: PostCreate,
     image_url: Optional[str] = None,
 ) -> Post:
-    tag_names = (
-        [t.strip() for t in obj_in.tags.split(",") if t.strip()]
-        if obj_in.tags
-        else []
-    )
+    tag_names = split_tags(obj_in.tags)
 
     post = Post(
         title=obj_in.title,
         content=obj_in.content,
+        excerpt=excerpt_of(obj_in.content),
         image_url=image_url,
     )
     if tag_names:
         post.tags = get_or_create_tags(db, tag_names)
+        record_tag_usage(db, added=[t.id for t in post.tags], removed=[])
 
     db.add(post)
     db.commit()
     db.refresh(post)
+    response_cache.invalidate_posts(
+        normalize_tag_names(tag_names), tags_changed=bool(tag_names)
+    )
     return post
 
 def update_post(
@@ -49,19 +224,58 @@ def update_post(
     obj_in: PostCreate,
     image_url: Optional[str] = None,
 ) -> Post:
+    old_tags = [t.name for t in post.tags]
     post.title   = obj_in.title
     post.content = obj_in.content
+    post.excerpt = excerpt_of(obj_in.content)
+    touch(post)
     if image_url is not None:
-        post.image_url = image_url
+        post.image_url  = image_url
+        post.image_meta = None               # variants follow in the background
 
     if obj_in.tags is not None:              # replace tags only if sent
-        tag_names = [t.strip() for t in obj_in.tags.split(",") if t.strip()]
-        post.tags = get_or_create_tags(db, tag_names)
+        old_ids = [t.id for t in post.tags]
+        post.tags = get_or_create_tags(db, split_tags(obj_in.tags))
+        record_tag_usage(db, *tag_usage_delta(old_ids, [t.id for t in post.tags]))
 
     db.commit()
     db.refresh(post)
+    response_cache.invalidate_posts(
+        old_tags + [t.name for t in post.tags], tags_changed=obj_in.tags is not None
+    )
     return post
 
 def delete_post(db: Session, post: Post) -> None:
+    tag_names = [t.name for t in post.tags]
+    record_tag_usage(db, added=[], removed=[t.id for t in post.tags])
     db.delete(post)
     db.commit()
+    response_cache.invalidate_posts(tag_names, tags_changed=bool(tag_names))
+
+# ---------- bulk ----------
+def import_posts(db: Session, rows: Sequence[PostImportRow]) -> int:
+    """
+    Insert a batch of posts in one transaction: one tag resolution for the
+    whole batch, one multi-row insert for posts, one for post_tag, one
+    tag_stats upsert. Rolls back and re-raises if anything fails.
+    """
+    dialect = db.get_bind().dialect.name
+    names = normalize_tag_names([n for r in rows for n in r.tags])
+    try:
+        tag_ids = {t.name: t.id for t in get_or_create_tags(db, names)}
+        post_ids = list(db.scalars(import_posts_stmt(dialect), import_params(dialect, rows)))
+        links = import_links(post_ids, rows, tag_ids)
+        if links:
+            db.execute(insert(post_tag), links)
+            record_tag_usage(db, added=[l["tag_id"] for l in links], removed=[])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    response_cache.invalidate_posts(names, tags_changed=bool(names))
+    return len(post_ids)
+
+def export_posts(db: Session, batch_size: int = 1000) -> Iterator[List[dict]]:
+    """Every post (oldest id first) as dicts, `batch_size` at a time."""
+    for rows in db.execute(export_stmt(batch_size)).partitions():
+        yield export_batch(rows, db.execute(tags_of_posts_stmt([r.id for r in rows])))
@@ -0,0 +1,116 @@
+# search_crud.py  – full-text search over posts (index DDL: database/fulltext.py)
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Tuple
+from sqlalchemy import BigInteger, Float, Integer, String, bindparam, text
+from sqlalchemy.orm import Session
+from src.app.core.config import settings
+from src.app.crud.tag_crud import group_tag_names, tags_of_posts_stmt
+from src.app.models.post_model import Post
+
+# Results are ordered by (rank, id) ascending: bm25() is already "lower is
+# better" and Postgres ranks are negated to match, so one keyset cursor
+# works on both backends. Paging compares `rank_key`, the rank scaled to an
+# integer in SQL: the cursor carries it exactly, where a float compared with
+# = / < after a text round trip could skip or repeat rows.
+RankCursor = Tuple[int, int]
+RANK_SCALE = 10**9
+
+class SearchHit(NamedTuple):
+    id: int
+    title: str
+    image_url: Optional[str]
+    created_at: datetime
+    rank: float
+    rank_key: int
+    snippet: str
+    tags: List[str]
+
+_MATCHES = {
+    "sqlite": """
+        SELECT p.id, p.title, p.image_url, p.created_at,
+               bm25(posts_fts, 5.0, 1.0) AS rank          -- title weighs 5x
+        FROM posts_fts JOIN posts p ON p.id = posts_fts.rowid
+        WHERE posts_fts MATCH :q
+    """,
+    "postgresql": """
+        SELECT p.id, p.title, p.image_url, p.created_at,
+               -ts_rank(p.search_vector, query)::float8 AS rank
+        FROM posts p, plainto_tsquery('simple', :q) AS query
+        WHERE p.search_vector @@ query
+    """,
+}
+
+_SNIPPETS = {
+    # only computed for the page's rows, never for the whole match set
+    "sqlite": """
+        SELECT rowid AS id, snippet(posts_fts, 1, '<mark>', '</mark>', '…', 16) AS snippet
+        FROM posts_fts WHERE posts_fts MATCH :q AND rowid IN :ids
+    """,
+    "postgresql": """
+        SELECT id, ts_headline('simple', content, plainto_tsquery('simple', :q),
+                               'StartSel=<mark>, StopSel=</mark>, MaxWords=24, MinWords=8') AS snippet
+        FROM posts WHERE id IN :ids
+    """,
+}
+
+# ---------- shared statements (also used by async_search_crud) ----------
+def supports_search(dialect_name: str) -> bool:
+    return dialect_name in _MATCHES
+
+def match_query(dialect_name: str, q: str) -> Optional[str]:
+    """
+    User input → backend query string, or None when nothing is searchable.
+
+    FTS5: every whitespace-separated term becomes a quoted phrase (so
+    operators/punctuation in user input are literal) and terms are ANDed.
+    The trigram tokenizer can't match terms shorter than 3 characters, so
+    those are dropped. Postgres gets the text as is (plainto_tsquery).
+    """
+    if dialect_name == "sqlite":
+        terms = q.split()
+        if settings.search_sqlite_tokenizer.split()[0] == "trigram":
+            terms = [t for t in terms if len(t) >= 3]
+        return " ".join('"%s"' % t.replace('"', '""') for t in terms) or None
+    return q.strip() or None
+
+def search_page_stmt(dialect_name: str, after: Optional[RankCursor], limit: int):
+    where = (
+        "WHERE k.rank_key > :after_rank OR (k.rank_key = :after_rank AND k.id > :after_id)"
+        if after else ""
+    )
+    stmt = text(
+        f"SELECT k.* FROM (SELECT m.*, CAST(ROUND(m.rank * {RANK_SCALE}) AS BIGINT) AS rank_key "
+        f"FROM ({_MATCHES[dialect_name]}) AS m) AS k {where} "
+        "ORDER BY k.rank_key, k.id LIMIT :limit"
+    ).columns(
+        id=Integer, title=String, image_url=String,
+        created_at=Post.created_at.type, rank=Float, rank_key=BigInteger,
+    ).bindparams(limit=limit)
+    if after:
+        stmt = stmt.bindparams(after_rank=after[0], after_id=after[1])
+    return stmt
+
+def snippets_stmt(dialect_name: str):
+    return text(_SNIPPETS[dialect_name]).bindparams(bindparam("ids", expanding=True))
+
+def assemble(rows, snippets, tag_rows) -> List[SearchHit]:
+    tags = group_tag_names(tag_rows)
+    snippet_of = dict(snippets)
+    return [
+        SearchHit(r.id, r.title, r.image_url, r.created_at, r.rank, r.rank_key,
+                  snippet_of.get(r.id, ""), tags.get(r.id, []))
+        for r in rows
+    ]
+
+# ---------- read ----------
+def search_posts(
+    db: Session, query: str, after: Optional[RankCursor] = None, limit: int = 20
+) -> List[SearchHit]:
+    """`query` is the output of match_query()."""
+    dialect = db.get_bind().dialect.name
+    rows = db.execute(search_page_stmt(dialect, after, limit), {"q": query}).all()
+    if not rows:
+        return []
+    ids = [r.id for r in rows]
+    snippets = db.execute(snippets_stmt(dialect), {"q": query, "ids": ids}).all()
+    return assemble(rows, snippets, db.execute(tags_of_posts_stmt(ids)).all())
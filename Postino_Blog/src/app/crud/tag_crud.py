@@ -1,19 +1,191 @@
 # tag_crud.py
-from typing import List, Sequence
-from sqlalchemy.orm import Session
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import exists, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, noload
+from src.app.models.post_tag_model import post_tag
+from src.app.models.tag_generation_model import TagGeneration
 from src.app.models.tag_model import Tag
+from src.app.models.tag_stats_model import TagStats
+from src.app.services.tag_index import TagIndex, tag_index
 
-def get_or_create_tags(db: Session, names: Sequence[str]) -> List[Tag]:
-    """Return Tag objects, creating missing ones."""
-    tags = []
+_WS = re.compile(r"\s+")
+_UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": pg_insert}
+
+
+def normalize_tag_names(names: Sequence[str]) -> List[str]:
+    """NFC-normalize, collapse whitespace, drop blanks and duplicates (keeps order)."""
+    seen: Dict[str, None] = {}
     for raw in names:
-        name = raw.strip()
-        if not name:
-            continue
-        tag = db.query(Tag).filter(Tag.name == name).first()
-        if tag is None:
-            tag = Tag(name=name)
-            db.add(tag)
-            db.flush()          # get id immediately
-        tags.append(tag)
+        name = _WS.sub(" ", unicodedata.normalize("NFC", raw)).strip()
+        if name:
+            seen.setdefault(name, None)
+    return list(seen)
+
+
+# ---------- shared statements (also used by async_tag_crud) ----------
+def tags_by_name_stmt(names: Sequence[str]):
+    return (
+        select(Tag)
+        .options(noload(Tag.posts))     # never need the reverse side here
+        .where(Tag.name.in_(names))
+    )
+
+
+def insert_missing_tags_stmt(dialect_name: str, names: Sequence[str]):
+    """Multi-row INSERT; `ON CONFLICT DO NOTHING` where the dialect has it."""
+    rows = [{"name": n} for n in names]
+    dialect_insert = _UPSERT_INSERTS.get(dialect_name)
+    if dialect_insert is None:
+        return insert(Tag).values(rows)
+    return dialect_insert(Tag).values(rows).on_conflict_do_nothing(
+        index_elements=[Tag.name]
+    )
+
+
+def tag_names_stmt():
+    return select(Tag.name).order_by(Tag.name)
+
+
+def tags_version_stmt():
+    # bumped in the transaction of every tag_stats change (tag_usage_stmts);
+    # a new tag is always created for a post, so that covers inserts too
+    return select(func.coalesce(func.max(TagGeneration.generation), 0))
+
+
+def bump_tags_version_stmt():
+    return update(TagGeneration).values(generation=TagGeneration.generation + 1)
+
+
+def tags_of_posts_stmt(post_ids: Sequence[int]):
+    """(post_id, tag name) rows for a page of posts, in attach order."""
+    return (
+        select(post_tag.c.post_id, Tag.name)
+        .join(Tag, Tag.id == post_tag.c.tag_id)
+        .where(post_tag.c.post_id.in_(post_ids))
+        .order_by(post_tag.c.post_id, Tag.id)
+    )
+
+
+def group_tag_names(tag_rows) -> Dict[int, List[str]]:
+    tags: Dict[int, List[str]] = {}
+    for post_id, name in tag_rows:
+        tags.setdefault(post_id, []).append(name)
     return tags
+
+
+def tag_entries_stmt():
+    return select(
+        Tag.name,
+        func.coalesce(TagStats.post_count, 0),
+        TagStats.last_used_at,
+    ).outerjoin(TagStats, TagStats.tag_id == Tag.id)
+
+
+def tag_usage_stmts(dialect_name: str, added: Sequence[int], removed: Sequence[int]) -> list:
+    """
+    Statements applying tag-set changes to `tag_stats`, plus the bump of the
+    tags version; run them in the same transaction as the post write. An id
+    listed n times counts n posts (bulk import passes one entry per post/tag
+    link).
+    """
+    stmts = []
+    if added:
+        counts = Counter(added)
+        dialect_insert = _UPSERT_INSERTS.get(dialect_name)
+        if dialect_insert is not None:
+            stmt = dialect_insert(TagStats).values([
+                {"tag_id": i, "post_count": n, "last_used_at": func.now()}
+                for i, n in counts.items()
+            ])
+            stmts.append(stmt.on_conflict_do_update(
+                index_elements=[TagStats.tag_id],
+                set_={
+                    "post_count": TagStats.post_count + stmt.excluded.post_count,
+                    "last_used_at": stmt.excluded.last_used_at,
+                },
+            ))
+        else:
+            by_count: Dict[int, List[int]] = {}
+            for i, n in counts.items():
+                by_count.setdefault(n, []).append(i)
+            for n, ids in by_count.items():
+                stmts.append(
+                    update(TagStats)
+                    .where(TagStats.tag_id.in_(ids))
+                    .values(post_count=TagStats.post_count + n, last_used_at=func.now())
+                )
+                stmts.append(insert(TagStats).from_select(
+                    ["tag_id", "post_count", "last_used_at"],
+                    select(Tag.id, literal(n), func.now()).where(
+                        Tag.id.in_(ids),
+                        ~exists().where(TagStats.tag_id == Tag.id),
+                    ),
+                ))
+    if removed:
+        stmts.append(
+            update(TagStats)
+            .where(TagStats.tag_id.in_(removed))
+            .values(post_count=TagStats.post_count - 1)
+        )
+    if stmts:
+        stmts.append(bump_tags_version_stmt())
+    return stmts
+
+
+def tag_usage_delta(old_ids: Sequence[int], new_ids: Sequence[int]) -> Tuple[List[int], List[int]]:
+    """(added, removed) tag ids between two tag sets."""
+    old, new = set(old_ids), set(new_ids)
+    return sorted(new - old), sorted(old - new)
+
+
+def _fetch_tags(db: Session, names: Sequence[str]) -> Dict[str, Tag]:
+    return {t.name: t for t in db.scalars(tags_by_name_stmt(names))}
+
+
+def get_or_create_tags(db: Session, names: Sequence[str]) -> List[Tag]:
+    """
+    Return Tag objects, creating missing ones.
+
+    One `IN (...)` lookup, one bulk insert for whatever is missing and one
+    re-read of the new rows – independent of how many tags the post has.
+    On SQLite/Postgres the insert is `ON CONFLICT DO NOTHING`, so a
+    concurrent request creating the same tag doesn't trip the unique index.
+    """
+    wanted = normalize_tag_names(names)
+    if not wanted:
+        return []
+
+    tags = _fetch_tags(db, wanted)
+    missing = [n for n in wanted if n not in tags]
+    if missing:
+        db.execute(insert_missing_tags_stmt(db.get_bind().dialect.name, missing))
+        tags.update(_fetch_tags(db, missing))
+    return [tags[n] for n in wanted]
+
+
+def get_tags_version(db: Session) -> int:
+    return db.scalar(tags_version_stmt())
+
+
+def list_tag_names(db: Session) -> List[str]:
+    """Names only – a single column scan, no Tag/Post hydration."""
+    return list(db.scalars(tag_names_stmt()))
+
+
+def record_tag_usage(db: Session, added: Sequence[int], removed: Sequence[int]) -> None:
+    for stmt in tag_usage_stmts(db.get_bind().dialect.name, added, removed):
+        db.execute(stmt)
+
+
+def get_tag_index(db: Session, version: Optional[int] = None) -> TagIndex:
+    """The shared in-memory tag index, reloaded first if the DB moved on."""
+    if version is None:
+        version = get_tags_version(db)
+    if not tag_index.is_current(version):
+        tag_index.load(version, db.execute(tag_entries_stmt()).all())
+    return tag_index
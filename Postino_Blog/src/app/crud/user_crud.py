@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from src.app.models.user_model import User
 from src.app.schemas.user_schema import UserCreate
-from src.app.core.security import get_password_hash, verify_password
+from src.app.core.security import get_password_hash
+from src.app.core.password_hasher import password_hasher
 
 
 def get_user_by_username(db: Session, username: str) -> User | None:
@@ -19,8 +21,36 @@ def create_user(db: Session, user_in: UserCreate) -> User:
     return user
 
 
+def _store_rehash(db: Session, user: User, new_hash: str) -> None:
+    """Persist a hash upgraded by `pwd_context.needs_update`."""
+    user.hashed_password = new_hash
+    db.commit()
+
+
 def authenticate_user(db: Session, username: str, password: str) -> User | None:
     user = get_user_by_username(db, username)
-    if not user or not verify_password(password, user.hashed_password):
+    if not user:
+        return None
+    ok, new_hash = password_hasher.verify(username, password, user.hashed_password)
+    if not ok:
+        return None
+    if new_hash:
+        _store_rehash(db, user, new_hash)
+    return user
+
+
+async def authenticate_user_offloaded(db: Session, username: str, password: str) -> User | None:
+    """
+    `authenticate_user` for async routes on the sync Session: DB calls go to
+    the request threadpool, bcrypt to the dedicated hashing pool, so a login
+    never holds a threadpool worker for the length of a bcrypt round.
+    """
+    user = await run_in_threadpool(get_user_by_username, db, username)
+    if not user:
+        return None
+    ok, new_hash = await password_hasher.verify_async(username, password, user.hashed_password)
+    if not ok:
         return None
+    if new_hash:
+        await run_in_threadpool(_store_rehash, db, user, new_hash)
     return user
\ No newline at end of file
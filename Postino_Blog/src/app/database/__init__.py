@@ -1,3 +1,9 @@
 from .database import Base, engine, SessionLocal, get_db
+from .engine_factory import build_async_engine, build_engine, pool_metrics
+from .async_database import get_async_engine, get_async_sessionmaker, get_async_db
 
-__all__ = ["Base", "engine", "SessionLocal", "get_db"]
\ No newline at end of file
+__all__ = [
+    "Base", "engine", "SessionLocal", "get_db", "build_engine", "build_async_engine",
+    "pool_metrics",
+    "get_async_engine", "get_async_sessionmaker", "get_async_db",
+]
\ No newline at end of file
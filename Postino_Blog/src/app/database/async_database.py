@@ -0,0 +1,67 @@
+# src/app/database/async_database.py
+"""
+AsyncSession stack, used when ``DATABASE_MODE=async``.
+
+The engine is built on first use so the sync mode never needs the async
+drivers (aiosqlite / asyncpg) to be installed.
+"""
+
+from functools import lru_cache
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+)
+
+from src.app.core.config import settings
+from src.app.database.engine_factory import build_async_engine
+from src.app.database.routing import Replica, ReplicaSet, RoutingSession, replica_urls
+
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """sqlite:///x.db → sqlite+aiosqlite:///x.db, postgresql://… → postgresql+asyncpg://…"""
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()!r}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    url = settings.async_database_url or to_async_url(settings.database_url)
+    return build_async_engine(url, settings)
+
+
+@lru_cache
+def get_async_replicas() -> ReplicaSet:
+    """DB_REPLICA_URLS with the async driver; routing works on their sync_engine."""
+    replicas = []
+    for url in replica_urls(settings):
+        engine = build_async_engine(to_async_url(url), settings)
+        replicas.append(Replica(ReplicaSet.display_name(url), engine.sync_engine, engine))
+    return ReplicaSet.build(replicas)
+
+
+@lru_cache
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    replicas = get_async_replicas()
+    routing = {"sync_session_class": RoutingSession, "replicas": replicas} if replicas else {}
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        autoflush=False,
+        expire_on_commit=False,     # lazy loads after commit would need IO
+        **routing,
+    )
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
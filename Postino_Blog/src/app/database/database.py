@@ -1,23 +1,30 @@
 # src/app/database/database.py
 
-from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from src.app.core.config import settings
+from src.app.database.engine_factory import build_engine
+from src.app.database.routing import Replica, ReplicaSet, RoutingSession, replica_urls
 
 # Pull the URL straight from settings (now reads your .env’s DATABASE_URL)
 SQLALCHEMY_DATABASE_URL = settings.database_url
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}  # needed for SQLite + FastAPI
-)
+# pool sizing / SQLite pragmas come from Settings, see engine_factory.py
+engine = build_engine(SQLALCHEMY_DATABASE_URL, settings)
+
+# DB_REPLICA_URLS – reads of GET requests may go there, see routing.py
+replicas = ReplicaSet.build([
+    Replica(ReplicaSet.display_name(url), build_engine(url, settings))
+    for url in replica_urls(settings)
+])
+_routing = {"class_": RoutingSession, "replicas": replicas} if replicas else {"class_": Session}
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
-    bind=engine
+    bind=engine,
+    **_routing,
 )
 
 Base = declarative_base()
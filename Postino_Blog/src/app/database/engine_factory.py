@@ -0,0 +1,235 @@
+# src/app/database/engine_factory.py
+"""
+Backend-aware engine construction.
+
+* SQLite   → `check_same_thread=False` + WAL/synchronous/busy_timeout/mmap/cache
+             pragmas on every new DBAPI connection
+* Postgres → sized QueuePool with pre-ping/recycle and an optional
+             server-side statement timeout
+* every engine – sync, and the async one of DATABASE_MODE=async – reports
+  checkouts and checkout wait time to `pool_metrics`, and statement count /
+  duration to services/metrics.py
+* pool size is per process; with DB_POOL_TOTAL the budget is split across
+  WEB_CONCURRENCY workers instead (no overflow, so the total holds)
+* fork-safe: a forked worker drops the pooled connections it inherited
+  (without closing them – they belong to the parent) and opens its own
+* QUERY_DEBUG=true adds the statement log / slow-query EXPLAIN of
+  database/query_log.py
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src.app.core.config import Settings, settings as default_settings
+from src.app.database.query_log import install_query_log
+from src.app.services.metrics import instrument_engine
+
+
+# --------------------------------------------------------------------- #
+# Pool metrics
+# --------------------------------------------------------------------- #
+class PoolMetrics:
+    """Process-wide counters fed by pool events; read with `snapshot()`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checked_out = 0
+        self.wait_count = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def incr(self, name: str, delta: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + delta)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "checked_out": self.checked_out,
+                "wait_count": self.wait_count,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class _TimedCheckout:
+    """Pool mixin that records how long each checkout waited for a slot."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_metrics.observe_wait(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """For `create_async_engine`; the wait includes awaiting the asyncio queue."""
+
+
+def _attach_pool_events(engine: Engine) -> None:
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, record):
+        pool_metrics.incr("connects")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        pool_metrics.incr("checkouts")
+        pool_metrics.incr("checked_out")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, record):
+        pool_metrics.incr("checkins")
+        pool_metrics.incr("checked_out", -1)
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_conn, record, exc):
+        pool_metrics.incr("invalidations")
+
+
+# --------------------------------------------------------------------- #
+# SQLite
+# --------------------------------------------------------------------- #
+def _is_memory_sqlite(url) -> bool:
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+def _attach_sqlite_pragmas(engine: Engine, cfg: Settings) -> None:
+    pragmas = [
+        f"PRAGMA journal_mode={cfg.sqlite_journal_mode}",
+        f"PRAGMA synchronous={cfg.sqlite_synchronous}",
+        f"PRAGMA busy_timeout={int(cfg.sqlite_busy_timeout_ms)}",
+        f"PRAGMA mmap_size={int(cfg.sqlite_mmap_size)}",
+        f"PRAGMA cache_size={int(cfg.sqlite_cache_size)}",
+    ]
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn, record):
+        cursor = dbapi_conn.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+# --------------------------------------------------------------------- #
+# Multi-process
+# --------------------------------------------------------------------- #
+def pool_limits(cfg: Settings) -> Tuple[int, int]:
+    """(pool_size, max_overflow) of one worker process."""
+    if cfg.db_pool_total:
+        workers = max(cfg.web_concurrency, 1)
+        return max(cfg.db_pool_total // workers, 1), 0
+    return cfg.db_pool_size, cfg.db_max_overflow
+
+
+def _dispose_after_fork(engine: Engine) -> None:
+    if not hasattr(os, "register_at_fork"):
+        return
+    ref = weakref.ref(engine)
+
+    def _reset() -> None:
+        target = ref()
+        if target is not None:
+            target.dispose(close=False)
+
+    os.register_at_fork(after_in_child=_reset)
+
+
+# --------------------------------------------------------------------- #
+# Factory
+# --------------------------------------------------------------------- #
+def engine_kwargs(url: str, cfg: Settings = default_settings) -> Dict[str, Any]:
+    """`create_engine` / `create_async_engine` kwargs for this backend."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    pool_size, max_overflow = pool_limits(cfg)
+
+    if backend == "sqlite":
+        kwargs: Dict[str, Any] = {}
+        if parsed.get_driver_name() == "pysqlite":
+            kwargs["connect_args"] = {"check_same_thread": False}  # SQLite + FastAPI
+        if not _is_memory_sqlite(parsed):
+            kwargs.update(
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=cfg.db_pool_timeout,
+            )
+        return kwargs
+
+    kwargs = {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": cfg.db_pool_timeout,
+        "pool_recycle": cfg.db_pool_recycle,
+        "pool_pre_ping": cfg.db_pool_pre_ping,
+    }
+    if backend == "postgresql" and cfg.db_statement_timeout_ms:
+        timeout = str(int(cfg.db_statement_timeout_ms))
+        if parsed.get_driver_name() == "asyncpg":
+            kwargs["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            kwargs["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return kwargs
+
+
+def configure_engine(engine: Engine, cfg: Settings = default_settings) -> Engine:
+    """Attach pragmas + pool/query metrics to a (sync, or `AsyncEngine.sync_engine`) engine."""
+    if engine.dialect.name == "sqlite":
+        _attach_sqlite_pragmas(engine, cfg)
+    _attach_pool_events(engine)
+    _dispose_after_fork(engine)
+    instrument_engine(engine)
+    if cfg.query_debug:
+        install_query_log(engine)
+    return engine
+
+
+def build_engine(url: str, cfg: Settings = default_settings) -> Engine:
+    kwargs = engine_kwargs(url, cfg)
+    if "pool_size" in kwargs:
+        kwargs["poolclass"] = TimedQueuePool
+    return configure_engine(create_engine(url, **kwargs), cfg)
+
+
+def build_async_engine(url: str, cfg: Settings = default_settings):
+    """`build_engine` for an async driver URL → AsyncEngine."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    kwargs = engine_kwargs(url, cfg)
+    if "pool_size" in kwargs:
+        kwargs["poolclass"] = TimedAsyncAdaptedQueuePool
+    engine = create_async_engine(url, **kwargs)
+    configure_engine(engine.sync_engine, cfg)
+    return engine
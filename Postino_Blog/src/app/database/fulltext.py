@@ -0,0 +1,94 @@
+# src/app/database/fulltext.py
+"""
+Full-text index DDL for `posts`, per backend.
+
+SQLite   → FTS5 external-content table `posts_fts(title, content)` kept in
+           sync by AFTER INSERT/UPDATE/DELETE triggers on `posts`
+           (tokenizer from SEARCH_SQLITE_TOKENIZER; `trigram` matches
+           substrings in any script, Persian included)
+Postgres → stored generated `posts.search_vector` (`simple` config, no
+           stemming, so Persian works) + GIN index
+
+Everything is idempotent, so it can run after `create_all`, from the
+Alembic revision, or from the rebuild command.
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from src.app.core.config import settings
+
+PG_TS_CONFIG = "simple"
+
+
+def _sqlite_ddl(tokenizer: str) -> List[str]:
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+            title, content, content='posts', content_rowid='id', tokenize='{tokenizer}'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+            INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+            INSERT INTO posts_fts(posts_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN
+            INSERT INTO posts_fts(posts_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END""",
+    ]
+
+
+def _postgres_ddl() -> List[str]:
+    return [
+        f"""ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('{PG_TS_CONFIG}', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('{PG_TS_CONFIG}', coalesce(content, '')), 'B')
+            ) STORED""",
+        "CREATE INDEX IF NOT EXISTS ix_posts_search_vector ON posts USING GIN (search_vector)",
+    ]
+
+
+def fulltext_ddl(dialect_name: str) -> List[str]:
+    if dialect_name == "sqlite":
+        return _sqlite_ddl(settings.search_sqlite_tokenizer)
+    if dialect_name == "postgresql":
+        return _postgres_ddl()
+    return []
+
+
+def install_fulltext(connection: Connection) -> None:
+    for statement in fulltext_ddl(connection.dialect.name):
+        connection.execute(text(statement))
+
+
+def rebuild_fulltext(connection: Connection, recreate: bool = False) -> None:
+    """
+    Re-index every existing row. `recreate` drops the SQLite index first,
+    which is how a SEARCH_SQLITE_TOKENIZER change takes effect.
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        if recreate:
+            for name in ("posts_fts_ai", "posts_fts_ad", "posts_fts_au"):
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+            connection.execute(text("DROP TABLE IF EXISTS posts_fts"))
+        install_fulltext(connection)
+        connection.execute(text("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')"))
+        connection.execute(text("INSERT INTO posts_fts(posts_fts) VALUES ('optimize')"))
+    elif dialect == "postgresql":
+        # the generated column is always current; only the index can bloat
+        install_fulltext(connection)
+        connection.execute(text("REINDEX INDEX ix_posts_search_vector"))
+
+
+def after_posts_create(target, connection: Connection, **kw) -> None:
+    """`after_create` hook on the posts table (fresh databases)."""
+    install_fulltext(connection)
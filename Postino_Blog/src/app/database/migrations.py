@@ -0,0 +1,35 @@
+# src/app/database/migrations.py
+"""
+Run the Alembic migrations from inside the app (startup, tooling).
+
+The schema is owned by alembic/versions/ – `Base.metadata.create_all` is no
+longer used by the app, so model changes need a revision:
+
+    alembic revision --autogenerate -m "..."
+    alembic upgrade head
+"""
+
+from __future__ import annotations
+
+from argparse import Namespace
+from pathlib import Path
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+
+# Postino_Blog/alembic.ini (this file is Postino_Blog/src/app/database/migrations.py)
+ALEMBIC_INI = Path(__file__).resolve().parents[3] / "alembic.ini"
+
+
+def alembic_config(url: Optional[str] = None) -> Config:
+    """`url` targets another database than DATABASE_URL (same as `-x url=`)."""
+    cmd_opts = Namespace(x=[f"url={url}"] if url else None)
+    cfg = Config(str(ALEMBIC_INI), cmd_opts=cmd_opts)
+    cfg.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    cfg.attributes["configure_logger"] = False
+    return cfg
+
+
+def upgrade_to_head(url: Optional[str] = None) -> None:
+    command.upgrade(alembic_config(url), "head")
@@ -0,0 +1,174 @@
+# src/app/database/query_log.py
+"""
+Statement recorder for development and tests (QUERY_DEBUG=true).
+
+* `install_query_log(engine)` hooks cursor events on a sync engine (or
+  `AsyncEngine.sync_engine`); `configure_engine` does it when QUERY_DEBUG
+  is on, the pytest plugin (src/app/testing/pytest_plugin.py) always
+* `request_log()` – statements of the current request (context variable,
+  set by QueryLogMiddleware, which logs repeated statement shapes – N+1
+  suspects – when the request ends)
+* `capture_queries()` – statements from *any* thread while the block
+  runs; what the pytest `query_budget` fixture uses, since TestClient
+  serves requests on its own event-loop thread
+* statements slower than SLOW_QUERY_MS are logged with their EXPLAIN plan
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# "IN (?, ?, ?)" / "VALUES (?, ?), (?, ?)" → one placeholder group, so an
+# expanding IN with a different number of ids still has the same shape
+_PARAM_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)\s*\)")
+_VALUES_LIST = re.compile(r"(VALUES\s*\(\?\))(?:\s*,\s*\(\?\))+", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    shape = _PARAM_LIST.sub("(?)", statement)
+    shape = _VALUES_LIST.sub(r"\1", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryRecord:
+    statement: str
+    parameters: Any
+    duration: float
+
+    @property
+    def shape(self) -> str:
+        return statement_shape(self.statement)
+
+
+@dataclass
+class QueryLog:
+    records: List[QueryRecord] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(r.duration for r in self.records)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times (N+1 suspects)."""
+        counts = Counter(r.shape for r in self.records)
+        return [(shape, n) for shape, n in counts.most_common() if n >= threshold]
+
+    def report(self) -> str:
+        lines = [f"{len(self)} statements, {self.total_seconds * 1000:.1f} ms"]
+        lines += [f"  {r.duration * 1000:7.2f} ms  {_SPACE.sub(' ', r.statement)[:200]}"
+                  for r in self.records]
+        return "\n".join(lines)
+
+
+_request_log: ContextVar[Optional[QueryLog]] = ContextVar("postino_query_log", default=None)
+_captures: List[QueryLog] = []
+_captures_lock = threading.Lock()
+
+
+# --------------------------------------------------------------------- #
+# Collectors
+# --------------------------------------------------------------------- #
+@contextmanager
+def request_log() -> Iterator[QueryLog]:
+    log = QueryLog()
+    token = _request_log.set(log)
+    try:
+        yield log
+    finally:
+        _request_log.reset(token)
+
+
+def log_request_queries(log: QueryLog, label: str) -> None:
+    """Full statement list at DEBUG; repeated shapes (N+1) at WARNING."""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s: %s", label, log.report())
+    for shape, count in log.repeated(settings.n_plus_one_threshold):
+        logger.warning("Possible N+1 in %s: %d× %s", label, count, shape[:300])
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryLog]:
+    log = QueryLog()
+    with _captures_lock:
+        _captures.append(log)
+    try:
+        yield log
+    finally:
+        with _captures_lock:
+            _captures.remove(log)
+
+
+# --------------------------------------------------------------------- #
+# Engine hooks
+# --------------------------------------------------------------------- #
+_EXPLAIN = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    prefix = _EXPLAIN.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return ""
+    # a separate DBAPI cursor: the statement's own cursor may still hold rows,
+    # and going through `conn` would re-enter these event hooks
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join("  " + " | ".join(str(col) for col in row) for row in cursor.fetchall())
+    except Exception as exc:        # a failed EXPLAIN must not fail the request
+        return f"  (EXPLAIN failed: {exc})"
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_log_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_log_start"].pop()
+    record = QueryRecord(statement, parameters, elapsed)
+    log = _request_log.get()
+    if log is not None:
+        log.records.append(record)
+    if _captures:
+        with _captures_lock:
+            for capture in _captures:
+                capture.records.append(record)
+    if elapsed * 1000 >= settings.slow_query_ms:
+        plan = _explain(conn, statement, parameters) if settings.slow_query_explain and not executemany else ""
+        logger.warning("Slow query (%.1f ms): %s\n%s", elapsed * 1000, statement, plan)
+
+
+def _handle_error(context):
+    conn = context.connection
+    if conn is not None and conn.info.get("query_log_start"):
+        conn.info["query_log_start"].pop()
+
+
+def install_query_log(engine: Engine) -> Engine:
+    """Idempotent; takes a sync engine or `AsyncEngine.sync_engine`."""
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
@@ -0,0 +1,277 @@
+# src/app/database/routing.py
+"""
+Read-replica routing (DB_REPLICA_URLS).
+
+`RoutingSession.get_bind` sends a statement to a replica only when
+
+* the current HTTP request may read from one – a GET/HEAD whose client has
+  not written within DB_READ_YOUR_WRITES_SECONDS (decided per request by
+  ReadRoutingMiddleware, see `route_reads`),
+* this session has not written yet – after its first flush / DML statement
+  it sticks to the primary, so a read after `create_post` sees the row,
+* and a healthy replica is available.
+
+The replica is picked once per session and kept in `session.info`, so the
+statements of one request (a feed page and its tags) read one snapshot
+rather than replicas with different lag. A bare `get_bind()` – the CRUD
+modules asking for the dialect – is not a statement: it returns the primary
+without picking or counting.
+
+Anything else – writes, POST/PUT/DELETE requests, CLI tasks, migrations –
+goes to the primary. In practice that puts the feed (`get_posts`,
+`get_post`, the tag list, search, export) and `get_user_by_username` of
+authenticated GETs on the replicas.
+
+`ReplicaSet` balances round-robin or by fewest checked-out connections,
+takes a replica out for DB_REPLICA_RETRY_SECONDS when connecting to it
+fails, and `check()` probes all of them (SELECT 1; replay lag on Postgres
+against DB_REPLICA_MAX_LAG_SECONDS) – the app lifespan runs it every
+DB_REPLICA_HEALTH_INTERVAL_SECONDS. With no healthy replica reads fall
+back to the primary.
+
+Local setup with SQLite: copy the migrated primary file and point
+DB_REPLICA_URLS at the copy (nothing replicates; it just has to exist).
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import anyio
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from src.app.core.config import Settings, settings
+from src.app.services.metrics import db_routed
+
+logger = logging.getLogger(__name__)
+
+_LAG = text("SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())")
+
+
+def replica_urls(cfg: Settings) -> List[str]:
+    return [url.strip() for url in cfg.db_replica_urls.split(",") if url.strip()]
+
+
+# --------------------------------------------------------------------- #
+# Per-request routing decision
+# --------------------------------------------------------------------- #
+@dataclass
+class ReadRouting:
+    replica_ok: bool
+    wrote: bool = False         # set by any session that wrote during the request
+
+
+_routing: ContextVar[Optional[ReadRouting]] = ContextVar("postino_read_routing", default=None)
+
+
+def route_reads(routing: ReadRouting) -> Token:
+    return _routing.set(routing)
+
+
+def reset_routing(token: Token) -> None:
+    _routing.reset(token)
+
+
+def pinned_to_primary() -> bool:
+    """True in a request that must not be served replica data (e.g. its client just wrote)."""
+    routing = _routing.get()
+    return routing is not None and not routing.replica_ok
+
+
+# --------------------------------------------------------------------- #
+# Replicas
+# --------------------------------------------------------------------- #
+@dataclass
+class Replica:
+    name: str                           # URL without the password
+    engine: Engine                      # sync engine or AsyncEngine.sync_engine
+    async_engine: Any = None            # the AsyncEngine, in async mode
+    healthy: bool = True
+    down_until: float = 0.0
+    error: str = ""
+    lag_seconds: Optional[float] = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"name": self.name, "healthy": self.healthy, "error": self.error,
+                "lag_seconds": self.lag_seconds}
+
+
+def _checked_out(replica: Replica) -> int:
+    checkedout = getattr(replica.engine.pool, "checkedout", None)
+    return checkedout() if callable(checkedout) else 0
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        replicas: List[Replica],
+        balance: str = "round_robin",
+        retry_seconds: float = 30.0,
+        max_lag_seconds: Optional[float] = None,
+    ) -> None:
+        if balance not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown DB_REPLICA_BALANCE {balance!r}")
+        self.replicas = replicas
+        self.balance = balance
+        self.retry_seconds = retry_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        for replica in replicas:
+            self._watch(replica)
+
+    @classmethod
+    def build(cls, replicas: List[Replica], cfg: Settings = settings) -> "ReplicaSet":
+        return cls(replicas, cfg.db_replica_balance, cfg.db_replica_retry_seconds,
+                   cfg.db_replica_max_lag_seconds)
+
+    @staticmethod
+    def display_name(url: str) -> str:
+        return make_url(url).render_as_string(hide_password=True)
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    # ---------------- balancing ---------------- #
+    def pick(self) -> Optional[Replica]:
+        now = time.monotonic()
+        # a replica that is down gets a request again once its retry time passed
+        candidates = [r for r in self.replicas if r.healthy or now >= r.down_until]
+        if not candidates:
+            return None
+        if self.balance == "least_connections":
+            return min(candidates, key=_checked_out)
+        return candidates[next(self._next) % len(candidates)]
+
+    def mark_down(self, replica: Replica, error: str) -> None:
+        with self._lock:
+            if replica.healthy:
+                logger.warning("Read replica %s taken out: %s", replica.name, error)
+            replica.healthy = False
+            replica.error = error
+            replica.down_until = time.monotonic() + self.retry_seconds
+
+    def mark_up(self, replica: Replica, lag_seconds: Optional[float]) -> None:
+        with self._lock:
+            if not replica.healthy:
+                logger.info("Read replica %s is back", replica.name)
+            replica.healthy = True
+            replica.error = ""
+            replica.lag_seconds = lag_seconds
+
+    def _watch(self, replica: Replica) -> None:
+        def _on_error(context) -> None:
+            # connect failures have no connection; dropped ones are disconnects
+            if context.connection is None or context.is_disconnect:
+                self.mark_down(replica, type(context.original_exception).__name__)
+
+        event.listen(replica.engine, "handle_error", _on_error)
+
+    # ---------------- health checks ---------------- #
+    def _verdict(self, replica: Replica, lag: Optional[float]) -> None:
+        if lag is not None and self.max_lag_seconds is not None and lag > self.max_lag_seconds:
+            replica.lag_seconds = lag
+            self.mark_down(replica, f"lagging {lag:.1f}s")
+        else:
+            self.mark_up(replica, lag)
+
+    def _wants_lag(self, replica: Replica) -> bool:
+        return self.max_lag_seconds is not None and replica.engine.dialect.name == "postgresql"
+
+    def _probe_sync(self, replica: Replica) -> Optional[float]:
+        with replica.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            return conn.execute(_LAG).scalar() if self._wants_lag(replica) else None
+
+    async def _probe_async(self, replica: Replica) -> Optional[float]:
+        async with replica.async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            return (await conn.execute(_LAG)).scalar() if self._wants_lag(replica) else None
+
+    async def check(self) -> None:
+        for replica in self.replicas:
+            try:
+                if replica.async_engine is not None:
+                    lag = await self._probe_async(replica)
+                else:
+                    lag = await anyio.to_thread.run_sync(self._probe_sync, replica)
+            except Exception as exc:
+                self.mark_down(replica, f"{type(exc).__name__}: {str(exc).splitlines()[0]}")
+            else:
+                self._verdict(replica, float(lag) if lag is not None else None)
+
+    async def monitor(self, interval: float) -> None:
+        """Lifespan task: `check()` every `interval` seconds until cancelled."""
+        while True:
+            await anyio.sleep(interval)
+            await self.check()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [replica.stats() for replica in self.replicas]
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            if replica.async_engine is not None:
+                await replica.async_engine.dispose()
+            else:
+                replica.engine.dispose()
+
+
+def active_replicas() -> ReplicaSet:
+    """The replica set of the configured DATABASE_MODE (empty when none are set)."""
+    if settings.database_mode == "async":
+        from src.app.database.async_database import get_async_replicas
+        return get_async_replicas()
+    from src.app.database.database import replicas
+    return replicas
+
+
+# --------------------------------------------------------------------- #
+# Session
+# --------------------------------------------------------------------- #
+def _is_write(clause) -> bool:
+    if clause is None:
+        return False
+    if isinstance(clause, TextClause):
+        return not clause.text.lstrip()[:6].upper().startswith(("SELECT", "WITH"))
+    return bool(getattr(clause, "is_dml", False))
+
+
+class RoutingSession(Session):
+    """Session that reads from `replicas` when the request allows it (module docstring)."""
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, *, clause=None, bind=None, **kw):
+        primary = super().get_bind(mapper, clause=clause, bind=bind, **kw)
+        if bind is not None or not self.replicas:
+            return primary
+        if mapper is None and clause is None:           # dialect lookup, connection()
+            return primary
+        replica = self._read_replica(clause)
+        db_routed.inc(replica.name if replica is not None else "primary")
+        return replica.engine if replica is not None else primary
+
+    def _read_replica(self, clause) -> Optional[Replica]:
+        routing = _routing.get()
+        if self._flushing or _is_write(clause):
+            self.info["wrote"] = True
+            if routing is not None:
+                routing.wrote = True
+            return None
+        if routing is None or not routing.replica_ok or self.info.get("wrote"):
+            return None
+        if "replica" not in self.info:                  # None: no healthy one, stay on primary
+            self.info["replica"] = self.replicas.pick()
+        return self.info["replica"]
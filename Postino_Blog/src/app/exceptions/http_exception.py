@@ -6,4 +6,13 @@ class CredentialsException(HTTPException):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=detail,
             headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+class ServiceBusyException(HTTPException):
+    def __init__(self, detail: str = "Server busy, retry shortly", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
         )
\ No newline at end of file
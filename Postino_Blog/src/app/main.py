@@ -1,46 +1,137 @@
+"""
+Application entry point.
+
+Importing this module does no network I/O and no DDL: storage clients are
+created on first use (services/registry.py), and the startup work below
+runs in the lifespan – migrations (DB_AUTO_MIGRATE) and the default user
+(DEFAULT_USER_ON_STARTUP), both of which `python -m src.app.tasks.bootstrap`
+can do once per deploy instead.
+
+Production runs several worker processes under gunicorn (gunicorn.conf.py):
+it bootstraps once in the master and every worker imports this module on
+its own, so engines and clients are never shared across a fork.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 
-from src.app.database.database import engine, Base, SessionLocal
+from src.app.database.database import engine
+from src.app.database.migrations import upgrade_to_head
+from src.app.database.routing import active_replicas
 from src.app.core.config import settings
-from src.app.crud.user_crud import get_user_by_username, create_user
-from src.app.schemas.user_schema import UserCreate
 from src.app.api.api_v1.routers import api_router
+from src.app.api import health
+from src.app.core.password_hasher import password_hasher
+from src.app.middleware.admission import AdmissionMiddleware
+from src.app.middleware.body_size import MaxUploadSizeMiddleware
+from src.app.middleware.compression import CompressionMiddleware
+from src.app.middleware.metrics import MetricsMiddleware
+from src.app.middleware.query_log import QueryLogMiddleware
+from src.app.middleware.rate_limit import RateLimitMiddleware
+from src.app.middleware.read_routing import ReadRoutingMiddleware
+from src.app.services import metrics
+from src.app.services.admission import admission
+from src.app.services.rate_limit import RateLimiter
+from src.app.services.registry import services
+from src.app.services.shared_state import shared_state
+from src.app.tasks.bootstrap import ensure_default_user
+from src.app.utils.compression import enabled_codecs
 
-# --- NEW: eager‑import so the client creates the bucket once -------------
-from src.app.services.minio_client import MinioClient
-MinioClient(                                     # noqa: E402
-    url=settings.minio_endpoint,
-    access_key=settings.minio_root_user,  # ← updated
-    secret_key=settings.minio_root_password,
-    buckets=[settings.minio_bucket],
-    secure=False,
-)
-# -------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
 
-app = FastAPI()
 
-# 1. tables
-Base.metadata.create_all(bind=engine)
+# 1. tables – Alembic owns the schema (alembic/versions/)
+def init_schema() -> None:
+    if settings.db_auto_migrate:
+        upgrade_to_head()
 
-# 2. default user
+# 2. default user – bcrypt only runs when it has to be created
 def init_default_user() -> None:
-    db = SessionLocal()
+    if not settings.default_user_on_startup:
+        return
     try:
-        email = settings.default_user_email
-        if not get_user_by_username(db, email):
-            user_in = UserCreate(
-                username=email,
-                email=email,
-                password=settings.default_user_password,
-            )
-            create_user(db, user_in)
-            print(f"✨ Created default user {email}")
-    finally:
-        db.close()
-
-@app.on_event("startup")
-def on_startup() -> None:
-    init_default_user()
+        if ensure_default_user():
+            logger.info("Created default user %s", settings.default_user_email)
+    except Exception:       # not needed to serve requests; don't block the boot
+        logger.exception("Could not create the default user")
+
+async def close_database() -> None:
+    await active_replicas().dispose()
+    if settings.database_mode == "async":
+        from src.app.database.async_database import get_async_engine
+        await get_async_engine().dispose()
+    engine.dispose()
+
+def warn_unshared_state() -> None:
+    # an unshared response cache is switched off instead, see build_response_cache
+    if settings.web_concurrency > 1 and not (shared_state and shared_state.shared):
+        logger.warning(
+            "WEB_CONCURRENCY=%d with SHARED_STATE_BACKEND=%s: rate limits apply per worker and "
+            "read-your-writes only holds when the next request reaches the same worker; use redis",
+            settings.web_concurrency, settings.shared_state_backend,
+        )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(init_schema)
+    await run_in_threadpool(init_default_user)
+    warn_unshared_state()
+    replicas = active_replicas()
+    monitor = None
+    if replicas:
+        await replicas.check()      # don't route the first reads to a dead replica
+        monitor = asyncio.create_task(replicas.monitor(settings.db_replica_health_interval_seconds))
+    health.mark_ready()
+    yield
+    health.mark_not_ready()
+    if monitor is not None:
+        monitor.cancel()
+    password_hasher.shutdown()
+    await run_in_threadpool(services.close)
+    await close_database()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MaxUploadSizeMiddleware, max_bytes=settings.upload_max_request_bytes)
+app.add_middleware(
+    CompressionMiddleware,
+    codecs=enabled_codecs(),
+    min_size=settings.compression_min_size,
+)
+if active_replicas():
+    app.add_middleware(ReadRoutingMiddleware, state=shared_state,
+                       window_seconds=settings.db_read_your_writes_seconds)
+if settings.query_debug:
+    app.add_middleware(QueryLogMiddleware)
+# load shedding: per-client budgets (429), then the global concurrency cap (503)
+_UNLIMITED = ("/health/", "/metrics")
+app.add_middleware(AdmissionMiddleware, admission=admission, exempt=_UNLIMITED)
+if settings.rate_limit_enabled and shared_state is not None:
+    app.add_middleware(RateLimitMiddleware, exempt=_UNLIMITED,
+                       limiter=RateLimiter.from_settings(settings, shared_state))
+if settings.metrics_enabled or settings.server_timing_enabled:
+    # outermost, so latency covers compression and the other middleware
+    app.add_middleware(MetricsMiddleware, server_timing=settings.server_timing_enabled)
 
 # 3. mount api
 app.include_router(api_router, prefix="/api/v1")
+
+# 4. probes – /health/live, /health/ready
+app.include_router(health.router, prefix="/health", tags=["health"])
+
+# 5. Prometheus scrape endpoint
+if settings.metrics_enabled:
+    if settings.database_mode == "async":
+        from src.app.database.async_database import get_async_engine
+        metrics.register_runtime_gauges(get_async_engine().sync_engine)
+    else:
+        metrics.register_runtime_gauges(engine)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics() -> PlainTextResponse:
+        return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,46 @@
+# src/app/middleware/admission.py
+"""
+Sheds load before it piles up in the threadpool / DB pool (services/admission.py).
+
+Requests beyond the concurrency limit queue briefly; when the queue is full
+or the wait runs out they get 503 + Retry-After without touching the app.
+Probes and /metrics are exempt – an overloaded worker must still say so.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.app.services.admission import Admission, Overloaded
+from src.app.services.metrics import requests_rejected
+
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp, admission: Admission, exempt: Tuple[str, ...] = (),
+                 retry_after: int = 1) -> None:
+        self.app = app
+        self.admission = admission
+        self.exempt = exempt
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.admission.acquire()
+        except Overloaded as exc:
+            requests_rejected.inc(exc.reason)
+            response = JSONResponse(
+                {"detail": "Server busy, retry shortly"}, status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.admission.release()
@@ -0,0 +1,87 @@
+# src/app/middleware/body_size.py
+"""
+Refuse oversized multipart uploads before Starlette spools them.
+
+A declared Content-Length over the limit is rejected without reading the
+body; chunked bodies are counted as they arrive and cut off at the limit –
+the app then sees a client disconnect, whatever it answers to that is
+dropped, and the client gets the 413. Other content types (JSON, NDJSON)
+are left alone.
+"""
+
+from __future__ import annotations
+
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+_DISCONNECT: Message = {"type": "http.disconnect"}
+
+
+class MaxUploadSizeMiddleware:
+    def __init__(self, app: ASGIApp, max_bytes: int) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        declared = self._header(scope, b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > self.max_bytes:
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        too_large = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            # past the limit the app sees a disconnect, never the rest of the body
+            nonlocal received, too_large
+            if too_large:
+                return _DISCONNECT
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    too_large = True
+                    return _DISCONNECT
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            # the app's answer to the cut-off body (FastAPI: 400 "error parsing
+            # the body") is dropped; the 413 below replaces it
+            nonlocal response_started
+            if too_large and not response_started:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except Exception:
+            if not too_large:
+                raise
+        if too_large and not response_started:
+            await self._reject(scope, receive, send)
+
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _header(scope: Scope, name: bytes) -> str | None:
+        for key, value in scope.get("headers", []):
+            if key == name:
+                return value.decode("latin-1")
+        return None
+
+    def _is_multipart(self, scope: Scope) -> bool:
+        content_type = self._header(scope, b"content-type") or ""
+        return content_type.startswith("multipart/form-data")
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = PlainTextResponse(
+            f"Request body exceeds {self.max_bytes} bytes", status_code=413
+        )
+        await response(scope, receive, send)
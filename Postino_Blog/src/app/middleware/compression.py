@@ -0,0 +1,101 @@
+# src/app/middleware/compression.py
+"""
+Compress compressible responses (JSON, NDJSON, text) on the way out.
+
+* negotiates br / zstd / gzip from Accept-Encoding (utils/compression.py)
+* single-message bodies below `min_size` are sent as-is
+* streamed bodies (NDJSON export) are compressed chunk by chunk, each chunk
+  flushed so clients see rows as they are produced
+* responses that already carry Content-Encoding – pre-compressed cache
+  entries, see services/response_cache.py – pass through untouched
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.app.utils.compression import Codec, is_compressible, negotiate
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, codecs: Dict[str, Codec], min_size: int = 1024) -> None:
+        self.app = app
+        self.codecs = codecs
+        self.min_size = min_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.codecs:
+            await self.app(scope, receive, send)
+            return
+        name = negotiate(Headers(scope=scope).get("accept-encoding"), self.codecs)
+        responder = _Responder(send, self.codecs.get(name) if name else None, self.min_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _Responder:
+    def __init__(self, send: Send, codec: Optional[Codec], min_size: int) -> None:
+        self._send = send
+        self._codec = codec
+        self._min_size = min_size
+        self._start: Optional[Message] = None
+        self._mode = "pending"          # pending → passthrough | whole | stream
+        self._stream = None
+
+    async def send(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            self._start = message
+            headers = Headers(raw=message["headers"])
+            if (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or not is_compressible(headers.get("content-type"))
+            ):
+                self._mode = "passthrough"
+                await self._send(message)
+            return
+        if kind != "http.response.body" or self._mode == "passthrough":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+
+        if self._mode == "pending":
+            if not more:
+                await self._send_whole(body)
+                return
+            await self._begin_stream()
+
+        if self._mode == "stream" and self._stream is not None:
+            out = self._stream.compress(body) if body else b""
+            if not more:
+                out += self._stream.finish()
+            await self._send({"type": "http.response.body", "body": out, "more_body": more})
+        else:
+            await self._send(message)
+
+    async def _send_whole(self, body: bytes) -> None:
+        headers = MutableHeaders(raw=self._start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if self._codec is not None and len(body) >= self._min_size:
+            body = self._codec.compress(body)
+            headers["Content-Encoding"] = self._codec.name
+            headers["Content-Length"] = str(len(body))
+        self._mode = "whole"
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": body, "more_body": False})
+
+    async def _begin_stream(self) -> None:
+        headers = MutableHeaders(raw=self._start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if self._codec is not None:
+            headers["Content-Encoding"] = self._codec.name
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            self._stream = self._codec.stream()
+        self._mode = "stream"
+        await self._send(self._start)
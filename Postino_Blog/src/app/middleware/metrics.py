@@ -0,0 +1,63 @@
+# src/app/middleware/metrics.py
+"""
+Request metrics and the optional `Server-Timing` header.
+
+Labels use the matched route template (`/api/v1/posts/{post_id}`), never
+the raw path, so series stay bounded; unmatched requests share one label.
+The Server-Timing header is written with the response start, so for
+streamed bodies it covers the work done before the first byte.
+"""
+
+from __future__ import annotations
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.app.services.metrics import (
+    db_queries_per_request,
+    end_request,
+    http_duration,
+    http_requests,
+    start_request,
+)
+
+UNMATCHED = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, server_timing: bool = False) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings, token = start_request()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_request(token)
+            route = route_template(scope)
+            method = scope["method"]
+            http_requests.inc(method, route, str(status))
+            http_duration.observe(time.perf_counter() - timings.started, method, route)
+            db_queries_per_request.observe(timings.queries, route)
@@ -0,0 +1,30 @@
+# src/app/middleware/query_log.py
+"""
+Per-request statement log (QUERY_DEBUG=true only, see database/query_log.py).
+
+The log lives in a context variable rather than on the session from
+`get_db`: sync dependencies run in their own threadpool call, and a value
+they set wouldn't be visible to the route.
+"""
+
+from __future__ import annotations
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.app.database.query_log import log_request_queries, request_log
+from src.app.middleware.metrics import route_template
+
+
+class QueryLogMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with request_log() as log:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                log_request_queries(log, f"{scope['method']} {route_template(scope)}")
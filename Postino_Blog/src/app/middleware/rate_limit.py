@@ -0,0 +1,53 @@
+# src/app/middleware/rate_limit.py
+"""
+429 + Retry-After for clients over their route budget (services/rate_limit.py).
+
+Runs before admission control, so a client over its budget never occupies
+a queue slot. With a shared (redis) backend the bucket check is a network
+round trip and runs in a thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from typing import Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.app.services.metrics import requests_rejected
+from src.app.services.rate_limit import RateLimiter
+
+
+class RateLimitMiddleware:
+    def __init__(self, app: ASGIApp, limiter: RateLimiter, exempt: Tuple[str, ...] = ()) -> None:
+        self.app = app
+        self.limiter = limiter
+        self.exempt = exempt
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt):
+            await self.app(scope, receive, send)
+            return
+        rule = self.limiter.rule_for(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        client = self.limiter.client(scope)
+        if self.limiter.state.blocking:
+            allowed, wait = await asyncio.to_thread(self.limiter.check, rule, client)
+        else:
+            allowed, wait = self.limiter.check(rule, client)
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        requests_rejected.inc("rate_limited")
+        response = JSONResponse(
+            {"detail": "Too many requests, retry later"}, status_code=429,
+            headers={"Retry-After": str(max(1, math.ceil(wait))),
+                     "RateLimit-Policy": f"{rule.count};w={rule.period}"},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,81 @@
+# src/app/middleware/read_routing.py
+"""
+Decides per request whether reads may go to a replica (database/routing.py).
+
+GET / HEAD requests may, unless the client wrote within
+DB_READ_YOUR_WRITES_SECONDS. "Client" is a digest of the Authorization
+header – writes need a token, so anonymous readers never have pending
+writes – and the marks live in `shared_state`, so with the redis backend
+they hold across workers. A request that wrote sets the mark before its
+response starts, so the client's next request cannot overtake it.
+
+The decision is a mutable object in a context variable rather than a plain
+flag: sessions in sync routes run in the threadpool, and only a mutation
+made there is visible here afterwards.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.app.database.routing import ReadRouting, reset_routing, route_reads
+from src.app.services.shared_state import StateBackend
+
+SAFE_METHODS = ("GET", "HEAD")
+
+
+def client_key(scope: Scope) -> Optional[str]:
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            return "ryw:" + hashlib.sha256(value).hexdigest()[:32]
+    return None
+
+
+class ReadRoutingMiddleware:
+    def __init__(self, app: ASGIApp, state: Optional[StateBackend], window_seconds: float) -> None:
+        self.app = app
+        self.state = state
+        self.window = int(window_seconds + 0.999)       # backends take whole seconds
+
+    async def _call(self, fn, *args):
+        if self.state.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def _wrote_recently(self, key: Optional[str]) -> bool:
+        if key is None or self.state is None or self.window <= 0:
+            return False
+        return await self._call(self.state.get, key) is not None
+
+    async def _remember(self, key: Optional[str]) -> None:
+        if key is not None and self.state is not None and self.window > 0:
+            await self._call(self.state.set, key, b"1", self.window)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        key = client_key(scope)
+        replica_ok = scope["method"] in SAFE_METHODS and not await self._wrote_recently(key)
+        routing = ReadRouting(replica_ok)
+        remembered = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal remembered
+            if message["type"] == "http.response.start" and routing.wrote:
+                remembered = True
+                await self._remember(key)
+            await send(message)
+
+        token = route_reads(routing)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            reset_routing(token)
+            if routing.wrote and not remembered:        # e.g. a background task wrote
+                await self._remember(key)
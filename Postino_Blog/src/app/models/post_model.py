@@ -1,16 +1,26 @@
 # post_model.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from sqlalchemy import JSON, Column, Integer, String, Text, DateTime, Index, event, func
 from sqlalchemy.orm import relationship
 from src.app.database.database import Base
+from src.app.database.fulltext import after_posts_create
 from src.app.models.post_tag_model import post_tag
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # keyset pagination of the feed: ORDER BY created_at DESC, id DESC
+        Index("ix_posts_created_at_id", "created_at", "id"),
+    )
 
     id         = Column(Integer, primary_key=True, index=True)
     title      = Column(String,  nullable=False, index=True)
     content    = Column(Text,    nullable=False)
+    # plain-text teaser of content, written with it (utils/excerpt.py)
+    excerpt    = Column(String,  nullable=True)
     image_url  = Column(String,  nullable=True)
+    # {"width", "height", "blurhash", "variants": [{url, width, height, format}]}
+    # filled in by tasks.image_processing once the upload is processed
+    image_meta = Column(JSON,    nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -18,5 +28,8 @@ class Post(Base):
         "Tag",
         secondary=post_tag,
         back_populates="posts",
-        lazy="joined",
+        lazy="select",          # pick a loader per query, see crud/
     )
+
+# full-text index (FTS5 table + triggers / tsvector + GIN), see database/fulltext.py
+event.listen(Post.__table__, "after_create", after_posts_create)
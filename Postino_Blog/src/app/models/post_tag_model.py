@@ -1,10 +1,13 @@
 # post_tag_model.py  (NEW – association table)
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Index, Integer, ForeignKey
 from src.app.database.database import Base
 
 post_tag = Table(
     "post_tag",
     Base.metadata,
-    Column("post_id", Integer, ForeignKey("posts.id", ondelete="CASCADE")),
-    Column("tag_id",  Integer, ForeignKey("tags.id",  ondelete="CASCADE")),
+    # composite PK: no duplicate links, and (post_id, ...) lookups for a post's tags
+    Column("post_id", Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id",  Integer, ForeignKey("tags.id",  ondelete="CASCADE"), primary_key=True),
+    # reverse direction for `?tag=` filtering: tag → its posts
+    Index("ix_post_tag_tag_id_post_id", "tag_id", "post_id"),
 )
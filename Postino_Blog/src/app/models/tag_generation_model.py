@@ -0,0 +1,17 @@
+# tag_generation_model.py  – single-row counter, bumped by every tag_stats change
+from sqlalchemy import DDL, Column, Integer, event
+from src.app.database.database import Base
+
+class TagGeneration(Base):
+    __tablename__ = "tag_generation"
+
+    id         = Column(Integer, primary_key=True)      # always 1
+    generation = Column(Integer, nullable=False, default=0)
+
+# the row must exist for the UPDATE in tag_crud.tag_usage_stmts to bump it
+# (the Alembic revision inserts it too; this covers create_all)
+event.listen(
+    TagGeneration.__table__,
+    "after_create",
+    DDL("INSERT INTO tag_generation (id, generation) VALUES (1, 0)"),
+)
@@ -14,5 +14,5 @@ class Tag(Base):
         "Post",
         secondary=post_tag,
         back_populates="tags",
-        lazy="joined",
+        lazy="select",          # pick a loader per query, see crud/
     )
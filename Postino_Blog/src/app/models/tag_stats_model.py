@@ -0,0 +1,15 @@
+# tag_stats_model.py  – per-tag counters, maintained by post_crud writes
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+from src.app.database.database import Base
+
+class TagStats(Base):
+    __tablename__ = "tag_stats"
+    __table_args__ = (
+        # ORDER BY post_count DESC for the "popular" tag cloud
+        Index("ix_tag_stats_post_count", "post_count"),
+    )
+
+    tag_id       = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+    post_count   = Column(Integer, nullable=False, default=0)
+    # last time a post was tagged with it (create, or update adding the tag)
+    last_used_at = Column(DateTime(timezone=True), nullable=True)
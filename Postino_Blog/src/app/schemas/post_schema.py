@@ -1,7 +1,7 @@
 # src/app/schemas/post_schema.py
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, field_validator
 
 class PostBase(BaseModel):
     title: str
@@ -15,11 +15,25 @@ class PostBase(BaseModel):
 class PostCreate(PostBase):
     pass
 
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str
+
 class PostOut(BaseModel):
     id: int
     title: str
     content: str
     image_url: Optional[str] = None
+    # filled in once background processing of the upload has finished
+    image_width: Optional[int] = None
+    image_height: Optional[int] = None
+    image_blurhash: Optional[str] = None
+    image_variants: List[ImageVariant] = Field(
+        default=[],
+        description="Resized, EXIF-free copies of image_url (smallest first)"
+    )
     # ↓ give the field a default + example so Swagger shows it
     tags: List[str] = Field(
         default=[],
@@ -31,3 +45,61 @@ class PostOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+class PostSearchHit(BaseModel):
+    id: int
+    title: str
+    snippet: str = Field(
+        description="Excerpt of the content around the match, matches wrapped in <mark>"
+    )
+    rank: float = Field(description="Relevance, lower is better")
+    image_url: Optional[str] = None
+    tags: List[str] = []
+    created_at: datetime
+
+class PostSummaryOut(BaseModel):
+    """Feed item without `content` (`GET /posts?view=summary`)."""
+    id: int
+    title: str
+    excerpt: str = ""
+    image_url: Optional[str] = None
+    image_width: Optional[int] = None
+    image_height: Optional[int] = None
+    image_blurhash: Optional[str] = None
+    image_variants: List[ImageVariant] = []
+    tags: List[str] = []
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+# ---------- bulk import / export (one JSON object per NDJSON line) ----------
+class PostImportRow(BaseModel):
+    title: str
+    content: str
+    tags: List[str] = Field(default=[], description="List or comma-separated string")
+    image_url: Optional[str] = None
+    image_meta: Optional[Dict[str, Any]] = None
+    # keep archive timestamps; defaults to the import time
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def _split_tags(cls, value):
+        if isinstance(value, str):
+            return [t.strip() for t in value.split(",") if t.strip()]
+        return value
+
+class PostExportRow(PostImportRow):
+    id: int
+
+class BulkImportError(BaseModel):
+    line: int
+    error: str
+
+class BulkImportResult(BaseModel):
+    received: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[BulkImportError] = Field(
+        default=[], description="First BULK_IMPORT_MAX_ERRORS failures (1-based line numbers)"
+    )
@@ -1,4 +1,6 @@
 # tag_schema.py
+from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel
 
 class TagBase(BaseModel):
@@ -9,3 +11,7 @@ class TagOut(TagBase):
 
     class Config:
         from_attributes = True
+
+class TagStatsOut(TagBase):
+    post_count: int = 0
+    last_used_at: Optional[datetime] = None
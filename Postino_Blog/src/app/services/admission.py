@@ -0,0 +1,98 @@
+# src/app/services/admission.py
+"""
+Global admission control: at most N requests of this worker run at once.
+
+Beyond that, requests wait in a bounded FIFO queue for up to
+ADMISSION_QUEUE_TIMEOUT_SECONDS; a full queue or an expired wait is
+answered 503 + Retry-After at once (AdmissionMiddleware). Shedding there is
+cheap; letting the request in would only park it on a threadpool thread
+or a DB pool checkout until it times out anyway.
+
+ADMISSION_MAX_CONCURRENT=0 sizes N automatically: the request threadpool
+(anyio's limiter, where sync routes run) or the per-worker DB pool,
+whichever is smaller. One event loop per process, so no locks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from src.app.core.config import Settings, settings
+from src.app.database.engine_factory import pool_limits
+
+
+class Overloaded(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason        # "queue_full" | "queue_timeout"
+
+
+def auto_limit(cfg: Settings) -> int:
+    from anyio.to_thread import current_default_thread_limiter
+
+    pool_size, max_overflow = pool_limits(cfg)
+    threads = int(current_default_thread_limiter().total_tokens)
+    return max(1, min(threads, pool_size + max_overflow))
+
+
+class Admission:
+    def __init__(self, limit: int, max_queue: int, queue_timeout: float) -> None:
+        self.limit: Optional[int] = limit or None       # resolved on first use when 0
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected = 0
+
+    async def acquire(self) -> None:
+        if self.limit is None:
+            self.limit = auto_limit(settings)      # needs the running loop's limiter
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                waiter.cancel()
+                self.rejected += 1
+                raise Overloaded("queue_timeout")
+        except BaseException:           # client went away while queued
+            if not waiter.done():
+                waiter.cancel()
+            elif not waiter.cancelled():
+                self.release()          # the slot was handed over already
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        self.admitted += 1              # release() handed its slot to this waiter
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def stats(self) -> Dict[str, float]:
+        return {"limit": self.limit or 0, "active": self._active, "queued": len(self._waiters),
+                "admitted": self.admitted, "rejected": self.rejected}
+
+
+admission = Admission(
+    limit=settings.admission_max_concurrent,
+    max_queue=settings.admission_max_queue,
+    queue_timeout=settings.admission_queue_timeout_seconds,
+)
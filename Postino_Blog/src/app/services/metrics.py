@@ -0,0 +1,357 @@
+# src/app/services/metrics.py
+"""
+Process-wide metrics in the Prometheus text format, plus per-request timing.
+
+* `Counter` / `Histogram` with fixed label names, and `Gauge`s read from a
+  callback at scrape time (pool, threadpool, bcrypt executor)
+* `registry.render()` produces the `/metrics` body (exposition format 0.0.4)
+* every request gets a `RequestTimings` in a context variable (set by
+  MetricsMiddleware); `observe(phase, seconds)` feeds both the phase's
+  histogram and the current request's total, which is what the
+  `Server-Timing` header reports. Context variables follow the request into
+  `run_in_threadpool` and the async engine's greenlets, but not into the
+  upload / bcrypt executors – callers time those around the submit.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+SIZE_BUCKETS = (1 << 10, 1 << 14, 1 << 17, 1 << 20, 1 << 22, 1 << 24, 1 << 26)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _num(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# --------------------------------------------------------------------- #
+# Metric types
+# --------------------------------------------------------------------- #
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, doc, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, doc, labelnames)
+        self.buckets = tuple(buckets)
+        self._series: Dict[LabelValues, List[float]] = {}   # [*bucket counts, +Inf, sum]
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = []
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), series):
+                cumulative += count
+                le = _labels(self.labelnames, labels, f'le="{_num(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_num(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Value(s) read at scrape time: `read()` returns {label values: value}."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, doc: str, read: Callable[[], Dict[LabelValues, float]],
+                 labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, doc, labelnames)
+        self._read = read
+
+    def samples(self) -> List[str]:
+        values = self._read()
+        return [f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in sorted(values.items())]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, doc: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, doc, labelnames))
+
+    def histogram(self, name: str, doc: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, doc, labelnames, buckets))
+
+    def gauge(self, name: str, doc: str, read: Callable[[], Dict[LabelValues, float]],
+              labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, doc, read, labelnames))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# --------------------------------------------------------------------- #
+# Application metrics
+# --------------------------------------------------------------------- #
+http_requests = registry.counter(
+    "postino_http_requests_total", "HTTP requests by route template and status.",
+    ("method", "route", "status"),
+)
+http_duration = registry.histogram(
+    "postino_http_request_duration_seconds", "Time to the last body byte, by route template.",
+    ("method", "route"),
+)
+requests_rejected = registry.counter(
+    "postino_requests_rejected_total",
+    "Requests refused before the app: rate_limited (429), queue_full / queue_timeout (503).",
+    ("reason",),
+)
+db_queries = registry.histogram(
+    "postino_db_query_duration_seconds", "Duration of single DB statements.",
+    buckets=FAST_BUCKETS,
+)
+db_queries_per_request = registry.histogram(
+    "postino_db_queries_per_request", "Statements executed per HTTP request.",
+    ("route",), buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+db_routed = registry.counter(
+    "postino_db_routed_statements_total", "Statements by target, with read replicas configured.",
+    ("target",),
+)
+storage_uploads = registry.histogram(
+    "postino_storage_upload_duration_seconds", "MinIO upload latency (save_image).",
+)
+storage_upload_bytes = registry.histogram(
+    "postino_storage_upload_size_bytes", "Size of objects uploaded by save_image.",
+    buckets=SIZE_BUCKETS,
+)
+bcrypt_duration = registry.histogram(
+    "postino_bcrypt_duration_seconds", "Time spent in bcrypt on the hasher's workers.",
+    ("op",), buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+serialize_duration = registry.histogram(
+    "postino_serialize_duration_seconds", "JSON encoding time of response bodies.",
+    buckets=FAST_BUCKETS,
+)
+
+
+# --------------------------------------------------------------------- #
+# Per-request timings (Server-Timing)
+# --------------------------------------------------------------------- #
+class RequestTimings:
+    __slots__ = ("started", "phases", "queries")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.queries = 0
+
+    def add(self, phase: str, seconds: float) -> None:
+        # += on a dict entry isn't atomic, but one request's phases are
+        # recorded from one thread (or task) at a time
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        parts = [
+            f"{phase};dur={seconds * 1000:.2f}"
+            + (f';desc="{self.queries} queries"' if phase == "db" else "")
+            for phase, seconds in self.phases.items()
+        ]
+        parts.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("postino_request_timings", default=None)
+
+
+def start_request() -> Tuple[RequestTimings, object]:
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def observe(phase: str, seconds: float) -> None:
+    """Add `seconds` to the current request's phase ("storage", "auth", …)."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+@contextmanager
+def timed(phase: str, histogram: Optional[Histogram] = None, *labels: str) -> Iterator[None]:
+    """Time the block into the current request's `phase` (and `histogram`)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        observe(phase, elapsed)
+        if histogram is not None:
+            histogram.observe(elapsed, *labels)
+
+
+# --------------------------------------------------------------------- #
+# DB statements
+# --------------------------------------------------------------------- #
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    db_queries.observe(elapsed)
+    timings = _current.get()
+    if timings is not None:
+        timings.add("db", elapsed)
+        timings.queries += 1
+
+
+def _handle_error(context):
+    # a failed statement never reaches after_cursor_execute
+    conn = context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def instrument_engine(engine) -> None:
+    """Time every statement on a sync engine (or `AsyncEngine.sync_engine`)."""
+    from sqlalchemy import event
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+# --------------------------------------------------------------------- #
+# Saturation gauges
+# --------------------------------------------------------------------- #
+def _stats_reader(read: Callable[[], Dict[str, float]], keys: Iterable[str]):
+    def _read() -> Dict[LabelValues, float]:
+        stats = read()
+        return {(key,): stats[key] for key in keys}
+    return _read
+
+
+def _threadpool_stats() -> Dict[LabelValues, float]:
+    """anyio's default limiter – the pool sync routes and run_in_threadpool use."""
+    from anyio.to_thread import current_default_thread_limiter
+
+    try:
+        limiter = current_default_thread_limiter()
+    except RuntimeError:        # not scraped from inside the event loop
+        return {}
+    return {("busy",): limiter.borrowed_tokens, ("limit",): limiter.total_tokens}
+
+
+def register_runtime_gauges(engine) -> None:
+    """DB pool, request threadpool, admission control and bcrypt executor occupancy."""
+    from src.app.core.password_hasher import password_hasher
+    from src.app.services.admission import admission
+    from src.app.database.engine_factory import pool_metrics
+
+    pool = engine.pool
+
+    def _pool_size() -> Dict[LabelValues, float]:
+        size = getattr(pool, "size", None)
+        overflow = getattr(pool, "_max_overflow", 0)
+        return {("size",): size() if callable(size) else 0, ("max_overflow",): max(overflow, 0)}
+
+    registry.gauge(
+        "postino_db_pool_connections", "Pool capacity.", _pool_size, ("kind",),
+    )
+    registry.gauge(
+        "postino_db_pool_usage", "Pool usage: connections checked out, checkout waits.",
+        _stats_reader(pool_metrics.snapshot, ("checked_out", "wait_count", "wait_seconds_total",
+                                              "wait_seconds_max")),
+        ("kind",),
+    )
+    registry.gauge(
+        "postino_threadpool_tokens", "Worker threads in use by sync routes vs. the limit.",
+        _threadpool_stats, ("kind",),
+    )
+    registry.gauge(
+        "postino_admission", "Admission control: limit, running and queued requests.",
+        _stats_reader(admission.stats, ("limit", "active", "queued")),
+        ("kind",),
+    )
+    registry.gauge(
+        "postino_bcrypt_executor", "bcrypt executor workers, running and queued jobs.",
+        _stats_reader(password_hasher.stats, ("workers", "active", "queued", "rejected")),
+        ("kind",),
+    )
@@ -1,11 +1,15 @@
 """
 Thin wrapper around the official MinIO SDK that
-* creates buckets on first run
-* enables versioning
 * exposes the underlying Minio() instance as `.client`
+* optionally takes a dedicated `urllib3.PoolManager` (`http_client`)
+* creates buckets and enables versioning on request (`ensure_buckets`) –
+  constructing the client does no network I/O
 """
 from __future__ import annotations
-from typing import Iterable
+import os
+from typing import Iterable, Optional
+import certifi
+import urllib3
 from minio import Minio
 from minio.versioningconfig import VersioningConfig, ENABLED
 
@@ -16,23 +20,41 @@ class MinioClient:
         url: str,
         access_key: str,
         secret_key: str,
-        buckets: Iterable[str],
         secure: bool = False,
+        http_client: Optional[urllib3.PoolManager] = None,
     ) -> None:
         self.client = Minio(
             endpoint=url,
             access_key=access_key,
             secret_key=secret_key,
             secure=secure,
+            http_client=http_client,
         )
-        self._make_buckets(buckets)
 
     # ------------------------------------------------------------------ #
-    def _make_buckets(self, buckets: Iterable[str]) -> None:
-        """Create each bucket once and switch versioning on."""
+    def ensure_buckets(self, buckets: Iterable[str]) -> None:
+        """Create each missing bucket and switch versioning on."""
         for bucket in buckets:
             if not self.client.bucket_exists(bucket):
                 self.client.make_bucket(bucket)
                 self.client.set_bucket_versioning(
                     bucket, VersioningConfig(ENABLED)
                 )
+
+
+def upload_pool_manager(maxsize: int, timeout: float = 300.0) -> urllib3.PoolManager:
+    """
+    Connection pool for upload traffic, sized to the number of concurrent
+    requests it has to serve (the SDK default keeps only 10 per host).
+    """
+    return urllib3.PoolManager(
+        num_pools=4,
+        maxsize=maxsize,
+        block=True,             # wait for a free connection instead of opening extras
+        timeout=urllib3.Timeout(connect=10.0, read=timeout),
+        retries=urllib3.Retry(
+            total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]
+        ),
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+    )
@@ -0,0 +1,116 @@
+# src/app/services/rate_limit.py
+"""
+Per-client token buckets with per-route budgets (RATE_LIMIT_RULES).
+
+Rules are `<METHOD|*> <path prefix>=<count>/<second|minute|hour>`, separated
+by ";" and tried in order – the first match decides, so put specific routes
+first. A rule's bucket holds `count` tokens and refills at count/period;
+every request matching it spends one. `*=<count>/<period>` alone matches
+everything. Each rule has its own buckets, so spending the login budget
+leaves the feed budget alone.
+
+The client is the JWT subject when the request carries a valid bearer
+token, the client IP otherwise (RATE_LIMIT_KEY=ip: always the IP). Behind
+a reverse proxy set RATE_LIMIT_TRUST_FORWARDED so the IP comes from the
+first X-Forwarded-For entry – and make sure the proxy overwrites it.
+
+Buckets live in `shared_state`: per process with the memory backend
+(budgets then apply per worker), shared with redis.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from jose import JWTError
+from starlette.types import Scope
+
+from src.app.core.config import Settings
+from src.app.core.security import decode_access_token
+from src.app.services.shared_state import StateBackend
+
+_PERIODS = {"s": 1, "sec": 1, "second": 1, "m": 60, "min": 60, "minute": 60,
+            "h": 3600, "hour": 3600}
+_RULE = re.compile(r"^(?:(?P<method>[A-Z]+|\*)\s+(?P<prefix>/\S*)|\*)\s*=\s*"
+                   r"(?P<count>\d+)\s*/\s*(?P<period>[a-z]+)$")
+
+
+@dataclass(frozen=True)
+class Rule:
+    method: str             # "*" = any
+    prefix: str
+    count: int
+    period: int             # seconds
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.prefix}"
+
+    @property
+    def rate(self) -> float:
+        return self.count / self.period
+
+    def matches(self, method: str, path: str) -> bool:
+        return self.method in ("*", method) and path.startswith(self.prefix)
+
+
+def parse_rules(spec: str) -> List[Rule]:
+    rules = []
+    for part in filter(None, (p.strip() for p in spec.split(";"))):
+        match = _RULE.match(part)
+        period = _PERIODS.get(match.group("period")) if match else None
+        if match is None or period is None or int(match.group("count")) < 1:
+            raise ValueError(f"Bad RATE_LIMIT_RULES entry {part!r}; expected e.g. "
+                             "'POST /api/v1/auth/login=10/minute'")
+        rules.append(Rule(match.group("method") or "*", match.group("prefix") or "/",
+                          int(match.group("count")), period))
+    return rules
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class RateLimiter:
+    def __init__(self, rules: List[Rule], state: StateBackend,
+                 key: str = "subject_or_ip", trust_forwarded: bool = False) -> None:
+        if key not in ("ip", "subject_or_ip"):
+            raise ValueError(f"Unknown RATE_LIMIT_KEY {key!r}")
+        self.rules = rules
+        self.state = state
+        self.by_subject = key == "subject_or_ip"
+        self.trust_forwarded = trust_forwarded
+
+    @classmethod
+    def from_settings(cls, cfg: Settings, state: StateBackend) -> "RateLimiter":
+        return cls(parse_rules(cfg.rate_limit_rules), state,
+                   cfg.rate_limit_key, cfg.rate_limit_trust_forwarded)
+
+    def rule_for(self, method: str, path: str) -> Optional[Rule]:
+        return next((rule for rule in self.rules if rule.matches(method, path)), None)
+
+    def client(self, scope: Scope) -> str:
+        if self.by_subject:
+            auth = _header(scope, b"authorization")
+            if auth and auth[:7].lower() == "bearer ":
+                try:
+                    subject = decode_access_token(auth[7:]).get("sub")
+                except JWTError:
+                    subject = None      # invalid tokens count against the IP
+                if subject:
+                    return f"sub:{subject}"
+        if self.trust_forwarded:
+            forwarded = _header(scope, b"x-forwarded-for")
+            if forwarded:
+                return "ip:" + forwarded.split(",")[0].strip()
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    def check(self, rule: Rule, client: str) -> Tuple[bool, float]:
+        """Blocking with a shared backend – (allowed, retry after seconds)."""
+        return self.state.take(f"rl:{rule.name}:{client}", rule.rate, rule.count)
@@ -0,0 +1,112 @@
+# src/app/services/registry.py
+"""
+Process-wide services, built on first use and closed by the app lifespan.
+
+Importing the app does no network I/O: the MinIO client (one per process,
+shared by uploads, downloads and the image-variant task) is created the
+first time something needs it. With MINIO_BOOTSTRAP_ON_FIRST_USE the bucket
+is checked / created at that moment, once; deployments that run
+`python -m src.app.tasks.bootstrap` beforehand can switch it off. An
+unreachable MinIO therefore fails the requests that touch storage, not the
+process.
+
+Pre-fork servers (gunicorn.conf.py) are covered too: a worker forked from
+a parent that already used the registry starts from an empty one.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from minio import Minio
+
+from src.app.core.config import Settings, settings
+from src.app.services.minio_client import MinioClient, upload_pool_manager
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    def __init__(self, cfg: Settings) -> None:
+        self._cfg = cfg
+        self._lock = threading.Lock()
+        self._storage: Optional[MinioClient] = None
+        self._bucket_ready = not cfg.minio_bootstrap_on_first_use
+        self._upload_executor: Optional[ThreadPoolExecutor] = None
+
+    # ---------------- storage ---------------- #
+    def storage(self) -> MinioClient:
+        """The shared MinioClient, without the first-use bucket check."""
+        with self._lock:
+            if self._storage is None:
+                cfg = self._cfg
+                self._storage = MinioClient(
+                    url=cfg.minio_endpoint,
+                    access_key=cfg.minio_root_user,
+                    secret_key=cfg.minio_root_password,
+                    secure=False,
+                    # every worker may run `minio_parallel_parts` part uploads at once
+                    http_client=upload_pool_manager(
+                        maxsize=cfg.minio_upload_workers * max(cfg.minio_parallel_parts, 1)
+                    ),
+                )
+            return self._storage
+
+    @property
+    def minio(self) -> Minio:
+        storage = self.storage()
+        if not self._bucket_ready:
+            with self._lock:
+                if not self._bucket_ready:
+                    try:
+                        storage.ensure_buckets([self._cfg.minio_bucket])
+                        self._bucket_ready = True
+                    except Exception as exc:    # retried on next use; the caller's request fails
+                        logger.warning("MinIO bucket check failed: %s", exc)
+        return storage.client
+
+    @property
+    def upload_executor(self) -> ThreadPoolExecutor:
+        if self._upload_executor is None:
+            with self._lock:
+                if self._upload_executor is None:
+                    self._upload_executor = ThreadPoolExecutor(
+                        max_workers=self._cfg.minio_upload_workers,
+                        thread_name_prefix="minio-upload",
+                    )
+        return self._upload_executor
+
+    # ---------------- lifecycle ---------------- #
+    def close(self) -> None:
+        """Lifespan shutdown: stop the executor, drop pooled connections."""
+        with self._lock:
+            executor, self._upload_executor = self._upload_executor, None
+            storage, self._storage = self._storage, None
+            self._bucket_ready = not self._cfg.minio_bootstrap_on_first_use
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if storage is not None:
+            http = getattr(storage.client, "_http", None)
+            if http is not None:
+                http.clear()
+
+    def reset_after_fork(self) -> None:
+        """In a forked worker: forget the parent's client and threads, don't close them.
+
+        Its pooled sockets and executor threads belong to the parent; each
+        worker builds its own on first use.
+        """
+        self._lock = threading.Lock()
+        self._storage = None
+        self._upload_executor = None
+        self._bucket_ready = not self._cfg.minio_bootstrap_on_first_use
+
+
+services = ServiceRegistry(settings)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=services.reset_after_fork)
@@ -0,0 +1,275 @@
+"""
+Server-side cache of serialized GET responses (feed pages, tag list).
+
+* values are the exact response bytes + headers, so a hit skips the DB,
+  `_make_out` and JSON encoding
+* keys embed generation counters – a global one plus one per scope
+  ("feed", "tag:<name>", "tags") – and writes bump only the scopes they
+  touch; stale entries simply become unreachable and age out
+* compressible bodies are stored with their br / zstd / gzip variants,
+  encoded once on the miss; a hit serves the variant the client accepts
+  and CompressionMiddleware leaves it alone
+* with read replicas, a request pinned to the primary (its client just
+  wrote) skips the lookup and overwrites the entry – one filled from a
+  lagging replica after the invalidation would otherwise outlive it
+* concurrent misses on one key are collapsed (single-flight): one caller
+  renders, the rest wait for its result
+* backends (services/shared_state.py): in-process LRU+TTL, or anything
+  speaking the Redis protocol – the one to use with several workers, since
+  generation counters must be shared for invalidations to reach them all;
+  with WEB_CONCURRENCY > 1 an unshared backend is replaced by none
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from fastapi import Request, Response
+
+from src.app.core.config import Settings, settings
+from src.app.database.routing import pinned_to_primary
+from src.app.services.shared_state import StateBackend, build_backend
+from src.app.utils.compression import (
+    Codec,
+    add_vary,
+    enabled_codecs,
+    is_compressible,
+    negotiate,
+)
+from src.app.utils.http_cache import is_not_modified, not_modified
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = "all"
+
+
+# --------------------------------------------------------------------- #
+# Cached value
+# --------------------------------------------------------------------- #
+@dataclass
+class CachedResponse:
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    media_type: str = "application/json"
+    encoded: Dict[str, bytes] = field(default_factory=dict)   # coding → body
+
+    def precompress(self, codecs: Dict[str, Codec], min_size: int) -> None:
+        if len(self.body) < min_size or not is_compressible(self.media_type):
+            return
+        for name, codec in codecs.items():
+            if name not in self.encoded:
+                self.encoded[name] = codec.compress(self.body)
+
+    def dumps(self) -> bytes:
+        # header JSON never contains a raw newline, so it's a safe separator;
+        # the plain body and then each variant follow it back to back
+        meta = {"h": self.headers, "m": self.media_type}
+        if self.encoded:
+            meta["b"] = len(self.body)
+            meta["e"] = [[name, len(data)] for name, data in self.encoded.items()]
+        return b"".join([json.dumps(meta).encode(), b"\n", self.body, *self.encoded.values()])
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "CachedResponse":
+        meta, _, rest = raw.partition(b"\n")
+        data = json.loads(meta)
+        if "b" not in data:
+            return cls(body=rest, headers=data["h"], media_type=data["m"])
+        offset = data["b"]
+        encoded: Dict[str, bytes] = {}
+        for name, size in data["e"]:
+            encoded[name] = rest[offset:offset + size]
+            offset += size
+        return cls(body=rest[:data["b"]], headers=data["h"], media_type=data["m"], encoded=encoded)
+
+    def to_response(self, request: Request) -> Response:
+        headers = add_vary(dict(self.headers)) if self.encoded else self.headers
+        etag = self.headers.get("ETag")
+        if etag and is_not_modified(request, etag):
+            return not_modified(headers)
+        coding = negotiate(request.headers.get("accept-encoding"), self.encoded)
+        if coding is None:
+            return Response(content=self.body, media_type=self.media_type, headers=headers)
+        headers["Content-Encoding"] = coding
+        return Response(content=self.encoded[coding], media_type=self.media_type, headers=headers)
+
+
+# --------------------------------------------------------------------- #
+# Cache front
+# --------------------------------------------------------------------- #
+class _Flight:
+    __slots__ = ("event", "value")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Optional[CachedResponse] = None
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        backend: Optional[StateBackend],
+        ttl_seconds: int,
+        codecs: Optional[Dict[str, Codec]] = None,
+        compress_min_size: int = 1024,
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl_seconds
+        self.codecs = codecs or {}
+        self.compress_min_size = compress_min_size
+        self.hits = 0
+        self.misses = 0
+        self._flights: Dict[str, _Flight] = {}
+        self._async_flights: Dict[str, "asyncio.Future[Optional[CachedResponse]]"] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl > 0
+
+    @property
+    def shared(self) -> bool:
+        """False when other worker processes would not see this cache's entries / invalidations."""
+        return not self.enabled or self.backend.shared
+
+    # ---------------- keys / invalidation ---------------- #
+    def key(self, kind: str, scopes: Iterable[str], params: object) -> str:
+        scopes = [GLOBAL_SCOPE, *scopes]
+        gens = self.backend.get_counters([f"gen:{s}" for s in scopes])
+        digest = hashlib.blake2b(repr(params).encode(), digest_size=12).hexdigest()
+        return f"{kind}:{'.'.join(map(str, gens))}:{digest}"
+
+    def invalidate(self, scopes: Iterable[str]) -> None:
+        if not self.enabled:
+            return
+        for scope in set(scopes):
+            self.backend.incr(f"gen:{scope}")
+
+    def invalidate_posts(self, tag_names: Iterable[str], tags_changed: bool = False) -> None:
+        """A post with these tags (old ∪ new) was written."""
+        scopes = ["feed", *(f"tag:{name}" for name in tag_names)]
+        if tags_changed:
+            scopes.append("tags")
+        self.invalidate(scopes)
+
+    async def ainvalidate_posts(self, tag_names: Iterable[str], tags_changed: bool = False) -> None:
+        """`invalidate_posts` for the async crud: off the event loop with a network backend."""
+        if self.enabled:
+            await self._call(self.invalidate_posts, list(tag_names), tags_changed)
+
+    def clear(self) -> None:
+        """Drop everything (entries become unreachable and expire)."""
+        self.invalidate([GLOBAL_SCOPE])
+
+    # ---------------- lookups ---------------- #
+    def _lookup(self, key: str) -> Optional[CachedResponse]:
+        raw = self.backend.get(key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedResponse.loads(raw)
+
+    def _store(self, key: str, value: CachedResponse) -> None:
+        value.precompress(self.codecs, self.compress_min_size)
+        self.backend.set(key, value.dumps(), self.ttl)
+
+    def get_or_set(self, key: str, render: Callable[[], CachedResponse]) -> CachedResponse:
+        """Thread-based single-flight for the sync routes."""
+        if pinned_to_primary():
+            value = render()
+            self._store(key, value)
+            return value
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.event.wait()
+            # leader failed → render ourselves rather than share its error
+            return flight.value if flight.value is not None else render()
+
+        try:
+            flight.value = render()
+            self._store(key, flight.value)
+            return flight.value
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+
+    async def aget_or_set(
+        self, key: str, render: Callable[[], Awaitable[CachedResponse]]
+    ) -> CachedResponse:
+        """asyncio single-flight for the async routes."""
+        if pinned_to_primary():
+            value = await render()
+            await self._call(self._store, key, value)
+            return value
+        cached = await self._call(self._lookup, key)
+        if cached is not None:
+            return cached
+
+        flight = self._async_flights.get(key)
+        if flight is not None:
+            value = await asyncio.shield(flight)
+            # leader failed or was cancelled → render ourselves rather than share that
+            return value if value is not None else await render()
+
+        flight = self._async_flights[key] = asyncio.get_running_loop().create_future()
+        value: Optional[CachedResponse] = None
+        try:
+            value = await render()
+            await self._call(self._store, key, value)
+            return value
+        finally:
+            del self._async_flights[key]
+            flight.set_result(value)
+
+    async def akey(self, kind: str, scopes: Iterable[str], params: object) -> str:
+        return await self._call(self.key, kind, list(scopes), params)
+
+    async def _call(self, fn, *args):
+        if self.backend.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def build_response_cache(cfg: Settings = settings) -> ResponseCache:
+    backend = build_backend(
+        cfg.response_cache_backend,
+        redis_url=cfg.response_cache_redis_url,
+        max_entries=cfg.response_cache_max_entries,
+        ttl_seconds=cfg.response_cache_ttl_seconds,
+    )
+    if backend is not None and not backend.shared and cfg.web_concurrency > 1:
+        # a write invalidates only the worker that served it – the others
+        # would keep serving the old page until the TTL runs out
+        logger.warning(
+            "WEB_CONCURRENCY=%d with RESPONSE_CACHE_BACKEND=%s: response cache disabled, "
+            "use redis to cache across workers",
+            cfg.web_concurrency, cfg.response_cache_backend,
+        )
+        backend = None
+    return ResponseCache(
+        backend,
+        cfg.response_cache_ttl_seconds,
+        codecs=enabled_codecs(),
+        compress_min_size=cfg.compression_min_size,
+    )
+
+
+response_cache = build_response_cache()
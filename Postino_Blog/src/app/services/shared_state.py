@@ -0,0 +1,165 @@
+# src/app/services/shared_state.py
+"""
+Key/value + counter state shared by the request-path caches and limiters.
+
+* `MemoryBackend` – in-process LRU+TTL; fine for one worker, but every
+  worker of a multi-process deployment then has its own copy (cache
+  invalidations and counters do not reach the others)
+* `RedisBackend` – anything speaking the Redis protocol; the cross-process
+  backend for WEB_CONCURRENCY > 1. redis-py pools are fork-aware, so a
+  client built before the fork reconnects in each worker
+* `take(key, rate, burst)` is a token bucket: atomic in both backends (a
+  lock / a Lua script), so concurrent requests can't overspend it
+* `build_backend(kind, …)` – "memory" | "redis" | "none" → backend or None
+* `shared_state` – the SHARED_STATE_BACKEND instance for small per-client
+  marks and counters (read-your-writes, rate limits); the response cache
+  has its own, sized for bodies
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Optional, Protocol, Tuple
+
+from src.app.core.config import settings
+from src.app.utils.ttl_cache import TTLCache
+
+
+class StateBackend(Protocol):
+    blocking: bool      # True when calls do network IO
+    shared: bool        # True when every worker process sees the same state
+
+    def get(self, key: str) -> Optional[bytes]: ...
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None: ...
+    def get_counters(self, keys: List[str]) -> List[int]: ...
+    def incr(self, key: str) -> int: ...
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """Spend `cost` tokens if the bucket has them → (allowed, seconds until it would)."""
+        ...
+
+
+def _refill_seconds(rate: float, burst: float) -> int:
+    # an untouched bucket is full again after this; its state can expire then
+    return int(burst / rate) + 1
+
+
+class MemoryBackend:
+    blocking = False
+    shared = False
+
+    def __init__(self, max_entries: int, ttl_seconds: int) -> None:
+        self._values: TTLCache[str, bytes] = TTLCache(ttl_seconds, max_entries)
+        self._counters: Dict[str, int] = {}
+        self._buckets: TTLCache[str, Tuple[float, float]] = TTLCache(ttl_seconds, max_entries)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._values.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        self._values.set(key, value, ttl_seconds)
+
+    def get_counters(self, keys: List[str]) -> List[int]:
+        return [self._counters.get(k, 0) for k in keys]
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float]:
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(key) or (burst, now)
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets.set(key, (tokens, now), _refill_seconds(rate, burst))
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+
+# token bucket as a hash {t: tokens, ts: last update}; the server clock keeps
+# workers on different hosts consistent
+_TAKE = """
+local rate, burst, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1e6
+local state = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed, wait = 0, (cost - tokens) / rate
+if tokens >= cost then
+  tokens, allowed, wait = tokens - cost, 1, 0
+end
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+return {allowed, tostring(wait)}
+"""
+
+
+class RedisBackend:
+    """Works with redis-py or any client exposing get/set/mget/incr/register_script."""
+
+    blocking = True
+    shared = True
+
+    def __init__(self, client, prefix: str = "postino:rc:") -> None:
+        self._client = client
+        self._prefix = prefix
+        self._take = None
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "postino:rc:") -> "RedisBackend":
+        import redis    # optional dependency, only needed for this backend
+        return cls(redis.Redis.from_url(url), prefix)
+
+    @property
+    def client(self):
+        return self._client
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self._prefix + key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        self._client.set(self._prefix + key, value, ex=ttl_seconds)
+
+    def get_counters(self, keys: List[str]) -> List[int]:
+        values = self._client.mget([self._prefix + k for k in keys])
+        return [int(v) if v is not None else 0 for v in values]
+
+    def incr(self, key: str) -> int:
+        return int(self._client.incr(self._prefix + key))
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float]:
+        if self._take is None:
+            self._take = self._client.register_script(_TAKE)
+        allowed, wait = self._take(keys=[self._prefix + key],
+                                   args=[rate, burst, cost, _refill_seconds(rate, burst)])
+        return bool(allowed), float(wait)
+
+
+def build_backend(
+    kind: str,
+    *,
+    redis_url: str,
+    max_entries: int,
+    ttl_seconds: int,
+    prefix: str = "postino:rc:",
+) -> Optional[StateBackend]:
+    if kind == "memory":
+        return MemoryBackend(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    if kind == "redis":
+        return RedisBackend.from_url(redis_url, prefix)
+    return None
+
+
+shared_state = build_backend(
+    settings.shared_state_backend,
+    redis_url=settings.shared_state_redis_url,
+    max_entries=settings.shared_state_max_entries,
+    ttl_seconds=60,         # every caller passes its own TTL
+    prefix="postino:st:",
+)
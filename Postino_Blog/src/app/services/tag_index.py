@@ -0,0 +1,94 @@
+# src/app/services/tag_index.py
+"""
+In-process, sorted snapshot of every tag with its `tag_stats` counters.
+
+Serves the tag cloud and prefix autocomplete without touching the tags
+table: a prefix lookup is a bisect over casefolded names, and the three
+orderings are sorted once per snapshot, not per request.
+
+The snapshot is tagged with the DB-side tags version (the `tag_generation`
+counter every tag_stats change bumps, see `tag_crud.tag_usage_stmts`);
+readers compare versions and reload only when a write changed tags or
+counts, in this worker or any other.
+"""
+
+from __future__ import annotations
+
+import threading
+import unicodedata
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional
+
+ORDERS = ("name", "popular", "recent")
+
+
+class TagEntry(NamedTuple):
+    name: str
+    post_count: int
+    last_used_at: Optional[datetime]
+
+
+def fold(text: str) -> str:
+    """Key for case-insensitive prefix matching (NFC, like stored names)."""
+    return unicodedata.normalize("NFC", text).casefold()
+
+
+def _popular_key(e: TagEntry):
+    return (-e.post_count, e.name)
+
+
+def _recent_key(e: TagEntry):
+    # never-used tags last; a plain timestamp works for naive and aware values
+    return (e.last_used_at is None, -(e.last_used_at.timestamp() if e.last_used_at else 0), e.name)
+
+
+class TagIndex:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.version: Optional[Hashable] = None
+        self._keys: List[str] = []
+        self._by_key: List[TagEntry] = []
+        self._ordered: Dict[str, List[TagEntry]] = {order: [] for order in ORDERS}
+
+    def is_current(self, version: Hashable) -> bool:
+        return self.version is not None and self.version == version
+
+    def load(self, version: Hashable, entries: Iterable[TagEntry]) -> None:
+        entries = [TagEntry(*e) for e in entries]
+        by_key = sorted(entries, key=lambda e: (fold(e.name), e.name))
+        ordered = {
+            "name": sorted(entries, key=lambda e: e.name),
+            "popular": sorted(entries, key=_popular_key),
+            "recent": sorted(entries, key=_recent_key),
+        }
+        with self._lock:                 # swap everything at once for readers
+            self._keys = [fold(e.name) for e in by_key]
+            self._by_key = by_key
+            self._ordered = ordered
+            self.version = version
+
+    def query(
+        self, prefix: Optional[str] = None, order: str = "name", limit: Optional[int] = None
+    ) -> List[TagEntry]:
+        with self._lock:
+            keys, by_key, ordered = self._keys, self._by_key, self._ordered[order]
+        if not prefix:
+            return ordered[:limit] if limit else list(ordered)
+
+        wanted = fold(prefix)
+        start = bisect_left(keys, wanted)
+        end = start
+        while end < len(keys) and keys[end].startswith(wanted):
+            end += 1
+        matches = by_key[start:end]
+        if order == "popular":
+            matches.sort(key=_popular_key)
+        elif order == "recent":
+            matches.sort(key=_recent_key)
+        else:
+            matches.sort(key=lambda e: e.name)
+        return matches[:limit] if limit else matches
+
+
+tag_index = TagIndex()
@@ -0,0 +1,71 @@
+# src/app/tasks/bootstrap.py
+"""
+One-shot deploy step: migrate the database, create the MinIO bucket and the
+default user.
+
+    python -m src.app.tasks.bootstrap [--skip-migrations] [--skip-storage] [--skip-user]
+
+Run it once per deploy (before starting the workers) and set
+DB_AUTO_MIGRATE=false, DEFAULT_USER_ON_STARTUP=false and
+MINIO_BOOTSTRAP_ON_FIRST_USE=false, so worker processes start without any
+DDL, bcrypt or storage round trips. Every step is idempotent.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+from src.app.core.config import settings
+from src.app.crud.user_crud import create_user, get_user_by_username
+from src.app.database.database import SessionLocal
+from src.app.database.migrations import upgrade_to_head
+from src.app.schemas.user_schema import UserCreate
+from src.app.services.registry import services
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_default_user() -> bool:
+    """Create DEFAULT_USER_EMAIL if missing (bcrypt only then); True if created."""
+    db = SessionLocal()
+    try:
+        email = settings.default_user_email
+        if get_user_by_username(db, email):
+            return False
+        create_user(db, UserCreate(username=email, email=email,
+                                   password=settings.default_user_password))
+        return True
+    finally:
+        db.close()
+
+
+def ensure_bucket() -> None:
+    services.storage().ensure_buckets([settings.minio_bucket])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--skip-migrations", action="store_true")
+    parser.add_argument("--skip-storage", action="store_true")
+    parser.add_argument("--skip-user", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    steps = [
+        ("migrations", args.skip_migrations, upgrade_to_head),
+        ("storage", args.skip_storage, ensure_bucket),
+        ("default user", args.skip_user, ensure_default_user),
+    ]
+    for name, skip, step in steps:
+        if skip:
+            continue
+        started = time.perf_counter()
+        step()
+        logger.info("Bootstrap: %s done in %.2fs", name, time.perf_counter() - started)
+    services.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# src/app/tasks/image_processing.py
+"""
+Post-upload image processing, run as a FastAPI background task after the
+create/update response has gone out.
+
+original  abc123.jpg
+variants  abc123_w320.webp, abc123_w768.webp, abc123_w1280.webp
+          (EXIF stripped, orientation applied, never upscaled)
+
+The result is written to `Post.image_meta`, which `PostOut` exposes as
+`image_variants` / `image_width` / `image_height` / `image_blurhash`.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import List
+
+from src.app.core.config import settings
+from src.app.database.database import SessionLocal
+from src.app.models.post_model import Post
+from src.app.services.response_cache import response_cache
+from src.app.utils.file import get_bytes, object_name_from_url, put_bytes
+from src.app.utils.image_variants import process_image
+
+logger = logging.getLogger(__name__)
+
+
+def _csv(raw: str) -> List[str]:
+    return [part.strip() for part in raw.split(",") if part.strip()]
+
+
+def build_image_meta(image_url: str) -> dict:
+    """Download the original, render + upload its variants, return the meta dict."""
+    object_name = object_name_from_url(image_url)
+    stem = object_name.rsplit(".", 1)[0]
+
+    processed = process_image(
+        get_bytes(object_name),
+        widths=[int(w) for w in _csv(settings.image_variant_widths)],
+        formats=[f.lower() for f in _csv(settings.image_variant_formats)],
+        quality=settings.image_variant_quality,
+    )
+    variants = [
+        {
+            "url": put_bytes(f"{stem}_w{v.width}.{v.format}", v.data, v.content_type),
+            "width": v.width,
+            "height": v.height,
+            "format": v.format,
+        }
+        for v in processed.variants
+    ]
+    return {
+        "width": processed.width,
+        "height": processed.height,
+        "blurhash": processed.blurhash,
+        "variants": variants,
+    }
+
+
+def process_post_image(post_id: int, image_url: str) -> None:
+    """Background entry point; failures are logged, the original stays served."""
+    if not settings.image_processing_enabled:
+        return
+    try:
+        meta = build_image_meta(image_url)
+    except Exception:
+        logger.exception("image processing failed for post %s (%s)", post_id, image_url)
+        return
+
+    db = SessionLocal()
+    try:
+        post = db.get(Post, post_id)
+        # the image may have been replaced while we were working
+        if post is None or post.image_url != image_url:
+            return
+        post.image_meta = meta
+        db.commit()
+        response_cache.invalidate_posts([t.name for t in post.tags])
+    finally:
+        db.close()
@@ -0,0 +1,44 @@
+# src/app/tasks/rebuild_search_index.py
+"""
+Rebuild the posts full-text index from the posts table.
+
+    python -m src.app.tasks.rebuild_search_index [--recreate]
+
+Needed after loading rows with the triggers disabled, after restoring a
+database without its FTS table, or (with --recreate) after changing
+SEARCH_SQLITE_TOKENIZER. Normal writes keep the index in sync on their own.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+from src.app.database.database import engine
+from src.app.database.fulltext import rebuild_fulltext
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--recreate",
+        action="store_true",
+        help="drop and recreate the SQLite FTS table (tokenizer change)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        rebuild_fulltext(connection, recreate=args.recreate)
+    logger.info(
+        "Rebuilt search index on %s in %.1fs",
+        engine.dialect.name, time.perf_counter() - started,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# src/app/testing/pytest_plugin.py
+"""
+pytest plugin: statement budgets for routes.
+
+Enable it from a conftest.py (the app's settings must be importable) –
+tests/conftest.py does, and tests/test_query_budgets.py holds the budgets of
+the feed and the tag list:
+
+    pytest_plugins = ["src.app.testing.pytest_plugin"]
+
+    def test_feed_budget(client, query_budget):
+        with query_budget(3):
+            client.get("/api/v1/posts/")
+
+    @pytest.mark.query_budget(2)
+    def test_tags_budget(client):
+        client.get("/api/v1/posts/tags")
+
+A block (or a marked test) fails when it runs more than `max_queries`
+statements, or when one statement shape repeats `n_plus_one` times or more
+(default: N_PLUS_ONE_THRESHOLD); the failure lists every statement. The
+marker covers the test body only, not fixture setup.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator, Optional
+
+import pytest
+
+from src.app.database.query_log import QueryLog, capture_queries, install_query_log
+
+
+def _install() -> None:
+    from src.app.core.config import settings
+    from src.app.database.database import engine
+
+    install_query_log(engine)
+    if settings.database_mode == "async":
+        from src.app.database.async_database import get_async_engine
+        install_query_log(get_async_engine().sync_engine)
+
+
+def check_budget(log: QueryLog, max_queries: int, n_plus_one: Optional[int] = None) -> None:
+    from src.app.core.config import settings
+
+    threshold = n_plus_one if n_plus_one is not None else settings.n_plus_one_threshold
+    problems = []
+    if len(log) > max_queries:
+        problems.append(f"{len(log)} statements, budget is {max_queries}")
+    problems += [f"{count}× the same statement (N+1?): {shape[:200]}"
+                 for shape, count in log.repeated(threshold)]
+    if problems:
+        pytest.fail("\n".join(problems) + "\n" + log.report(), pytrace=False)
+
+
+@contextmanager
+def _budget(max_queries: int, n_plus_one: Optional[int] = None) -> Iterator[QueryLog]:
+    with capture_queries() as log:
+        yield log
+    check_budget(log, max_queries, n_plus_one)
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "query_budget(max_queries, n_plus_one=None): fail on more DB statements"
+    )
+
+
+@pytest.fixture
+def query_budget() -> Callable[..., ContextManager[QueryLog]]:
+    _install()
+    return _budget
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: pytest.Item):
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+    _install()
+    with capture_queries() as log:
+        result = yield          # a failing test raises here; no budget check
+    check_budget(log, *marker.args, **marker.kwargs)
+    return result
@@ -0,0 +1,157 @@
+# src/app/utils/compression.py
+"""
+Content-Encoding codecs and Accept-Encoding negotiation.
+
+gzip is always available; `br` needs the `brotli` package and `zstd` the
+`zstandard` package (both optional, see requirements.txt). Codecs whose
+package isn't installed are skipped, so COMPRESSION_ENCODINGS can list them
+unconditionally.
+"""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Protocol
+
+from src.app.core.config import settings
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class StreamCompressor(Protocol):
+    def compress(self, chunk: bytes) -> bytes: ...   # output is flushed per chunk
+    def finish(self) -> bytes: ...
+
+
+class Codec(NamedTuple):
+    name: str
+    compress: Callable[[bytes], bytes]
+    stream: Callable[[], StreamCompressor]
+
+
+# ---------------- gzip ---------------- #
+class _GzipStream:
+    def __init__(self, level: int) -> None:
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)   # 31 → gzip container
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._obj.compress(chunk) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+def _gzip(level: int) -> Codec:
+    return Codec(
+        "gzip",
+        lambda data: gzip.compress(data, compresslevel=level, mtime=0),
+        lambda: _GzipStream(level),
+    )
+
+
+# ---------------- brotli ---------------- #
+def _brotli(quality: int) -> Optional[Codec]:
+    try:
+        import brotli
+    except ImportError:
+        return None
+
+    class _BrotliStream:
+        def __init__(self) -> None:
+            self._obj = brotli.Compressor(quality=quality)
+
+        def compress(self, chunk: bytes) -> bytes:
+            return self._obj.process(chunk) + self._obj.flush()
+
+        def finish(self) -> bytes:
+            return self._obj.finish()
+
+    return Codec("br", lambda data: brotli.compress(data, quality=quality), _BrotliStream)
+
+
+# ---------------- zstd ---------------- #
+def _zstd(level: int) -> Optional[Codec]:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+
+    cctx = zstandard.ZstdCompressor(level=level)
+
+    class _ZstdStream:
+        def __init__(self) -> None:
+            self._obj = cctx.compressobj()
+
+        def compress(self, chunk: bytes) -> bytes:
+            return self._obj.compress(chunk) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+        def finish(self) -> bytes:
+            return self._obj.flush()
+
+    return Codec("zstd", cctx.compress, _ZstdStream)
+
+
+# ---------------- registry ---------------- #
+@lru_cache
+def enabled_codecs() -> Dict[str, Codec]:
+    """Installed codecs from COMPRESSION_ENCODINGS, in server preference order."""
+    if not settings.compression_enabled:
+        return {}
+    factories = {
+        "br": lambda: _brotli(settings.compression_brotli_quality),
+        "zstd": lambda: _zstd(settings.compression_zstd_level),
+        "gzip": lambda: _gzip(settings.compression_gzip_level),
+    }
+    codecs: Dict[str, Codec] = {}
+    for name in (n.strip() for n in settings.compression_encodings.split(",")):
+        codec = factories[name]() if name in factories else None
+        if codec is not None:
+            codecs[name] = codec
+    return codecs
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def negotiate(accept_encoding: Optional[str], available: Iterable[str]) -> Optional[str]:
+    """
+    Pick the first of ``available`` (server preference) that the client
+    accepts with q > 0; ``*`` covers codings the header doesn't name.
+    """
+    if not accept_encoding:
+        return None
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[name.strip().lower()] = q
+    wildcard = qualities.get("*", 0.0)
+    for name in available:
+        if qualities.get(name, wildcard) > 0:
+            return name
+    return None
+
+
+def add_vary(headers: Dict[str, str]) -> Dict[str, str]:
+    vary = headers.get("Vary")
+    if not vary:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+    return headers
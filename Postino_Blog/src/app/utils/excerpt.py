@@ -0,0 +1,24 @@
+# src/app/utils/excerpt.py
+"""Teaser text stored in `posts.excerpt`, so list views never read `content`."""
+
+from __future__ import annotations
+
+import re
+
+_WS = re.compile(r"\s+")
+_TRAILING = " .,;:!?،؛"
+
+
+def make_excerpt(content: str, max_chars: int) -> str:
+    """
+    First ``max_chars`` characters of ``content`` with whitespace collapsed,
+    cut at a word boundary when one is reasonably close, ``…`` if shortened.
+    """
+    text = _WS.sub(" ", content or "").strip()
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    space = cut.rfind(" ")
+    if space > max_chars // 2:
+        cut = cut[:space]
+    return cut.rstrip(_TRAILING) + "…"
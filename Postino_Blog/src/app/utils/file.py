@@ -2,37 +2,87 @@
 """
 Save images (FastAPI/Starlette UploadFile _or_ raw bytes) to MinIO
 and return the object URLs.
+
+Uploads are streamed: the file is read in `minio_part_size` chunks and
+sent as a single PUT when it fits in one part, as a multipart upload
+otherwise. All MinIO calls run on a bounded executor with its own
+connection pool, so `save_image_async` / `save_multiple_images_async`
+never block the event loop and a burst of uploads can't exhaust the
+request threadpool. Client and executor come from services/registry.py
+and are created on first use.
 """
 
 from __future__ import annotations
 
-import os
+import asyncio
+import time
 import uuid
 from io import BytesIO
-from typing import Optional, Union, List
+from typing import BinaryIO, Optional, Tuple, Union, List
 
 from fastapi import UploadFile, HTTPException
 from starlette.datastructures import UploadFile as StarletteUploadFile
 from minio.error import S3Error
 
 from src.app.core.config import settings
-from src.app.services.minio_client import MinioClient
-
-# --------------------------------------------------------------------- #
-# Shared MinIO SDK client
-# --------------------------------------------------------------------- #
-_minio = MinioClient(
-    url=settings.minio_endpoint,
-    access_key=settings.minio_root_user,
-    secret_key=settings.minio_root_password,
-    buckets=[settings.minio_bucket],
-    secure=False,
-).client
-
-
-def save_image(
-        image: Union[UploadFile, StarletteUploadFile, bytes, None]
-) -> Optional[str]:
+from src.app.services.metrics import storage_upload_bytes, storage_uploads, timed
+from src.app.services.registry import services
+
+ImageInput = Union[UploadFile, StarletteUploadFile, bytes, None]
+
+
+class _LimitedReader:
+    """File-like wrapper that refuses to read past `limit` bytes."""
+
+    def __init__(self, stream: BinaryIO, limit: int) -> None:
+        self._stream = stream
+        self._remaining = limit
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._remaining + 1
+        data = self._stream.read(min(size, self._remaining + 1))
+        self._remaining -= len(data)
+        self.bytes_read += len(data)
+        if self._remaining < 0:
+            raise HTTPException(413, f"Image exceeds {settings.image_max_bytes} bytes")
+        return data
+
+
+def object_url(object_name: str) -> str:
+    return f"http://{settings.minio_endpoint}/{settings.minio_bucket}/{object_name}"
+
+
+def object_name_from_url(url: str) -> str:
+    return url.rsplit("/", 1)[-1]
+
+
+def put_bytes(object_name: str, data: bytes, content_type: str) -> str:
+    """Upload an in-memory object (e.g. a generated variant); returns its URL."""
+    try:
+        services.minio.put_object(
+            bucket_name=settings.minio_bucket,
+            object_name=object_name,
+            data=BytesIO(data),
+            length=len(data),
+            content_type=content_type,
+        )
+    except S3Error as err:
+        raise HTTPException(500, f"Image upload failed: {err}")
+    return object_url(object_name)
+
+
+def get_bytes(object_name: str) -> bytes:
+    response = services.minio.get_object(settings.minio_bucket, object_name)
+    try:
+        return response.read()
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def save_image(image: ImageInput) -> Optional[str]:
     """
     Accept either:
     • FastAPI / Starlette UploadFile
@@ -40,18 +90,33 @@ def save_image(
     • `None`  → returns None
 
     Uploads the file to MinIO and returns the public URL.
+    Blocking; runs the upload on the shared upload executor.
     """
     if image is None:
         return None
+    with timed("storage"):
+        return services.upload_executor.submit(_upload, image).result()
+
+
+def _upload(image: ImageInput) -> str:
+    started = time.perf_counter()
+    url, size = _put_image(image)
+    storage_uploads.observe(time.perf_counter() - started)
+    storage_upload_bytes.observe(size)
+    return url
+
 
+def _put_image(image: ImageInput) -> Tuple[str, int]:
     # ------------------------------------------------------ #
     # Handle any UploadFile‑like object (FastAPI or Starlette)
     # ------------------------------------------------------ #
     if hasattr(image, "file"):
-        stream = image.file
-        stream.seek(0, os.SEEK_END)
-        length = stream.tell()
-        stream.seek(0)
+        # size is known for Starlette uploads; -1 lets MinIO read to EOF
+        length = getattr(image, "size", None)
+        if length is not None and length > settings.image_max_bytes:
+            raise HTTPException(413, f"Image exceeds {settings.image_max_bytes} bytes")
+        image.file.seek(0)
+        stream = _LimitedReader(image.file, settings.image_max_bytes)
 
         ext = (
             image.filename.rsplit(".", 1)[-1]
@@ -60,11 +125,14 @@ def save_image(
         )
         object_name = f"{uuid.uuid4().hex}.{ext}"
         content_type = getattr(image, "content_type", None) or "application/octet-stream"
+        length = -1 if length is None else length
 
     # ----------------- raw bytes --------------------------- #
     else:
         if not isinstance(image, (bytes, bytearray)):
             raise HTTPException(400, "Expected file upload or bytes")
+        if len(image) > settings.image_max_bytes:
+            raise HTTPException(413, f"Image exceeds {settings.image_max_bytes} bytes")
         stream = BytesIO(image)
         length = len(image)
         object_name = f"{uuid.uuid4().hex}.jpg"
@@ -72,41 +140,44 @@ def save_image(
 
     # ----------------- upload to MinIO --------------------- #
     try:
-        _minio.put_object(
+        services.minio.put_object(
             bucket_name=settings.minio_bucket,
             object_name=object_name,
             data=stream,
             length=length,
             content_type=content_type,
+            part_size=settings.minio_part_size,
+            num_parallel_uploads=settings.minio_parallel_parts,
         )
     except S3Error as err:
         raise HTTPException(500, f"Image upload failed: {err}")
 
-    return f"http://{settings.minio_endpoint}/{settings.minio_bucket}/{object_name}"
+    size = length if length >= 0 else getattr(stream, "bytes_read", 0)
+    return object_url(object_name), size
+
+
+async def save_image_async(image: ImageInput) -> Optional[str]:
+    """`save_image` without blocking the event loop."""
+    if image is None:
+        return None
+    with timed("storage"):
+        return await asyncio.wrap_future(services.upload_executor.submit(_upload, image))
 
 
-def save_multiple_images(
-        images: List[Union[UploadFile, StarletteUploadFile, bytes, None]]
-) -> List[str]:
+def save_multiple_images(images: List[ImageInput]) -> List[str]:
     """
     Save multiple images and return a list of their URLs.
-    Skips any None values.
+    Skips any None values. Uploads run concurrently.
     """
-    if not images:
-        return []
-
-    # Filter out None values
-    valid_images = [img for img in images if img is not None]
-
-    # Handle case of all None values
-    if not valid_images:
-        return []
-
-    # Save each valid image and collect URLs
-    image_urls = []
-    for image in valid_images:
-        url = save_image(image)
-        if url:
-            image_urls.append(url)
-
-    return image_urls
\ No newline at end of file
+    valid_images = [img for img in images or [] if img is not None]
+    with timed("storage"):
+        futures = [services.upload_executor.submit(_upload, img) for img in valid_images]
+        return [url for url in (f.result() for f in futures) if url]
+
+
+async def save_multiple_images_async(images: List[ImageInput]) -> List[str]:
+    valid_images = [img for img in images or [] if img is not None]
+    futures = [services.upload_executor.submit(_upload, img) for img in valid_images]
+    with timed("storage"):
+        urls = await asyncio.gather(*map(asyncio.wrap_future, futures))
+    return [url for url in urls if url]
@@ -0,0 +1,91 @@
+# src/app/utils/http_cache.py
+"""
+HTTP validators for the read endpoints.
+
+Routes compute an ETag (and, where one exists, a Last-Modified) from a
+cheap version query, answer 304 straight away when the client's copy is
+current, and only then load + serialize the full body.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+from src.app.core.config import settings
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def cache_control() -> str:
+    directives = [
+        "public" if settings.http_cache_public else "private",
+        f"max-age={settings.http_cache_max_age}",
+    ]
+    if settings.http_cache_stale_while_revalidate:
+        directives.append(f"stale-while-revalidate={settings.http_cache_stale_while_revalidate}")
+    return ", ".join(directives)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive UTC timestamps (CURRENT_TIMESTAMP)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def last_modified_of(*stamps: Optional[datetime]) -> Optional[datetime]:
+    present = [_as_utc(s) for s in stamps if s is not None]
+    return max(present).replace(microsecond=0) if present else None
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": cache_control()}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # weak comparison (RFC 9110 §8.8.3.2): ignore the W/ prefix
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def is_conditional(request: Request) -> bool:
+    headers = request.headers
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """If-None-Match wins; If-Modified-Since is only consulted without it."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = _as_utc(parsedate_to_datetime(if_modified_since))
+        except (TypeError, ValueError):
+            return False
+        return last_modified <= since
+    return False
+
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
+
+
+def apply_headers(response: Response, headers: Dict[str, str]) -> None:
+    for key, value in headers.items():
+        response.headers[key] = value
@@ -0,0 +1,167 @@
+# src/app/utils/image_variants.py
+"""
+Pure image work for the processing task: decode once, fix orientation,
+drop EXIF/ICC metadata, emit resized WebP (or AVIF, when Pillow has it)
+variants and a BlurHash placeholder.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from io import BytesIO
+from typing import List, Sequence
+
+from PIL import Image, ImageOps
+
+_CONTENT_TYPES = {"webp": "image/webp", "avif": "image/avif", "jpeg": "image/jpeg"}
+
+
+@dataclass
+class EncodedVariant:
+    width: int
+    height: int
+    format: str
+    content_type: str
+    data: bytes
+
+
+@dataclass
+class ProcessedImage:
+    width: int
+    height: int
+    blurhash: str
+    variants: List[EncodedVariant]
+
+
+def format_supported(fmt: str) -> bool:
+    """True when this Pillow build can write `fmt` (AVIF needs a recent build)."""
+    Image.init()
+    return fmt in _CONTENT_TYPES and fmt.upper() in Image.SAVE
+
+
+def process_image(
+    raw: bytes,
+    widths: Sequence[int],
+    formats: Sequence[str] = ("webp",),
+    quality: int = 80,
+) -> ProcessedImage:
+    with Image.open(BytesIO(raw)) as src:
+        img = ImageOps.exif_transpose(src)      # bake in orientation before EXIF goes
+        img = img.convert("RGBA" if _has_alpha(img) else "RGB")
+
+    width, height = img.size
+    variants: List[EncodedVariant] = []
+    # never upscale; the largest requested width that fits is capped at the original
+    targets = sorted({min(w, width) for w in widths if w > 0})
+    for fmt in [f for f in formats if format_supported(f)]:
+        for target in targets:
+            resized = _resize_to_width(img, target)
+            variants.append(_encode(resized, fmt, quality))
+
+    return ProcessedImage(
+        width=width,
+        height=height,
+        blurhash=blurhash_encode(img),
+        variants=variants,
+    )
+
+
+def _has_alpha(img: Image.Image) -> bool:
+    return img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+
+
+def _resize_to_width(img: Image.Image, width: int) -> Image.Image:
+    if width >= img.width:
+        return img
+    height = max(1, round(img.height * width / img.width))
+    return img.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def _encode(img: Image.Image, fmt: str, quality: int) -> EncodedVariant:
+    if fmt == "jpeg" and img.mode != "RGB":
+        img = img.convert("RGB")
+    options = {"quality": quality}
+    if fmt == "webp":
+        options["method"] = 4       # speed/size trade-off
+    buf = BytesIO()
+    # a fresh save carries no EXIF/XMP unless passed explicitly
+    img.save(buf, format=fmt.upper(), **options)
+    return EncodedVariant(
+        width=img.width,
+        height=img.height,
+        format=fmt,
+        content_type=_CONTENT_TYPES[fmt],
+        data=buf.getvalue(),
+    )
+
+
+# --------------------------------------------------------------------- #
+# BlurHash (https://blurha.sh) – encoder only
+# --------------------------------------------------------------------- #
+_B83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def _encode83(value: int, length: int) -> str:
+    return "".join(_B83[(value // 83 ** (length - i - 1)) % 83] for i in range(length))
+
+
+def _srgb_to_linear(value: int) -> float:
+    v = value / 255
+    return v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value: float) -> int:
+    v = min(1.0, max(0.0, value))
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value: float, exp: float) -> float:
+    return math.copysign(abs(value) ** exp, value)
+
+
+def blurhash_encode(img: Image.Image, x_components: int = 4, y_components: int = 3) -> str:
+    # components only need a thumbnail's worth of pixels
+    small = img.convert("RGB")
+    small.thumbnail((32, 32))
+    w, h = small.size
+    pixels = [tuple(_srgb_to_linear(c) for c in px) for px in small.getdata()]
+    cos_x = [[math.cos(math.pi * i * x / w) for x in range(w)] for i in range(x_components)]
+    cos_y = [[math.cos(math.pi * j * y / h) for y in range(h)] for j in range(y_components)]
+
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            norm = 1 if i == 0 and j == 0 else 2
+            r = g = b = 0.0
+            for y in range(h):
+                cy = cos_y[j][y]
+                row = y * w
+                for x in range(w):
+                    basis = cos_x[i][x] * cy
+                    pr, pg, pb = pixels[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = norm / (w * h)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _encode83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        actual_max = max(abs(c) for f in ac for c in f)
+        quantised_max = max(0, min(82, int(actual_max * 166 - 0.5)))
+        max_value = (quantised_max + 1) / 166
+        result += _encode83(quantised_max, 1)
+    else:
+        max_value = 1.0
+        result += _encode83(0, 1)
+
+    dc_value = (_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2])
+    result += _encode83(dc_value, 4)
+    for f in ac:
+        q = [max(0, min(18, int(_sign_pow(c / max_value, 0.5) * 9 + 9.5))) for c in f]
+        result += _encode83(q[0] * 19 * 19 + q[1] * 19 + q[2], 2)
+    return result
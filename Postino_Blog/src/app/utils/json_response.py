@@ -0,0 +1,38 @@
+# src/app/utils/json_response.py
+"""
+JSON responses encoded once, by pydantic-core.
+
+Returning model objects from a route makes FastAPI validate them against
+`response_model` again and encode the result with the stdlib `json` module.
+Returning a `Response` skips both; `response_model` still documents the
+route in OpenAPI.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from src.app.services.metrics import serialize_duration, timed
+
+
+class PydanticJSONResponse(Response):
+    media_type = "application/json"
+
+
+def encode_json(adapter: TypeAdapter, value: Any) -> bytes:
+    """`adapter.dump_json`, timed as the request's "serialize" phase."""
+    with timed("serialize", serialize_duration):
+        return adapter.dump_json(value)
+
+
+def json_response(
+    adapter: TypeAdapter,
+    value: Any,
+    headers: Optional[Mapping[str, str]] = None,
+    status_code: int = 200,
+) -> PydanticJSONResponse:
+    """`value` must already be of the adapter's type (built by our helpers)."""
+    return PydanticJSONResponse(encode_json(adapter, value), status_code=status_code, headers=headers)
@@ -0,0 +1,55 @@
+# src/app/utils/ndjson.py
+"""
+Newline-delimited JSON over a streamed request body.
+
+Lines are cut from the incoming chunks as they arrive, so a multi-GB import
+never sits in memory; only the current (bounded) line does.
+"""
+
+from __future__ import annotations
+
+from typing import AsyncIterator, Optional, Tuple
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Yield ``(line_number, line)`` for every non-blank line (1-based).
+    ``line`` is None when the line exceeded ``max_line_bytes``; the rest of
+    it is skipped, the stream continues with the next line.
+    """
+    buffer = bytearray()
+    line_no = 0
+    oversized = False
+
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end == -1:
+                if not oversized:
+                    buffer += chunk[start:]
+                    if len(buffer) > max_line_bytes:
+                        oversized = True
+                        buffer.clear()
+                break
+            line_no += 1
+            if oversized:
+                yield line_no, None
+            else:
+                buffer += chunk[start:end]
+                if len(buffer) > max_line_bytes:
+                    yield line_no, None
+                elif buffer.strip():
+                    yield line_no, bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+
+    if oversized:
+        yield line_no + 1, None
+    elif buffer.strip():
+        yield line_no + 1, bytes(buffer)
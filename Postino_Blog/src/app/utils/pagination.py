@@ -0,0 +1,79 @@
+# src/app/utils/pagination.py
+"""
+Opaque keyset cursors for the post feed.
+
+A cursor encodes the ``(created_at, id)`` of the last row on a page, so the
+next page is a range scan on ``ix_posts_created_at_id`` instead of an OFFSET
+that grows with the page number.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Tuple
+
+from sqlalchemy import String, literal
+
+
+def _dump(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _load(cursor: str) -> dict:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(created_at: datetime, post_id: int) -> str:
+    return _dump({"c": created_at.isoformat(), "i": post_id})
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Raise ``ValueError`` for anything that is not a cursor we issued."""
+    try:
+        data = _load(cursor)
+        return datetime.fromisoformat(data["c"]), int(data["i"])
+    except (KeyError, TypeError, ValueError) as err:
+        raise ValueError("Invalid cursor") from err
+
+
+def encode_rank_cursor(rank_key: int, post_id: int) -> str:
+    """Cursor for relevance-ordered results (search), keyed on (integer rank key, id)."""
+    return _dump({"r": rank_key, "i": post_id})
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        data = _load(cursor)
+        if not isinstance(data["r"], int):
+            raise TypeError("rank key must be an integer")
+        return data["r"], int(data["i"])
+    except (KeyError, TypeError, ValueError) as err:
+        raise ValueError("Invalid cursor") from err
+
+
+def sqlite_timestamp(value: datetime) -> str:
+    """
+    ``value`` as text in the form SQLite's ``CURRENT_TIMESTAMP`` produces
+    (UTC, no ``.ffffff`` suffix for whole seconds).
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    fmt = "%Y-%m-%d %H:%M:%S.%f" if value.microsecond else "%Y-%m-%d %H:%M:%S"
+    return value.strftime(fmt)
+
+
+def created_at_param(dialect_name: str, value: datetime):
+    """
+    Bind value for comparing against ``posts.created_at``.
+
+    SQLite keeps ``CURRENT_TIMESTAMP`` as ``YYYY-MM-DD HH:MM:SS`` text, while
+    SQLAlchemy would bind a datetime with a ``.ffffff`` suffix; the two don't
+    compare equal, so bind the text form the column actually holds.
+    """
+    if dialect_name == "sqlite":
+        return literal(sqlite_timestamp(value), String)
+    return value
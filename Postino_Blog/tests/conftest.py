@@ -0,0 +1,78 @@
+# tests/conftest.py
+"""
+Test session setup.
+
+Settings are read when `src.app` is first imported, so the environment is
+set here, before anything else: a throw-away SQLite database, the response
+cache and rate limiting off (tests assert on what the DB does), FEED_MAX_LIMIT
+below the default page size of 100 (test_load_shedding.py), and the
+in-process MinIO stand-in of benchmarks/fake_minio.py instead of a server.
+DATABASE_MODE is left alone – CI runs the suite in both modes.
+"""
+
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="postino-tests-")
+
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(_DB_DIR, 'postino.db')}",
+    SECRET_KEY="tests-secret-key-0123456789abcdef",
+    ALGORITHM="HS256",
+    ACCESS_TOKEN_EXPIRE_MINUTES="30",
+    DEFAULT_USER_EMAIL="admin@example.com",
+    DEFAULT_USER_PASSWORD="admin-password",
+    MINIO_ENDPOINT="minio.test:9000",
+    MINIO_ROOT_USER="postino",
+    MINIO_ROOT_PASSWORD="postino-password",
+    MINIO_BUCKET="postino-test",
+    RESPONSE_CACHE_BACKEND="none",
+    RATE_LIMIT_ENABLED="false",
+    FEED_MAX_LIMIT="80",
+)
+
+from typing import Callable, List, Optional  # noqa: E402
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from benchmarks import fake_minio  # noqa: E402
+
+fake_minio.install()
+
+pytest_plugins = ["src.app.testing.pytest_plugin"]
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    from src.app.main import app
+
+    with TestClient(app) as test_client:      # runs the lifespan: migrations, default user
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client: TestClient) -> dict:
+    login = client.post(
+        "/api/v1/auth/login",
+        data={"username": os.environ["DEFAULT_USER_EMAIL"],
+              "password": os.environ["DEFAULT_USER_PASSWORD"]},
+    )
+    login.raise_for_status()
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def add_posts(client: TestClient) -> Callable[..., int]:
+    """`add_posts(n, tags=["a", "b"])` → inserts n posts through the bulk-import crud."""
+    from src.app.crud import post_crud
+    from src.app.database.database import SessionLocal
+    from src.app.schemas.post_schema import PostImportRow
+
+    def add(n: int, tags: Optional[List[str]] = None) -> int:
+        rows = [PostImportRow(title=f"post {i}", content=f"content of post {i}", tags=tags or [])
+                for i in range(n)]
+        with SessionLocal() as db:
+            return post_crud.import_posts(db, rows)
+
+    return add
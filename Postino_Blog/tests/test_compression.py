@@ -0,0 +1,178 @@
+"""Accept-Encoding negotiation, CompressionMiddleware and pre-compressed cache entries."""
+
+import asyncio
+import gzip
+import json
+import zlib
+
+import pytest
+from fastapi import Request
+
+from src.app.middleware.compression import CompressionMiddleware
+from src.app.services.response_cache import CachedResponse
+from src.app.utils.compression import Codec, _gzip, add_vary, negotiate
+
+GZIP = _gzip(6)
+# stand-in second codec, so preference order is observable without brotli / zstandard
+REVERSE = Codec("rev", lambda data: data[::-1], lambda: None)
+CODECS = {"gzip": GZIP}
+BIG = json.dumps([{"id": i, "title": f"post {i}"} for i in range(200)]).encode()
+
+
+# ---------- negotiation ----------
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("", None),
+        ("gzip", "gzip"),
+        ("GZIP", "gzip"),
+        ("rev, gzip", "rev"),                   # server preference, not header order
+        ("gzip;q=1.0, rev;q=0.5", "rev"),       # any q > 0 is acceptable
+        ("rev;q=0, gzip", "gzip"),
+        ("rev;q=0, gzip;q=0", None),
+        ("rev;q=oops, gzip", "gzip"),           # unparsable q counts as 0
+        ("identity", None),
+        ("identity;q=1, gzip;q=0", None),
+        ("*", "rev"),
+        ("*;q=0.1", "rev"),
+        ("rev;q=0, *", "gzip"),                 # a named q=0 beats the wildcard
+        ("*;q=0", None),
+        ("*;q=0, gzip", "gzip"),
+    ],
+)
+def test_negotiate(header, expected):
+    assert negotiate(header, ["rev", "gzip"]) == expected
+
+
+@pytest.mark.parametrize(
+    "vary, expected",
+    [
+        (None, "Accept-Encoding"),
+        ("Origin", "Origin, Accept-Encoding"),
+        ("Origin, accept-encoding", "Origin, accept-encoding"),
+    ],
+)
+def test_add_vary_merges(vary, expected):
+    headers = {"Vary": vary} if vary else {}
+    assert add_vary(headers)["Vary"] == expected
+
+
+# ---------- middleware ----------
+def _app(chunks, content_type="application/json", headers=()):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", content_type.encode()), *headers]})
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk,
+                        "more_body": i < len(chunks) - 1})
+    return app
+
+
+def _run(app, accept_encoding="gzip", min_size=100):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    scope = {"type": "http", "method": "GET", "path": "/",
+             "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    asyncio.run(CompressionMiddleware(app, CODECS, min_size)(scope, receive, send))
+    start, bodies = sent[0], sent[1:]
+    return {k.decode(): v.decode() for k, v in start["headers"]}, [m["body"] for m in bodies]
+
+
+def test_large_body_is_compressed():
+    headers, bodies = _run(_app([BIG]))
+
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(bodies[0]) == BIG
+    assert headers["content-length"] == str(len(bodies[0]))
+
+
+def test_body_below_min_size_is_sent_as_is():
+    headers, bodies = _run(_app([b'{"ok": true}']))
+
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"     # the answer still depends on the header
+    assert bodies == [b'{"ok": true}']
+
+
+def test_client_without_accept_encoding_gets_identity():
+    headers, bodies = _run(_app([BIG]), accept_encoding="identity")
+    assert "content-encoding" not in headers and bodies == [BIG]
+
+
+def test_vary_is_merged_with_the_app_s():
+    headers, _ = _run(_app([BIG], headers=[(b"vary", b"Origin")]))
+    assert headers["vary"] == "Origin, Accept-Encoding"
+
+
+def test_non_compressible_type_passes_through():
+    headers, bodies = _run(_app([BIG], content_type="image/png"))
+    assert "content-encoding" not in headers and bodies == [BIG]
+
+
+def test_already_encoded_response_passes_through():
+    encoded = gzip.compress(BIG)
+    headers, bodies = _run(_app([encoded], headers=[(b"content-encoding", b"gzip")]))
+    assert bodies == [encoded]                      # not compressed twice
+
+
+def test_stream_is_compressed_chunk_by_chunk():
+    rows = [json.dumps({"id": i}).encode() + b"\n" for i in range(5)]
+    headers, bodies = _run(_app(rows, content_type="application/x-ndjson"), min_size=10_000)
+
+    assert headers["content-encoding"] == "gzip"    # min_size doesn't apply to streams
+    assert "content-length" not in headers
+    # every chunk is flushed: a client decodes each row as soon as it arrives
+    decoder = zlib.decompressobj(31)
+    assert [decoder.decompress(body) for body in bodies[:-1]] == rows[:-1]
+    assert decoder.decompress(bodies[-1]) + decoder.flush() == rows[-1]
+
+
+def test_stream_without_accepted_coding_passes_through():
+    rows = [b"a\n", b"b\n"]
+    headers, bodies = _run(_app(rows, content_type="application/x-ndjson"), accept_encoding="")
+    assert "content-encoding" not in headers and bodies == rows
+
+
+# ---------- cached variants ----------
+def _request(accept_encoding):
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"",
+                    "headers": [(b"accept-encoding", accept_encoding.encode())]})
+
+
+def test_cached_response_round_trips_with_encoded_variants():
+    cached = CachedResponse(BIG, {"ETag": '"v1"', "Vary": "Origin"})
+    cached.precompress({"gzip": GZIP, "rev": REVERSE}, min_size=100)
+
+    loaded = CachedResponse.loads(cached.dumps())
+
+    assert loaded == cached
+    assert gzip.decompress(loaded.encoded["gzip"]) == BIG and loaded.encoded["rev"] == BIG[::-1]
+
+
+def test_cached_response_round_trips_without_variants():
+    cached = CachedResponse(b"[]", {"ETag": '"v1"'})
+    cached.precompress(CODECS, min_size=100)        # too small to bother
+
+    assert cached.encoded == {}
+    assert CachedResponse.loads(cached.dumps()) == cached
+
+
+def test_cached_response_serves_the_accepted_variant():
+    cached = CachedResponse(BIG, {"ETag": '"v1"'})
+    cached.precompress(CODECS, min_size=100)
+
+    encoded = cached.to_response(_request("br, gzip"))
+    plain = cached.to_response(_request("identity"))
+
+    assert encoded.headers["content-encoding"] == "gzip" and gzip.decompress(encoded.body) == BIG
+    assert "content-encoding" not in plain.headers and plain.body == BIG
+    assert encoded.headers["vary"] == plain.headers["vary"] == "Accept-Encoding"
+    assert "Vary" not in cached.headers              # the entry itself is left alone
@@ -0,0 +1,141 @@
+"""
+Rate-limit rules and the login budget, admission control's queue, and the
+FEED_MAX_LIMIT cap on `limit`.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.app.core.config import settings
+from src.app.middleware.rate_limit import RateLimitMiddleware
+from src.app.services.admission import Admission, Overloaded
+from src.app.services.rate_limit import RateLimiter, Rule, parse_rules
+from src.app.services.shared_state import MemoryBackend
+
+LOGIN = "/api/v1/auth/login"
+
+
+# ---------- rate limiting ----------
+def test_parse_rules():
+    rules = parse_rules("POST /api/v1/auth/login=10/minute; GET /api/v1/posts = 5 / s ;*=100/hour")
+
+    assert rules == [
+        Rule("POST", "/api/v1/auth/login", 10, 60),
+        Rule("GET", "/api/v1/posts", 5, 1),
+        Rule("*", "/", 100, 3600),
+    ]
+    assert rules[0].matches("POST", LOGIN) and not rules[0].matches("GET", LOGIN)
+    assert rules[2].matches("DELETE", "/anything")
+    assert parse_rules(" ; ") == []
+
+
+@pytest.mark.parametrize("spec", ["POST /login", "POST /login=0/minute", "POST /login=1/fortnight",
+                                  "post /login=1/minute", "POST login=1/minute"])
+def test_parse_rules_rejects_bad_entries(spec):
+    with pytest.raises(ValueError, match="Bad RATE_LIMIT_RULES entry"):
+        parse_rules(spec)
+
+
+def _rate_limited_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post(LOGIN)
+    def login():
+        return {"access_token": "t"}
+
+    @app.get("/api/v1/posts/")
+    def posts():
+        return []
+
+    # the configured rules, so this is the login budget that ships
+    limiter = RateLimiter(parse_rules(settings.rate_limit_rules), MemoryBackend(100, 3600),
+                          key="ip", trust_forwarded=True)
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+    return app
+
+
+def test_login_budget_is_answered_429_with_retry_after():
+    budget = next(r for r in parse_rules(settings.rate_limit_rules) if r.matches("POST", LOGIN))
+    client = TestClient(_rate_limited_app())
+    attacker = {"X-Forwarded-For": "203.0.113.7"}
+
+    assert all(client.post(LOGIN, headers=attacker).status_code == 200 for _ in range(budget.count))
+    response = client.post(LOGIN, headers=attacker)
+
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["Retry-After"]) <= budget.period
+    assert response.headers["RateLimit-Policy"] == f"{budget.count};w={budget.period}"
+    # other routes and other clients keep their own buckets
+    assert client.get("/api/v1/posts/", headers=attacker).status_code == 200
+    assert client.post(LOGIN, headers={"X-Forwarded-For": "198.51.100.1"}).status_code == 200
+
+
+# ---------- admission control ----------
+def test_admission_rejects_when_the_queue_is_full():
+    async def scenario():
+        admission = Admission(limit=1, max_queue=1, queue_timeout=5)
+        await admission.acquire()
+        queued = asyncio.ensure_future(admission.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded) as exc:
+            await admission.acquire()
+        admission.release()
+        await queued
+        return exc.value.reason, admission.stats()
+
+    reason, stats = asyncio.run(scenario())
+    assert reason == "queue_full"
+    assert stats == {"limit": 1, "active": 1, "queued": 0, "admitted": 2, "rejected": 1}
+
+
+def test_admission_gives_up_after_the_queue_timeout():
+    async def scenario():
+        admission = Admission(limit=1, max_queue=10, queue_timeout=0.05)
+        await admission.acquire()
+        with pytest.raises(Overloaded) as exc:
+            await admission.acquire()
+        return exc.value.reason, admission.stats()
+
+    reason, stats = asyncio.run(scenario())
+    assert reason == "queue_timeout"
+    assert stats["queued"] == 0 and stats["rejected"] == 1
+
+
+def test_admission_hands_slots_over_in_arrival_order():
+    async def scenario():
+        admission = Admission(limit=1, max_queue=10, queue_timeout=5)
+        admitted = []
+
+        async def request(name):
+            await admission.acquire()
+            admitted.append(name)
+
+        await admission.acquire()
+        waiters = []
+        for name in "abc":
+            waiters.append(asyncio.ensure_future(request(name)))
+            await asyncio.sleep(0)
+        for _ in waiters:
+            admission.release()             # each release hands the slot to the oldest waiter
+            await asyncio.sleep(0)
+        await asyncio.gather(*waiters)
+        return admitted, admission.stats()
+
+    admitted, stats = asyncio.run(scenario())
+    assert admitted == ["a", "b", "c"]
+    assert stats["active"] == 1             # the slot moved, it was never freed
+
+
+# ---------- FEED_MAX_LIMIT ----------
+def test_feed_limit_defaults_within_and_is_capped_by_feed_max_limit(client):
+    limit = next(p for p in client.get("/openapi.json").json()["paths"]["/api/v1/posts/"]["get"]["parameters"]
+                 if p["name"] == "limit")
+
+    assert limit["schema"]["default"] == min(100, settings.feed_max_limit)
+    assert limit["schema"]["maximum"] == settings.feed_max_limit
+    assert client.get("/api/v1/posts/").status_code == 200
+    assert client.get("/api/v1/posts/", params={"limit": settings.feed_max_limit}).status_code == 200
+    assert client.get("/api/v1/posts/", params={"limit": settings.feed_max_limit + 1}).status_code == 422
@@ -0,0 +1,55 @@
+"""GET /metrics after real requests, and the optional Server-Timing header."""
+
+import re
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.app.middleware.metrics import MetricsMiddleware
+
+SAMPLE = re.compile(r"^postino_[a-z_]+(\{.*\})? (?P<value>\S+)$")   # label values may hold braces
+
+
+def _scrape(client) -> str:
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text
+
+
+def test_metrics_use_the_text_format_and_route_templates(client, add_posts):
+    add_posts(1)
+    post_id = client.get("/api/v1/posts/", params={"limit": 1}).json()[0]["id"]
+    assert client.get(f"/api/v1/posts/{post_id}").status_code == 200
+    client.get("/no/such/page")
+
+    text = _scrape(client)
+
+    assert "# TYPE postino_http_requests_total counter" in text
+    assert "# TYPE postino_http_request_duration_seconds histogram" in text
+    for line in text.splitlines():
+        if not line.startswith("# "):
+            float(SAMPLE.match(line)["value"])      # "+Inf" parses too
+    assert re.search(r'^postino_http_requests_total\{method="GET",route="/api/v1/posts/\{post_id\}",'
+                     r'status="200"\} [1-9]', text, re.M)
+    assert f'route="/api/v1/posts/{post_id}"' not in text      # never the raw path
+    assert 'route="<unmatched>",status="404"' in text
+    assert re.search(r'^postino_http_request_duration_seconds_bucket\{method="GET",'
+                     r'route="/api/v1/posts/\{post_id\}",le="\+Inf"\} [1-9]', text, re.M)
+
+
+def test_server_timing_is_off_by_default(client):
+    assert "server-timing" not in client.get("/api/v1/posts/tags").headers
+
+
+def test_server_timing_header_when_enabled():
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    app.add_middleware(MetricsMiddleware, server_timing=True)
+    response = TestClient(app).get("/ping")
+
+    assert re.search(r"(^|, )total;dur=\d+\.\d{2}$", response.headers["server-timing"])
@@ -0,0 +1,69 @@
+# tests/test_query_budgets.py
+"""
+Statement budgets of the feed and the tag list (src/app/testing/pytest_plugin.py).
+
+Each budget is checked at two sizes – a handful of rows and many – since
+relationships must load per query (selectinload), never lazily per row.
+"""
+
+import itertools
+
+import pytest
+
+FEED = "/api/v1/posts/"
+TAGS = "/api/v1/posts/tags"
+
+_batch = itertools.count()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def corpus(add_posts):
+    add_posts(40)
+    add_posts(40, ["budget-a", "budget-b", "budget-c"])
+
+
+@pytest.mark.parametrize("limit", [3, 40])
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"tag": "budget-a"},
+        {"view": "summary"},
+        {"cursor": ""},
+        {"cursor": "", "tag": "budget-b", "view": "summary"},
+    ],
+    ids=["offset", "tag", "summary", "cursor", "cursor-tag-summary"],
+)
+def test_feed_budget(client, query_budget, params, limit):
+    # the page, then one IN (...) query for the tags of all its posts
+    with query_budget(2):
+        response = client.get(FEED, params={"limit": limit, **params})
+    assert response.status_code == 200
+    assert len(response.json()) == limit
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"with_counts": True},
+        {"with_counts": True, "order": "popular"},
+        {"with_counts": True, "prefix": "budget"},
+    ],
+    ids=["names", "counts", "counts-popular", "counts-prefix"],
+)
+@pytest.mark.parametrize("new_tags", [1, 200])
+def test_tag_list_budget(client, add_posts, query_budget, params, new_tags):
+    batch = next(_batch)
+    names = [f"budget-new-{batch}-{i}" for i in range(new_tags)]
+    add_posts(1, names)
+    # a write moved the tags version: version check + index reload
+    with query_budget(2):
+        stale = client.get(TAGS, params=params)
+    # index is current: version check only
+    with query_budget(1):
+        current = client.get(TAGS, params=params)
+    assert stale.status_code == current.status_code == 200
+    assert stale.json() == current.json()
+    listed = str(current.json())
+    assert all(f"'{name}'" in listed for name in names)
@@ -0,0 +1,220 @@
+# tests/test_response_cache.py
+"""ResponseCache on an in-process MemoryBackend: invalidation, single-flight, replica bypass, workers."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.app.core.config import settings
+from src.app.database.routing import ReadRouting, reset_routing, route_reads
+from src.app.services.response_cache import CachedResponse, ResponseCache, build_response_cache
+from src.app.services.shared_state import MemoryBackend
+
+
+@pytest.fixture
+def cache() -> ResponseCache:
+    return ResponseCache(MemoryBackend(max_entries=100, ttl_seconds=60), ttl_seconds=60)
+
+
+class Renderer:
+    """Counts calls; every call renders a new body."""
+
+    def __init__(self, label: str = "render", delay: float = 0.0) -> None:
+        self.label = label
+        self.calls = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self) -> CachedResponse:
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        time.sleep(self.delay)
+        return CachedResponse(body=f"{self.label} {n}".encode())
+
+    async def arender(self) -> CachedResponse:
+        self.calls += 1
+        n = self.calls
+        await asyncio.sleep(self.delay)
+        return CachedResponse(body=f"{self.label} {n}".encode())
+
+
+# ---------------- generation-based invalidation ---------------- #
+def test_hit_after_miss(cache):
+    render = Renderer()
+    key = cache.key("feed", ["feed"], (0, 20))
+    assert cache.get_or_set(key, render).body == b"render 1"
+    assert cache.get_or_set(key, render).body == b"render 1"
+    assert render.calls == 1
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_post_write_moves_only_the_scopes_it_touches(cache):
+    feed = cache.key("feed", ["feed"], ())
+    tag_a = cache.key("feed", ["tag:a"], ())
+    tag_b = cache.key("feed", ["tag:b"], ())
+    tags = cache.key("tags", ["tags"], ())
+
+    cache.invalidate_posts(["a"])
+
+    assert cache.key("feed", ["feed"], ()) != feed
+    assert cache.key("feed", ["tag:a"], ()) != tag_a
+    assert cache.key("feed", ["tag:b"], ()) == tag_b
+    assert cache.key("tags", ["tags"], ()) == tags
+
+    cache.invalidate_posts(["b"], tags_changed=True)
+    assert cache.key("tags", ["tags"], ()) != tags
+
+
+def test_invalidated_entry_is_rendered_again(cache):
+    render = Renderer()
+    cache.get_or_set(cache.key("feed", ["tag:a"], ()), render)
+    cache.invalidate_posts(["a"])
+    assert cache.get_or_set(cache.key("feed", ["tag:a"], ()), render).body == b"render 2"
+
+
+def test_clear_moves_every_key(cache):
+    keys = [cache.key("feed", ["feed"], ()), cache.key("tags", ["tags"], ())]
+    cache.clear()
+    assert [cache.key("feed", ["feed"], ()), cache.key("tags", ["tags"], ())] != keys
+
+
+def test_params_are_part_of_the_key(cache):
+    assert cache.key("feed", ["feed"], (0, 20)) != cache.key("feed", ["feed"], (20, 20))
+
+
+# ---------------- single-flight ---------------- #
+def test_concurrent_misses_render_once(cache):
+    render = Renderer(delay=0.2)
+    key = cache.key("feed", ["feed"], ())
+    start = threading.Barrier(8)
+    bodies = []
+
+    def request():
+        start.wait()
+        bodies.append(cache.get_or_set(key, render).body)
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert render.calls == 1
+    assert bodies == [b"render 1"] * 8
+
+
+def test_concurrent_async_misses_render_once(cache):
+    render = Renderer(delay=0.05)
+    key = cache.key("feed", ["feed"], ())
+
+    async def burst():
+        return await asyncio.gather(*(cache.aget_or_set(key, render.arender) for _ in range(8)))
+
+    results = asyncio.run(burst())
+    assert render.calls == 1
+    assert {r.body for r in results} == {b"render 1"}
+
+
+def test_failed_leader_is_not_cached(cache):
+    key = cache.key("feed", ["feed"], ())
+
+    def broken():
+        raise RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_set(key, broken)
+    assert cache.get_or_set(key, Renderer()).body == b"render 1"
+
+
+def test_failed_async_leader_is_not_cached_or_shared(cache):
+    key = cache.key("feed", ["feed"], ())
+    fallback = Renderer("waiter")
+
+    async def broken():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("db down")
+
+    async def burst():
+        leader = asyncio.ensure_future(cache.aget_or_set(key, broken))
+        await asyncio.sleep(0)
+        waiters = [cache.aget_or_set(key, fallback.arender) for _ in range(3)]
+        return await asyncio.gather(leader, *waiters, return_exceptions=True)
+
+    leader, *waiters = asyncio.run(burst())
+    assert isinstance(leader, RuntimeError)
+    # each waiter rendered itself instead of failing with the leader's error
+    assert fallback.calls == 3
+    assert all(isinstance(w, CachedResponse) for w in waiters)
+    assert asyncio.run(cache.aget_or_set(key, Renderer().arender)).body == b"render 1"
+
+
+def test_cancelled_async_leader_does_not_cancel_waiters(cache):
+    key = cache.key("feed", ["feed"], ())
+    slow = Renderer("leader", delay=1.0)
+    fallback = Renderer("waiter")
+
+    async def burst():
+        leader = asyncio.ensure_future(cache.aget_or_set(key, slow.arender))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.aget_or_set(key, fallback.arender))
+        await asyncio.sleep(0.05)
+        leader.cancel()                         # the leader's client went away
+        return await asyncio.gather(leader, waiter, return_exceptions=True)
+
+    leader, waiter = asyncio.run(burst())
+    assert isinstance(leader, asyncio.CancelledError)
+    assert waiter.body == b"waiter 1"
+
+
+# ---------------- read replicas ---------------- #
+def test_request_pinned_to_primary_skips_and_overwrites_the_entry(cache):
+    key = cache.key("feed", ["feed"], ())
+    cache.get_or_set(key, Renderer("replica"))      # filled from a lagging replica
+
+    primary = Renderer("primary")
+    token = route_reads(ReadRouting(replica_ok=False))
+    try:
+        assert cache.get_or_set(key, primary).body == b"primary 1"
+    finally:
+        reset_routing(token)
+    assert primary.calls == 1
+
+    # later readers get the primary's rendering, not the replica's
+    assert cache.get_or_set(key, Renderer("unused")).body == b"primary 1"
+
+
+def test_async_request_pinned_to_primary_skips_the_lookup(cache):
+    key = cache.key("feed", ["feed"], ())
+    cache.get_or_set(key, Renderer("replica"))
+    primary = Renderer("primary")
+
+    async def pinned():
+        token = route_reads(ReadRouting(replica_ok=False))
+        try:
+            return await cache.aget_or_set(key, primary.arender)
+        finally:
+            reset_routing(token)
+
+    assert asyncio.run(pinned()).body == b"primary 1"
+    assert cache.get_or_set(key, Renderer("unused")).body == b"primary 1"
+
+
+def test_replica_requests_use_the_cache(cache):
+    key = cache.key("feed", ["feed"], ())
+    render = Renderer()
+    token = route_reads(ReadRouting(replica_ok=True))
+    try:
+        cache.get_or_set(key, render)
+        cache.get_or_set(key, render)
+    finally:
+        reset_routing(token)
+    assert render.calls == 1
+
+
+@pytest.mark.parametrize("workers, enabled", [(1, True), (4, False)])
+def test_memory_cache_is_off_with_several_workers(workers, enabled):
+    cfg = settings.model_copy(update={"response_cache_backend": "memory", "web_concurrency": workers})
+    assert build_response_cache(cfg).enabled is enabled
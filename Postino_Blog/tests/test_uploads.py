@@ -0,0 +1,177 @@
+# tests/test_uploads.py
+"""Image uploads against the in-process MinIO stand-in (benchmarks/fake_minio.py)."""
+
+from io import BytesIO
+
+import pytest
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.testclient import TestClient
+from PIL import Image
+from starlette.datastructures import Headers
+from starlette.datastructures import UploadFile as StarletteUploadFile
+
+from benchmarks.fake_minio import FakeMinio
+from src.app.core.config import settings
+from src.app.middleware.body_size import MaxUploadSizeMiddleware
+from src.app.utils.file import _LimitedReader, object_name_from_url, save_image
+
+
+def _stored(url: str):
+    key = f"{settings.minio_bucket}/{object_name_from_url(url)}"
+    return FakeMinio.objects[key], FakeMinio.parts[key]
+
+
+def _upload(data: bytes, size=None) -> StarletteUploadFile:
+    return StarletteUploadFile(BytesIO(data), size=size, filename="photo.jpg",
+                      headers=Headers({"content-type": "image/jpeg"}))
+
+
+@pytest.fixture
+def small_parts(monkeypatch):
+    monkeypatch.setattr(settings, "minio_part_size", 1024)
+
+
+# ---------------- save_image ---------------- #
+def test_bytes_are_one_put():
+    data = b"\xff\xd8" + b"x" * 500
+    url = save_image(data)
+    assert _stored(url) == (data, 1)
+
+
+def test_upload_within_one_part_is_one_put(small_parts):
+    data = b"y" * 1000
+    url = save_image(_upload(data, size=len(data)))
+    assert url.endswith(".jpg")
+    assert _stored(url) == (data, 1)
+
+
+@pytest.mark.parametrize("declared", [True, False], ids=["known-size", "unknown-size"])
+def test_large_upload_is_multipart(small_parts, declared):
+    data = bytes(range(256)) * 20                   # 5120 bytes → 5 parts of ≤ 1024
+    url = save_image(_upload(data, size=len(data) if declared else None))
+    assert _stored(url) == (data, 5)
+
+
+def test_declared_size_over_limit_is_rejected_unread(monkeypatch):
+    monkeypatch.setattr(settings, "image_max_bytes", 100)
+    upload = _upload(b"z" * 200, size=200)
+    with pytest.raises(HTTPException) as exc:
+        save_image(upload)
+    assert exc.value.status_code == 413
+    assert upload.file.tell() == 0
+
+
+def test_undeclared_stream_is_cut_off_at_the_limit(monkeypatch, small_parts):
+    monkeypatch.setattr(settings, "image_max_bytes", 2048)
+    before = dict(FakeMinio.objects)
+    with pytest.raises(HTTPException) as exc:
+        save_image(_upload(b"z" * 5000))
+    assert exc.value.status_code == 413
+    assert FakeMinio.objects == before
+
+
+# ---------------- _LimitedReader ---------------- #
+def test_limited_reader_allows_exactly_the_limit():
+    reader = _LimitedReader(BytesIO(b"a" * 10), 10)
+    assert reader.read() == b"a" * 10
+    assert reader.read() == b""
+    assert reader.bytes_read == 10
+
+
+def test_limited_reader_stops_one_byte_past_the_limit():
+    stream = BytesIO(b"a" * 1000)
+    reader = _LimitedReader(stream, 10)
+    assert reader.read(4) == b"aaaa"
+    assert reader.read(4) == b"aaaa"
+    with pytest.raises(HTTPException) as exc:
+        reader.read(4)
+    assert exc.value.status_code == 413
+    assert stream.tell() == 11                      # never reads further than that
+
+
+# ---------------- MaxUploadSizeMiddleware ---------------- #
+def _limited_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(MaxUploadSizeMiddleware, max_bytes=1000)
+
+    @app.post("/upload")
+    async def upload(title: str = Form(...), image: UploadFile = File(...)):
+        return {"title": title, "size": len(await image.read())}
+
+    @app.post("/ndjson")
+    async def ndjson(request: Request):
+        return {"size": len(await request.body())}
+
+    return app
+
+
+def _multipart(payload: bytes) -> bytes:
+    return (
+        b'--b\r\nContent-Disposition: form-data; name="title"\r\n\r\nhello\r\n'
+        b'--b\r\nContent-Disposition: form-data; name="image"; filename="a.jpg"\r\n'
+        b"Content-Type: image/jpeg\r\n\r\n" + payload + b"\r\n--b--\r\n"
+    )
+
+
+def _chunked(body: bytes, size: int = 300):
+    return iter([body[i:i + size] for i in range(0, len(body), size)])
+
+
+@pytest.fixture
+def limited_client():
+    return TestClient(_limited_app())
+
+
+def test_multipart_within_limit_passes(limited_client):
+    response = limited_client.post("/upload", data={"title": "t"},
+                                   files={"image": ("a.jpg", b"x" * 100)})
+    assert response.status_code == 200
+    assert response.json() == {"title": "t", "size": 100}
+
+
+def test_chunked_multipart_within_limit_passes(limited_client):
+    response = limited_client.post(
+        "/upload", content=_chunked(_multipart(b"x" * 500)),
+        headers={"content-type": "multipart/form-data; boundary=b"},
+    )
+    assert "content-length" not in response.request.headers
+    assert response.json() == {"title": "hello", "size": 500}
+
+
+def test_declared_multipart_over_limit_is_413(limited_client):
+    response = limited_client.post("/upload", data={"title": "t"},
+                                   files={"image": ("a.jpg", b"x" * 2000)})
+    assert response.status_code == 413
+
+
+def test_chunked_multipart_over_limit_is_413(limited_client):
+    # the form parser sees a disconnect; its 400 must not reach the client
+    response = limited_client.post(
+        "/upload", content=_chunked(_multipart(b"x" * 2000)),
+        headers={"content-type": "multipart/form-data; boundary=b"},
+    )
+    assert "content-length" not in response.request.headers
+    assert response.status_code == 413
+    assert "exceeds 1000 bytes" in response.text
+
+
+def test_other_content_types_are_not_limited(limited_client):
+    response = limited_client.post(
+        "/ndjson", content=b"x" * 5000, headers={"content-type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"size": 5000}
+
+
+# ---------------- through the API ---------------- #
+def test_create_post_with_image(client, auth_headers):
+    buffer = BytesIO()
+    Image.new("RGB", (64, 48), (200, 40, 40)).save(buffer, "JPEG")
+    response = client.post(
+        "/api/v1/posts/",
+        data={"title": "with image", "content": "body"},
+        files={"image": ("photo.jpg", buffer.getvalue(), "image/jpeg")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert _stored(response.json()["image_url"]) == (buffer.getvalue(), 1)